@@ -0,0 +1,36 @@
+"""FSM state
+
+Revision ID: 5c1f0e7a9b3d
+Revises: 74db4139f8ef
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5c1f0e7a9b3d"
+down_revision: Union[str, None] = "74db4139f8ef"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "fsm_state",
+        sa.Column("key", sa.String(length=200), nullable=False),
+        sa.Column("state", sa.String(length=200), nullable=True),
+        sa.Column("data", sa.Text(), nullable=False),
+        sa.Column("version", sa.BigInteger(), nullable=False),
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_fsm_state")),
+        sa.UniqueConstraint("key", name=op.f("uq_fsm_state_key")),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("fsm_state")
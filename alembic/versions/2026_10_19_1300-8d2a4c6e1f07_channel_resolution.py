@@ -0,0 +1,40 @@
+"""channel resolution
+
+Revision ID: 8d2a4c6e1f07
+Revises: 5c1f0e7a9b3d
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "8d2a4c6e1f07"
+down_revision: Union[str, None] = "5c1f0e7a9b3d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "channel_resolution",
+        sa.Column("url", sa.String(length=200), nullable=False),
+        sa.Column("channel_id", sa.Integer(), nullable=True),
+        sa.Column("expires_at", sa.BigInteger(), nullable=False),
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.ForeignKeyConstraint(
+            ["channel_id"],
+            ["channel.id"],
+            name=op.f("fk_channel_resolution_channel_id_channel"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_channel_resolution")),
+        sa.UniqueConstraint("url", name=op.f("uq_channel_resolution_url")),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("channel_resolution")
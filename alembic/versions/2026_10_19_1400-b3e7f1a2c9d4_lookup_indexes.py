@@ -0,0 +1,39 @@
+"""lookup indexes
+
+Revision ID: b3e7f1a2c9d4
+Revises: 8d2a4c6e1f07
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b3e7f1a2c9d4"
+down_revision: Union[str, None] = "8d2a4c6e1f07"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(op.f("ix_profile_tg_id"), "profile", ["tg_id"], unique=False)
+    op.create_index(
+        op.f("ix_profile_channel_association_channel_id"),
+        "profile_channel_association",
+        ["channel_id"],
+        unique=False,
+    )
+    op.create_index(op.f("ix_video_channel_id"), "video", ["channel_id"], unique=False)
+    op.create_index(op.f("ix_stream_channel_id"), "stream", ["channel_id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_stream_channel_id"), table_name="stream")
+    op.drop_index(op.f("ix_video_channel_id"), table_name="video")
+    op.drop_index(
+        op.f("ix_profile_channel_association_channel_id"),
+        table_name="profile_channel_association",
+    )
+    op.drop_index(op.f("ix_profile_tg_id"), table_name="profile")
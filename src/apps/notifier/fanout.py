@@ -0,0 +1,111 @@
+from asyncio import create_task, gather, sleep
+from logging import getLogger
+from time import monotonic
+from typing import Iterable, Iterator
+
+from aiogram import Bot
+
+from apps.notifier.models import FanOutReport
+from controllers.message_ctrl import send_message
+from controllers.status_ctrl import BlockedUsers
+from core.settings import settings
+from utils.timeseries import timeseries
+from utils.tracing import span
+
+logger = getLogger(__name__)
+
+
+class FanOut:
+    """
+    Рассылка с фиксированным пулом воркеров.
+    Воркеры забирают получателей из общего итератора, поэтому число задач
+    и потребление памяти не зависят от количества подписчиков
+    """
+
+    def __init__(
+        self,
+        bot: Bot,
+        workers: int = settings.fanout_workers,
+        progress_delay: int = settings.fanout_progress_delay,
+    ) -> None:
+        self.bot = bot
+        self.workers = workers
+        self.progress_delay = progress_delay
+
+    async def run(
+        self,
+        job: str,
+        recipients: Iterable[tuple[int, str]],
+        total: int | None = None,
+    ) -> FanOutReport:
+        report = FanOutReport(job=job, total=total)
+        iterator = iter(recipients)
+        workers = self.workers if total is None else min(self.workers, total)
+
+        started = monotonic()
+        progress_task = create_task(self.__progress(report, started))
+
+        try:
+            with span("fanout", job) as fanout_span:
+                await gather(*[self.__worker(iterator, report) for _ in range(workers)])
+
+                if fanout_span is not None:
+                    fanout_span.set_data("sent", report.sent)
+                    fanout_span.set_data("failed", report.failed)
+
+        finally:
+            progress_task.cancel()
+            report.elapsed = monotonic() - started
+
+        timeseries.add("fanout.sent", report.sent)
+        timeseries.add("fanout.failed", report.failed)
+
+        logger.info(
+            'Fan-out finished: Job="%s" | Sent=%d | Failed=%d | Skipped=%d | '
+            "Elapsed=%.1fs | Rate=%.1f msg/s",
+            report.job,
+            report.sent,
+            report.failed,
+            report.skipped,
+            report.elapsed,
+            report.rate,
+        )
+
+        return report
+
+    async def __worker(
+        self,
+        recipients: Iterator[tuple[int, str]],
+        report: FanOutReport,
+    ) -> None:
+        for tg_id, text in recipients:
+            if BlockedUsers.is_blocked(tg_id):
+                report.skipped += 1
+                continue
+
+            message = await send_message(
+                bot=self.bot,
+                chat_id=tg_id,
+                user_tg_id=tg_id,
+                text=text,
+            )
+
+            if message is None:
+                report.failed += 1
+            else:
+                report.sent += 1
+
+    async def __progress(self, report: FanOutReport, started: float) -> None:
+        while True:
+            await sleep(self.progress_delay)
+
+            report.elapsed = monotonic() - started
+
+            logger.info(
+                'Fan-out progress: Job="%s" | Done=%d/%s | Failed=%d | Rate=%.1f msg/s',
+                report.job,
+                report.done,
+                report.total if report.total is not None else "?",
+                report.failed,
+                report.rate,
+            )
@@ -1,7 +1,11 @@
-from asyncio import Event, gather, get_running_loop, sleep
+from asyncio import Event, Future, get_running_loop, sleep
+from cProfile import Profile
+from time import monotonic
+from typing import Iterator
 
 from aiogram import Bot
 
+from apps.notifier.fanout import FanOut
 from apps.notifier.models import ChannelModel
 from apps.notifier.utils import (
     check_new_content,
@@ -9,11 +13,15 @@ from apps.notifier.utils import (
     load_content_urls,
     save_new_content,
 )
-from controllers.message_ctrl import send_message
-from core.models import Smiles
+from controllers.status_ctrl import BlockedUsers
+from core.models import Smiles, Status
 from core.settings import settings
 from database.schemas import Channel, ProfileChannelAssociation
+from database.sql_stats import query_scope
 from database.utils import get_channel_db
+from utils.profiler import Profiler
+from utils.timeseries import timeseries
+from utils.tracing import span, transaction
 
 
 class Notifier:
@@ -26,8 +34,13 @@ class Notifier:
     def __init__(self, bot: Bot, iter_delay: int = 300) -> None:
         self.bot = bot
         self.iter_delay = iter_delay
+        self.fanout = FanOut(bot)
+
+        self.running = False
+        self.profile_waiters: list[Future] = []
 
     async def start(self) -> None:
+        self.running = True
         loop = get_running_loop()
         loop.create_task(self.__starter(self.iter_delay))
 
@@ -59,19 +72,70 @@ class Notifier:
 
         self.iter_event.set()
 
-    async def notify(self):
-        async with get_channel_db() as channel_db:
-            async for channels in channel_db.aiter_load(
-                channel_db.get, max_pages=None, per_page=10
-            ):
-                ch_models = self.make_channels_models(channels)
+    async def profile_cycle(self) -> Profile:
+        """Профиль следующего цикла уведомлений"""
+        waiter = get_running_loop().create_future()
+        self.profile_waiters.append(waiter)
+        return await waiter
 
+    async def notify(self):
+        if not self.profile_waiters or Profiler.active:
+            await self._notify()
+            return
+
+        waiters, self.profile_waiters = self.profile_waiters, []
+        profile: Profile | None = None  # Профилировщик мог не запуститься
+
+        try:
+            with Profiler.session("notify cycle") as profile:
+                await self._notify()
+
+        finally:
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_result(profile)
+
+    async def _notify(self):
+        started = monotonic()
+        polled = new_items = 0
+
+        with transaction("notify cycle", "notifier.cycle"):
+            with span("db.flush", "BlockedUsers.flush"):
+                await BlockedUsers.flush()
+                BlockedUsers.reset()
+
+            async with get_channel_db() as channel_db:
+                async for channels in channel_db.aiter_load(
+                    channel_db.get, max_pages=None, per_page=10
+                ):
+                    ch_models = self.make_channels_models(channels)
+                    await self._notify_batch(ch_models)
+
+                    polled += len(ch_models)
+                    new_items += sum(
+                        len(ch_model.new_videos) + len(ch_model.new_streams)
+                        for ch_model in ch_models
+                    )
+
+        timeseries.add("notifier.cycle_sec", monotonic() - started)
+        timeseries.add("notifier.channels", polled)
+        timeseries.add("notifier.new_items", new_items)
+
+    async def _notify_batch(self, ch_models: list[ChannelModel]) -> None:
+        with query_scope("notifier.batch"):
+            with span("db.batch", "db_load_ch_content"):
                 await db_load_ch_content(ch_models)
+
+            with span("youtube.batch", "load_content_urls"):
                 await load_content_urls(ch_models)
-                check_new_content(ch_models)
+
+            check_new_content(ch_models)
+
+            with span("db.batch", "save_new_content"):
                 await save_new_content(ch_models)
-                self.build_content_msgs(ch_models)
-                await self.send_new_content(ch_models)
+
+            self.build_content_msgs(ch_models)
+            await self.send_new_content(ch_models)
 
     @classmethod
     def make_channels_models(cls, channels: list[Channel]) -> list[ChannelModel]:
@@ -95,7 +159,11 @@ class Notifier:
         for (
             profile_association
         ) in channel.profile_associations:  # type: ProfileChannelAssociation
-            tg_ids.append(profile_association.profile.tg_id)
+            profile = profile_association.profile
+
+            # Канал выбран по активным подписчикам, но загружаются все
+            if profile.status == Status.active:
+                tg_ids.append(profile.tg_id)
 
         return tg_ids
 
@@ -105,17 +173,14 @@ class Notifier:
 
     def _build_content_msgs(self, ch_model: ChannelModel) -> None:
         messages = []
-        content_urls = set()
-
-        content_urls.update(ch_model.new_videos)
-        content_urls.update(ch_model.new_streams)
+        content_urls = list(dict.fromkeys(ch_model.new_videos + ch_model.new_streams))
 
         if content_urls:
             messages.append(self.__build_content_msg(ch_model.name, content_urls))
 
         ch_model.messages = messages
 
-    def __build_content_msg(self, channel_name: str, content_urls: set[str]) -> str:
+    def __build_content_msg(self, channel_name: str, content_urls: list[str]) -> str:
         content_msgs = []
 
         for content_part in content_urls:
@@ -134,21 +199,25 @@ class Notifier:
         )
 
     async def send_new_content(self, channel_models: list[ChannelModel]) -> None:
-        tasks = []
-
-        for ch_model in channel_models:
-            if ch_model.messages:
-                tasks.append(self._send_new_content(ch_model))
-
-        await gather(*tasks)
+        total = sum(
+            len(ch_model.messages) * len(ch_model.target_tg_ids)
+            for ch_model in channel_models
+        )
 
-    async def _send_new_content(self, ch_model: ChannelModel) -> None:
-        tasks = []
+        if not total:
+            return
 
-        for msg in ch_model.messages:
-            for tg_id in ch_model.target_tg_ids:
-                tasks.append(
-                    send_message(bot=self.bot, chat_id=tg_id, user_tg_id=tg_id, text=msg)
-                )
+        await self.fanout.run(
+            "new content",
+            self._iter_recipients(channel_models),
+            total=total,
+        )
 
-        await gather(*tasks)
+    @classmethod
+    def _iter_recipients(
+        cls, channel_models: list[ChannelModel]
+    ) -> Iterator[tuple[int, str]]:
+        for ch_model in channel_models:
+            for msg in ch_model.messages:
+                for tg_id in ch_model.target_tg_ids:
+                    yield tg_id, msg
@@ -1,17 +1,45 @@
 from enum import StrEnum, auto
+from typing import Iterable, NamedTuple
 
-from aiogram.types import Message
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel
 
 from database.schemas import Channel, Profile
 
 
+class ProfileData(NamedTuple):
+    id: int
+    tg_id: int
+    first_name: str
+    subs_limit: int
+
+    @classmethod
+    def from_orm(cls, profile: Profile) -> "ProfileData":
+        return cls(profile.id, profile.tg_id, profile.first_name, profile.subs_limit)
+
+
+class ChannelData(NamedTuple):
+    id: int
+    name: str
+    url: str
+
+    @classmethod
+    def from_orm(cls, channel: Channel) -> "ChannelData":
+        return cls(channel.id, channel.name, channel.url)
+
+    @classmethod
+    def from_orms(cls, channels: Iterable[Channel]) -> tuple["ChannelData", ...]:
+        return tuple(cls.from_orm(channel) for channel in channels)
+
+
 class UserFSMmodel(BaseModel):
-    model_config = ConfigDict(arbitrary_types_allowed=True)
+    """
+    Состояние пользователя в FSM: только id и небольшие кортежи.
+    `displayed_channels` - id сообщения с каналом -> канал
+    """
 
-    profile: Profile
-    channels: list[Channel] = []
-    displayed_channels: dict[int, tuple[Message, Channel]] = {}
+    profile: ProfileData
+    channels: tuple[ChannelData, ...] = ()
+    displayed_channels: dict[int, ChannelData] = {}
 
 
 class ContentType(StrEnum):
@@ -30,8 +58,27 @@ class ChannelModel(BaseModel):
     db_videos: list[str] = []
     db_streams: list[str] = []
 
-    loaded_videos: set[str] = set()
-    loaded_streams: set[str] = set()
+    loaded_videos: list[str] = []
+    loaded_streams: list[str] = []
 
     new_videos: list[str] = []
     new_streams: list[str] = []
+
+
+class FanOutReport(BaseModel):
+    job: str
+    total: int | None = None
+
+    sent: int = 0
+    failed: int = 0
+    skipped: int = 0
+
+    elapsed: float = 0.0
+
+    @property
+    def done(self) -> int:
+        return self.sent + self.failed + self.skipped
+
+    @property
+    def rate(self) -> float:
+        return self.sent / self.elapsed if self.elapsed else 0.0
@@ -1,9 +1,7 @@
-from asyncio import gather
-
 from apps.notifier.models import ChannelModel, ContentType
 from database.schemas import Stream, Video
 from database.utils import get_stream_db, get_video_db
-from utils.scrapper import get_content_urls
+from utils.scrapper import load_content_items
 
 
 # ========================|Load last content URLs from database|======================== #
@@ -41,25 +39,22 @@ async def db_load_ch_streams(channel_id: int) -> list[Stream]:
 
 # ===========================|Load content URLs from YouTube|=========================== #
 async def load_content_urls(channel_models: list[ChannelModel]) -> None:
-    tasks = []
-
-    for ch_model in channel_models:
-        tasks.append(_load_content_urls(ch_model))
-
-    await gather(*tasks)
-
-
-async def _load_content_urls(ch_model: ChannelModel) -> None:
-    tasks = [__load_videos_urls(ch_model), __load_streams_urls(ch_model)]
-    await gather(*tasks)
-
-
-async def __load_videos_urls(ch_model: ChannelModel) -> None:
-    ch_model.loaded_videos = await get_content_urls(ch_model.url, ContentType.videos)
+    tabs = [
+        (ch_model, content_type)
+        for ch_model in channel_models
+        for content_type in (ContentType.videos, ContentType.streams)
+    ]
+    loaded = await load_content_items(
+        [(ch_model.url, content_type) for ch_model, content_type in tabs]
+    )
 
+    for (ch_model, content_type), items in zip(tabs, loaded):
+        urls = [item.url for item in items]
 
-async def __load_streams_urls(ch_model: ChannelModel) -> None:
-    ch_model.loaded_streams = await get_content_urls(ch_model.url, ContentType.streams)
+        if content_type == ContentType.videos:
+            ch_model.loaded_videos = urls
+        else:
+            ch_model.loaded_streams = urls
 
 
 # ==============================|Detect new content URLs|=============================== #
@@ -70,10 +65,11 @@ def check_new_content(channel_models: list[ChannelModel]) -> None:
 
 
 def _check_new_videos(ch_model: ChannelModel) -> None:
+    db_videos = set(ch_model.db_videos)
     new_videos = []
 
     for loaded_video in ch_model.loaded_videos:
-        if loaded_video not in ch_model.db_videos:
+        if loaded_video not in db_videos:
             new_videos.append(loaded_video)
 
     if new_videos:
@@ -81,10 +77,11 @@ def _check_new_videos(ch_model: ChannelModel) -> None:
 
 
 def _check_new_streams(ch_model: ChannelModel) -> None:
+    db_streams = set(ch_model.db_streams)
     new_streams = []
 
     for loaded_stream in ch_model.loaded_streams:
-        if loaded_stream not in ch_model.db_streams:
+        if loaded_stream not in db_streams:
             new_streams.append(loaded_stream)
 
     if new_streams:
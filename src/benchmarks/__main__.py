@@ -0,0 +1,81 @@
+"""
+Набор микробенчмарков (benchmarks.suite) с записью результата в JSON
+и сравнением с результатом другого коммита.
+
+Запуск (из каталога src):
+    python -m benchmarks --output bench.json
+    python -m benchmarks --output new.json --compare old.json --threshold 1.2
+
+С --compare код возврата 1, если хоть один замер медленнее в threshold раз.
+"""
+
+from argparse import ArgumentParser
+from contextlib import suppress
+from datetime import datetime
+from json import dumps, loads
+from pathlib import Path
+from platform import python_version
+from subprocess import CalledProcessError, check_output  # nosec
+from sys import exit
+
+from benchmarks.suite import run_benchmark
+
+
+def _commit() -> str | None:
+    with suppress(CalledProcessError, FileNotFoundError):
+        return check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+
+
+def compare(current: dict, previous: dict, threshold: float) -> dict:
+    """Отношение времени операции к прошлому замеру для каждого общего бенчмарка"""
+    report = {"regressions": {}, "improvements": {}, "ratios": {}}
+
+    for name, result in current.items():
+        if name not in previous:
+            continue
+
+        ratio = round(result["us_per_op"] / previous[name]["us_per_op"], 2)
+        report["ratios"][name] = ratio
+
+        if ratio >= threshold:
+            report["regressions"][name] = ratio
+
+        elif ratio <= 1 / threshold:
+            report["improvements"][name] = ratio
+
+    return report
+
+
+def main() -> int:
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--output", default="bench.json")
+    parser.add_argument("--compare", default=None)
+    parser.add_argument("--threshold", type=float, default=1.2)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--pages", default=None)
+    args = parser.parse_args()
+
+    results = run_benchmark(repeat=args.repeat, pages=args.pages)
+    document = {
+        "meta": {
+            "commit": _commit(),
+            "python": python_version(),
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+        },
+        "results": results,
+    }
+    Path(args.output).write_text(dumps(document, indent=2), encoding="utf-8")
+
+    if not args.compare:
+        print(dumps(results, indent=2))  # noqa
+        return 0
+
+    previous = loads(Path(args.compare).read_text(encoding="utf-8"))["results"]
+    report = compare(results, previous, args.threshold)
+
+    print(dumps(report, indent=2))  # noqa
+    return 1 if report["regressions"] else 0
+
+
+if __name__ == "__main__":
+    exit(main())
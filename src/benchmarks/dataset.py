@@ -0,0 +1,228 @@
+"""
+Генератор синтетических данных для схемы database.schemas.
+
+Профили (90% active, 8% blocked, 2% banned) с 1-6 подписками,
+популярность каналов по закону Ципфа, история видео и стримов у каждого канала.
+Загрузка пачками через Core executemany, для PostgreSQL (asyncpg) — через COPY.
+Схема в целевой БД пересоздаётся: только для отдельной БД бенчмарков!
+
+Запуск (из каталога src):
+    python -m benchmarks.dataset --url sqlite+aiosqlite:///bench.db \\
+        --profiles 100000 --channels 50000 --videos 200
+"""
+
+from argparse import ArgumentParser
+from asyncio import run
+from datetime import datetime
+from enum import Enum
+from itertools import accumulate, islice
+from json import dumps
+from random import Random
+from time import perf_counter
+from typing import Iterable, Iterator
+
+from sqlalchemy import Table, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from benchmarks.fixtures import content_id
+from core.models import Status
+from database.base import Base
+from database.schemas import Channel, Profile, ProfileChannelAssociation, Stream, Video
+from database.utils import db
+
+BATCH_SIZE: int = 50_000
+STATUSES: tuple[tuple[Status, float], ...] = (
+    (Status.active, 0.90),
+    (Status.blocked, 0.08),
+    (Status.banned, 0.02),
+)
+
+
+def _batches(rows: Iterable[dict], size: int) -> Iterator[list[dict]]:
+    iterator = iter(rows)
+
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+async def _copy(connection: AsyncConnection, table: Table, rows: list[dict]) -> None:
+    raw = await connection.get_raw_connection()
+    columns = list(rows[0])
+
+    # SQLAlchemy хранит Enum в БД по имени члена
+    records = [
+        tuple(
+            value.name if isinstance(value, Enum) else value
+            for value in map(row.get, columns)
+        )
+        for row in rows
+    ]
+    await raw.driver_connection.copy_records_to_table(
+        table.name, records=records, columns=columns
+    )
+
+
+async def bulk_insert(
+    connection: AsyncConnection,
+    table: Table,
+    rows: Iterable[dict],
+    batch_size: int = BATCH_SIZE,
+) -> int:
+    """Пачечная вставка: COPY для asyncpg, иначе executemany"""
+    use_copy = connection.dialect.driver == "asyncpg"
+    inserted = 0
+
+    for batch in _batches(rows, batch_size):
+        if use_copy:
+            await _copy(connection, table, batch)
+        else:
+            await connection.execute(table.insert(), batch)
+
+        inserted += len(batch)
+
+    return inserted
+
+
+def _profiles(count: int, rnd: Random) -> Iterator[dict]:
+    statuses, weights = zip(*STATUSES)
+    now = datetime.now()
+
+    for idx in range(1, count + 1):
+        yield {
+            "id": idx,
+            "tg_id": 10_000 + idx,
+            "username": f"user_{idx}",
+            "first_name": f"User {idx}",
+            "last_name": None,
+            "status": rnd.choices(statuses, weights)[0],
+            "subs_limit": 6,
+            "auth_timestamp": now,
+        }
+
+
+def _channels(count: int) -> Iterator[dict]:
+    for idx in range(1, count + 1):
+        yield {
+            "id": idx,
+            "name": f"Channel {idx}",
+            "url": f"https://www.youtube.com/@channel_{idx}",
+            "canonical_url": f"https://www.youtube.com/channel/UC{idx:022}",
+        }
+
+
+def _subscriptions(profiles: int, channels: int, rnd: Random) -> Iterator[dict]:
+    # Закон Ципфа: канал k популярнее канала k+1
+    cum_weights = list(accumulate(1 / rank for rank in range(1, channels + 1)))
+    population = range(1, channels + 1)
+
+    for profile_id in range(1, profiles + 1):
+        subs = rnd.randint(1, min(6, channels))
+        channel_ids = set(rnd.choices(population, cum_weights=cum_weights, k=subs))
+
+        for channel_id in channel_ids:
+            yield {"profile_id": profile_id, "channel_id": channel_id}
+
+
+def _content(channels: int, kind: str, per_channel: int) -> Iterator[dict]:
+    for channel_id in range(1, channels + 1):
+        for num in range(per_channel):
+            yield {
+                "url": f"/watch?v={content_id(channel_id, kind, num)}",
+                "channel_id": channel_id,
+            }
+
+
+async def generate(
+    profiles: int,
+    channels: int,
+    videos: int,
+    streams: int,
+    seed: int = 0,
+    batch_size: int = BATCH_SIZE,
+) -> dict:
+    """
+    Пересоздание схемы и загрузка данных в уже инициализированную db.
+    Возвращает число строк и время загрузки по таблицам
+    """
+    rnd = Random(seed)
+    report = {}
+
+    async with db.connect() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+
+        if connection.dialect.name == "sqlite":
+            await connection.execute(text("PRAGMA synchronous = OFF"))
+
+        for table, rows in (
+            (Profile.__table__, _profiles(profiles, rnd)),
+            (Channel.__table__, _channels(channels)),
+            (
+                ProfileChannelAssociation.__table__,
+                _subscriptions(profiles, channels, rnd),
+            ),
+            (Video.__table__, _content(channels, "videos", videos)),
+            (Stream.__table__, _content(channels, "streams", streams)),
+        ):
+            started = perf_counter()
+            inserted = await bulk_insert(connection, table, rows, batch_size)
+
+            report[table.name] = {
+                "rows": inserted,
+                "sec": round(perf_counter() - started, 2),
+                "rows_per_sec": round(inserted / (perf_counter() - started)),
+            }
+
+        if connection.dialect.name == "postgresql":
+            for table in Base.metadata.sorted_tables:
+                await connection.execute(
+                    text(
+                        f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), "
+                        f"(SELECT COALESCE(MAX(id), 1) FROM {table.name}))"
+                    )
+                )
+
+    return report
+
+
+async def _run(url: str, **params) -> dict:
+    await db.init(url)
+
+    try:
+        return await generate(**params)
+
+    finally:
+        await db.close()
+
+
+def run_benchmark(
+    url: str,
+    profiles: int = 100_000,
+    channels: int = 50_000,
+    videos: int = 200,
+    streams: int = 20,
+    seed: int = 0,
+) -> dict:
+    return run(
+        _run(
+            url,
+            profiles=profiles,
+            channels=channels,
+            videos=videos,
+            streams=streams,
+            seed=seed,
+        )
+    )
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--url", required=True)
+    parser.add_argument("--profiles", type=int, default=100_000)
+    parser.add_argument("--channels", type=int, default=50_000)
+    parser.add_argument("--videos", type=int, default=200)
+    parser.add_argument("--streams", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(dumps(run_benchmark(**vars(args)), indent=2))  # noqa
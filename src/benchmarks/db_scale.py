@@ -0,0 +1,174 @@
+"""
+Поведение схемы БД с ростом данных.
+
+Для каждой точки масштаба (доля от 100k профилей, 50k каналов и 200 видео
+на канал = 10M строк) БД заполняется benchmarks.dataset и замеряются:
+- этап БД уведомителя: постраничная загрузка каналов с подписчиками
+  и истории видео/стримов (db_load_ch_content) по первым `--stage-channels`
+- get_user_channels и get_by_tg_id для случайных пользователей
+- список пользователей для админа (routers.admin.utils.get_profiles)
+
+По умолчанию каждая точка — новая временная SQLite; с --url используется
+указанная БД (схема пересоздаётся).
+
+Запуск (из каталога src):
+    python -m benchmarks.db_scale --scales 0.01 0.1 1
+"""
+
+from argparse import ArgumentParser
+from asyncio import run
+from json import dumps
+from pathlib import Path
+from random import Random
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from sqlalchemy.orm import load_only
+
+from apps.notifier.main import Notifier
+from apps.notifier.utils import db_load_ch_content
+from benchmarks.dataset import generate
+from database.schemas import Profile
+from database.utils import db, get_channel_db, get_profile_db
+from routers.admin.utils import get_profiles
+from utils.metrics import Histogram
+
+PROFILES: int = 100_000
+CHANNELS: int = 50_000
+VIDEOS: int = 200
+STREAMS: int = 20
+
+
+def _ms(histogram: Histogram) -> dict:
+    return {
+        "count": histogram.count,
+        "avg_ms": round(histogram.total / histogram.count * 1000, 3),
+        **{
+            key: round(value * 1000, 3)
+            for key, value in histogram.percentiles(0.5, 0.99).items()
+        },
+    }
+
+
+async def _notifier_stage(stage_channels: int) -> dict:
+    channels = 0
+    started = perf_counter()
+
+    async with get_channel_db() as channel_db:
+        async for batch in channel_db.aiter_load(
+            channel_db.get, max_pages=None, per_page=10
+        ):
+            await db_load_ch_content(Notifier.make_channels_models(batch))
+            channels += len(batch)
+
+            if channels >= stage_channels:
+                break
+
+    elapsed = perf_counter() - started
+    return {
+        "channels": channels,
+        "sec": round(elapsed, 2),
+        "ms_per_channel": round(elapsed / channels * 1000, 2) if channels else None,
+    }
+
+
+async def _lookups(profiles: int, samples: int, rnd: Random) -> dict:
+    user_channels = Histogram("db_scale.get_user_channels")
+    by_tg_id = Histogram("db_scale.get_by_tg_id")
+
+    for _ in range(samples):
+        tg_id = 10_000 + rnd.randint(1, profiles)
+
+        started = perf_counter()
+        async with get_channel_db() as channel_db:
+            await channel_db.get_user_channels(tg_id)
+        user_channels.observe(perf_counter() - started)
+
+        started = perf_counter()
+        async with get_profile_db() as profile_db:
+            await profile_db.get_by_tg_id(tg_id, options=[load_only(Profile.subs_limit)])
+        by_tg_id.observe(perf_counter() - started)
+
+    return {"get_user_channels": _ms(user_channels), "get_by_tg_id": _ms(by_tg_id)}
+
+
+async def _admin_listing() -> dict:
+    rows = 0
+    started = perf_counter()
+
+    async for profiles in get_profiles():
+        rows += len(profiles)
+
+    return {"rows": rows, "sec": round(perf_counter() - started, 3)}
+
+
+async def _scale_point(url: str, scale: float, args: dict) -> dict:
+    profiles = max(1, int(PROFILES * scale))
+    channels = max(1, int(CHANNELS * scale))
+
+    await db.init(url)
+
+    try:
+        started = perf_counter()
+        loaded = await generate(
+            profiles=profiles,
+            channels=channels,
+            videos=args["videos"],
+            streams=args["streams"],
+        )
+        generated = perf_counter() - started
+
+        return {
+            "scale": scale,
+            "rows": {table: info["rows"] for table, info in loaded.items()},
+            "generate_sec": round(generated, 1),
+            "notifier_db_stage": await _notifier_stage(args["stage_channels"]),
+            **await _lookups(profiles, args["samples"], Random(0)),
+            "admin_listing": await _admin_listing(),
+        }
+
+    finally:
+        await db.close()
+
+
+async def _run(args: dict) -> dict:
+    results = []
+
+    for scale in args["scales"]:
+        if args["url"]:
+            results.append(await _scale_point(args["url"], scale, args))
+            continue
+
+        with TemporaryDirectory() as directory:
+            path = Path(directory) / "scale.db"
+            result = await _scale_point(f"sqlite+aiosqlite:///{path}", scale, args)
+            result["db_size_mb"] = round(path.stat().st_size / 2**20, 1)
+            results.append(result)
+
+    return {"results": results}
+
+
+def run_benchmark(
+    scales: list[float] | None = None,
+    url: str | None = None,
+    videos: int = VIDEOS,
+    streams: int = STREAMS,
+    stage_channels: int = 1000,
+    samples: int = 200,
+) -> dict:
+    args = locals()
+    args["scales"] = scales or [0.01, 0.1, 1.0]
+    return run(_run(args))
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--scales", type=float, nargs="+", default=[0.01, 0.1, 1.0])
+    parser.add_argument("--url", default=None)
+    parser.add_argument("--videos", type=int, default=VIDEOS)
+    parser.add_argument("--streams", type=int, default=STREAMS)
+    parser.add_argument("--stage-channels", type=int, default=1000)
+    parser.add_argument("--samples", type=int, default=200)
+    args = parser.parse_args()
+
+    print(dumps(run_benchmark(**vars(args)), indent=2))  # noqa
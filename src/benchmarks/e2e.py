@@ -0,0 +1,300 @@
+"""
+Сквозной прогон уведомителя на локальных заглушках YouTube и Telegram Bot API.
+
+Поднимаются два aiohttp-сервера: вкладки /videos и /streams каналов
+(с задержкой, долей ошибок и новыми загрузками между циклами) и Bot API,
+принимающий sendMessage. БД — временная SQLite, заполненная N каналами
+и M пользователями. Затем выполняется несколько циклов Notifier.notify.
+
+Отчёт: время цикла, найденный контент, скорость рассылки, размер БД и память.
+Лимиты YouTube/Telegram по умолчанию боевые (settings.rate_limits).
+
+Запуск (из каталога src):
+    python -m benchmarks.e2e --channels 100 --users 1000 --cycles 3
+"""
+
+from argparse import ArgumentParser
+from asyncio import run, sleep
+from json import dumps
+from logging import basicConfig
+from pathlib import Path
+from random import Random
+from resource import RUSAGE_SELF, getrusage
+from tempfile import TemporaryDirectory
+from time import monotonic, time
+
+from aiogram import Bot
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
+from aiohttp import web
+
+from apps.notifier.main import Notifier
+from benchmarks.fixtures import content_id, make_page, seed_database
+from database.utils import db
+from utils.executor import ParseExecutor
+from utils.scrapper import page_cache
+from utils.token_bucket import Limiter
+
+BOT_TOKEN: str = "123456789:AAFakeTokenForLocalLoadHarness000000"
+HOST: str = "127.0.0.1"
+
+
+class FakeYouTube:
+    """Вкладки каналов `/@channel_{idx}/{videos|streams}`"""
+
+    def __init__(
+        self,
+        channels: int,
+        items: int = 30,
+        upload_rate: float = 0.1,
+        latency: float = 0.05,
+        error_rate: float = 0.0,
+        filler_kb: int = 300,
+        seed: int = 0,
+    ) -> None:
+        self.items = items
+        self.upload_rate = upload_rate
+        self.latency = latency
+        self.error_rate = error_rate
+        self.filler_kb = filler_kb
+        self.random = Random(seed)
+
+        # Следующий номер контента по каналу и типу; на странице — последние `items`
+        self.uploaded = {
+            (idx, kind): self.items if kind == "videos" else self.items // 3
+            for idx in range(1, channels + 1)
+            for kind in ("videos", "streams")
+        }
+        self.requests = 0
+        self.errors = 0
+
+    def upload(self) -> int:
+        """Новые загрузки: каждый канал с вероятностью upload_rate"""
+        uploads = 0
+
+        for key in self.uploaded:
+            if key[1] == "videos" and self.random.random() < self.upload_rate:
+                self.uploaded[key] += 1
+                uploads += 1
+
+        return uploads
+
+    async def tab(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        await sleep(self.latency)
+
+        if self.random.random() < self.error_rate:
+            self.errors += 1
+            return web.Response(status=503, text="Service Unavailable")
+
+        idx = int(request.match_info["handle"].removeprefix("@channel_"))
+        kind = request.match_info["tab"]
+        uploaded = self.uploaded.get((idx, kind))
+
+        if uploaded is None:
+            raise web.HTTPNotFound()
+
+        ids = [
+            content_id(idx, kind, num)
+            for num in range(uploaded - 1, max(uploaded - self.items, 0) - 1, -1)
+        ]
+        page = make_page(kind, filler_kb=self.filler_kb, seed=idx, ids=ids)
+        return web.Response(text=page, content_type="text/html")
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/{handle}/{tab}", self.tab)
+        return app
+
+
+class FakeTelegram:
+    """Bot API: sendMessage и остальные методы, отвечающие True"""
+
+    def __init__(self, latency: float = 0.02, error_rate: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.random = Random(seed)
+
+        self.sent = 0
+        self.errors = 0
+        self.message_id = 0
+
+    async def method(self, request: web.Request) -> web.Response:
+        await sleep(self.latency)
+        method = request.match_info["method"].lower()
+
+        if method != "sendmessage":
+            return web.json_response({"ok": True, "result": True})
+
+        if self.random.random() < self.error_rate:
+            self.errors += 1
+            return web.json_response(
+                {
+                    "ok": False,
+                    "error_code": 403,
+                    "description": "Forbidden: bot was blocked by the user",
+                },
+                status=403,
+            )
+
+        data = await request.post()
+        self.sent += 1
+        self.message_id += 1
+
+        return web.json_response(
+            {
+                "ok": True,
+                "result": {
+                    "message_id": self.message_id,
+                    "date": int(time()),
+                    "chat": {"id": int(data["chat_id"]), "type": "private"},
+                    "text": data.get("text", ""),
+                },
+            }
+        )
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post("/bot{token}/{method}", self.method)
+        return app
+
+
+async def _serve(app: web.Application) -> tuple[web.AppRunner, int]:
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+
+    site = web.TCPSite(runner, HOST, 0)
+    await site.start()
+
+    return runner, site._server.sockets[0].getsockname()[1]  # noqa
+
+
+def _memory_mb() -> float:
+    return round(getrusage(RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+async def _run(args: dict) -> dict:
+    youtube = FakeYouTube(
+        args["channels"],
+        upload_rate=args["upload_rate"],
+        latency=args["yt_latency"],
+        error_rate=args["yt_errors"],
+        filler_kb=args["page_kb"],
+    )
+    telegram = FakeTelegram(latency=args["tg_latency"], error_rate=args["tg_errors"])
+
+    yt_runner, yt_port = await _serve(youtube.app())
+    tg_runner, tg_port = await _serve(telegram.app())
+
+    session = AiohttpSession(api=TelegramAPIServer.from_base(f"http://{HOST}:{tg_port}"))
+    bot = Bot(BOT_TOKEN, session=session)
+
+    if args["youtube_rate"]:
+        Limiter.limits["YouTube"] = args["youtube_rate"]
+
+    if args["telegram_rate"]:
+        Limiter.limits["Telegram"] = args["telegram_rate"]
+
+    Limiter.start()
+    ParseExecutor.start(mode=args["parser_mode"])
+
+    cycles = []
+
+    with TemporaryDirectory() as directory:
+        db_path = Path(directory) / "e2e.db"
+        await db.init(f"sqlite+aiosqlite:///{db_path}")
+
+        try:
+            await seed_database(
+                profiles=args["users"],
+                channels=args["channels"],
+                subscriptions=args["subscriptions"],
+                videos=youtube.items,
+                streams=youtube.items // 3,
+                channel_url=f"http://{HOST}:{yt_port}/@channel_{{idx}}",
+            )
+            notifier = Notifier(bot)
+
+            for _ in range(args["cycles"]):
+                uploads = youtube.upload()
+                sent_before = telegram.sent
+                page_cache.clear()  # Иначе циклы подряд не увидят новых загрузок
+
+                started = monotonic()
+                await notifier.notify()
+                elapsed = monotonic() - started
+
+                sent = telegram.sent - sent_before
+                cycles.append(
+                    {
+                        "uploads": uploads,
+                        "cycle_sec": round(elapsed, 2),
+                        "sent": sent,
+                        "send_rate": round(sent / elapsed, 1) if elapsed else 0.0,
+                        "rss_max_mb": _memory_mb(),
+                    }
+                )
+
+            db_size = db_path.stat().st_size
+
+        finally:
+            await db.close()
+            ParseExecutor.stop()
+            Limiter.stop()
+            await bot.session.close()
+            await yt_runner.cleanup()
+            await tg_runner.cleanup()
+
+    return {
+        "channels": args["channels"],
+        "users": args["users"],
+        "subscriptions": args["subscriptions"],
+        "rate_limits": dict(Limiter.limits),
+        "youtube": {"requests": youtube.requests, "errors": youtube.errors},
+        "telegram": {"sent": telegram.sent, "errors": telegram.errors},
+        "db_size_mb": round(db_size / 2**20, 2),
+        "cycles": cycles,
+    }
+
+
+def run_benchmark(
+    channels: int = 100,
+    users: int = 1000,
+    subscriptions: int = 3,
+    cycles: int = 3,
+    upload_rate: float = 0.1,
+    page_kb: int = 300,
+    yt_latency: float = 0.05,
+    yt_errors: float = 0.0,
+    tg_latency: float = 0.02,
+    tg_errors: float = 0.0,
+    youtube_rate: int | None = None,
+    telegram_rate: int | None = None,
+    parser_mode: str = "inline",
+) -> dict:
+    return run(_run(locals()))
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--channels", type=int, default=100)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--subscriptions", type=int, default=3)
+    parser.add_argument("--cycles", type=int, default=3)
+    parser.add_argument("--upload-rate", type=float, default=0.1)
+    parser.add_argument("--page-kb", type=int, default=300)
+    parser.add_argument("--yt-latency", type=float, default=0.05)
+    parser.add_argument("--yt-errors", type=float, default=0.0)
+    parser.add_argument("--tg-latency", type=float, default=0.02)
+    parser.add_argument("--tg-errors", type=float, default=0.0)
+    parser.add_argument("--youtube-rate", type=int, default=None)
+    parser.add_argument("--telegram-rate", type=int, default=None)
+    parser.add_argument(
+        "--parser-mode", choices=["inline", "thread", "process"], default="inline"
+    )
+    parser.add_argument("--log-level", default="ERROR")
+    args = vars(parser.parse_args())
+
+    basicConfig(level=args.pop("log_level"))
+
+    print(dumps(run_benchmark(**args), indent=2))  # noqa
@@ -0,0 +1,120 @@
+"""
+Разбор страниц канала: отдельные find_* против однопроходного extract_page.
+
+Прежний путь — find_channel_name, find_original_url, find_canonical_url
+и find_content_urls, каждый своим поиском по странице. Отдельно сравнивается
+поиск контента: регулярное выражение по всей странице против разбора среза
+ytInitialData (extract_content). Контент из ytInitialData должен идти в том же
+порядке, что и ссылки в разметке, но может быть короче: регулярное выражение
+находит ещё и рекомендации. Страницы без ytInitialData считаются в `fallback`.
+
+Запуск (из каталога src):
+    python -m benchmarks.finder --repeat 20 [--pages path/to/recorded/html]
+"""
+
+from argparse import ArgumentParser
+from json import dumps
+from time import perf_counter
+
+from benchmarks.fixtures import load_pages
+from utils.finder import (
+    extract_content,
+    extract_page,
+    find_canonical_url,
+    find_channel_name,
+    find_content_urls,
+    find_original_url,
+)
+
+
+def _legacy(page: str) -> tuple:
+    return (
+        find_channel_name(page),
+        find_original_url(page),
+        find_canonical_url(page),
+        find_content_urls(page),
+    )
+
+
+def _one_pass(page: str) -> tuple:
+    info = extract_page(page)
+    return info.name, info.original_url, info.canonical_url, info.content_urls
+
+
+def _regex_content(page: str) -> list[str]:
+    return find_content_urls(page)
+
+
+def _structured_content(page: str) -> list[str]:
+    return [item.url for item in extract_content(page) or ()]
+
+
+def _is_ordered_subset(urls: list[str], expected: list[str]) -> bool:
+    """`urls` - подпоследовательность `expected` без повторов"""
+    remaining = iter(expected)
+    return len(set(urls)) == len(urls) and all(url in remaining for url in urls)
+
+
+def _measure(parse, pages: list[str], repeat: int) -> dict:
+    started = perf_counter()
+
+    for _ in range(repeat):
+        for page in pages:
+            parse(page)
+
+    elapsed = perf_counter() - started
+    megabytes = sum(map(len, pages)) * repeat / 2**20
+
+    return {
+        "ms_per_page": round(elapsed / (repeat * len(pages)) * 1000, 3),
+        "mb_per_sec": round(megabytes / elapsed, 1),
+    }
+
+
+def run_benchmark(repeat: int = 20, pages: str | None = None) -> dict:
+    fixtures = load_pages(pages)
+    fallback = 0
+
+    for page in fixtures:
+        name, original_url, canonical_url, content_urls = _legacy(page)
+        expected = name, original_url, canonical_url, list(dict.fromkeys(content_urls))
+
+        assert _one_pass(page) == expected, "extract_page result differs"
+
+        if extract_content(page) is None:
+            fallback += 1
+            continue
+
+        assert _is_ordered_subset(
+            _structured_content(page), expected[3]
+        ), "extract_content is not an ordered subset of page content"
+
+    legacy = _measure(_legacy, fixtures, repeat)
+    one_pass = _measure(_one_pass, fixtures, repeat)
+    regex_content = _measure(_regex_content, fixtures, repeat)
+    structured_content = _measure(_structured_content, fixtures, repeat)
+
+    return {
+        "pages": len(fixtures),
+        "fallback": fallback,
+        "avg_page_kb": round(sum(map(len, fixtures)) / len(fixtures) / 1024),
+        "legacy": legacy,
+        "one_pass": one_pass,
+        "speedup": round(legacy["ms_per_page"] / one_pass["ms_per_page"], 2),
+        "content": {
+            "regex": regex_content,
+            "initial_data": structured_content,
+            "speedup": round(
+                regex_content["ms_per_page"] / structured_content["ms_per_page"], 2
+            ),
+        },
+    }
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--pages", default=None)
+    args = parser.parse_args()
+
+    print(dumps(run_benchmark(**vars(args)), indent=2))  # noqa
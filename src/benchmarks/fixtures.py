@@ -0,0 +1,259 @@
+"""
+Страницы YouTube для бенчмарков разбора.
+
+Если есть записанные страницы (*.html), они берутся из каталога `--pages`.
+Иначе генерируются синтетические страницы вкладок /videos и /streams с той же
+разметкой, что и у YouTube: canonical, ld+json, ytcfg и ytInitialData
+с richItemRenderer/videoRenderer, плюс объёмный скрипт-заполнитель.
+"""
+
+from json import dumps
+from pathlib import Path
+from random import Random
+from string import ascii_letters, digits
+
+from core.models import Status
+from database.base import Base
+from database.schemas import Channel, Profile, ProfileChannelAssociation, Stream, Video
+from database.utils import db
+
+ID_ALPHABET: str = f"{ascii_letters}{digits}-_"
+
+
+def content_id(channel: int, kind: str, num: int) -> str:
+    """Детерминированный 11-символьный ID контента канала"""
+    return f"{channel:05}{kind[0]}{num:05}"
+
+
+def _random_id(rnd: Random, length: int) -> str:
+    return "".join(rnd.choices(ID_ALPHABET, k=length))
+
+
+def _video_renderer(rnd: Random, video_id: str, idx: int, status: str) -> dict:
+    renderer = {
+        "videoId": video_id,
+        "thumbnail": {
+            "thumbnails": [
+                {
+                    "url": f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg",
+                    "width": 168,
+                    "height": 94,
+                }
+            ]
+        },
+        "title": {
+            "runs": [{"text": f'Видео №{idx} "{_random_id(rnd, 8)}"'}],
+            "accessibility": {"accessibilityData": {"label": f"Видео №{idx}"}},
+        },
+        "descriptionSnippet": {"runs": [{"text": _random_id(rnd, 120)}]},
+        "viewCountText": {"simpleText": f"{rnd.randint(1, 10**6)} views"},
+        "navigationEndpoint": {
+            "clickTrackingParams": _random_id(rnd, 40),
+            "commandMetadata": {
+                "webCommandMetadata": {
+                    "url": f"/watch?v={video_id}",
+                    "webPageType": "WEB_PAGE_TYPE_WATCH",
+                    "rootVe": 3832,
+                }
+            },
+            "watchEndpoint": {"videoId": video_id},
+        },
+        "thumbnailOverlays": [
+            {"thumbnailOverlayTimeStatusRenderer": {"style": status.upper()}}
+        ],
+    }
+
+    if status == "upcoming":
+        renderer["upcomingEventData"] = {
+            "startTime": str(1_700_000_000 + idx * 3600),
+            "isReminderSet": False,
+        }
+
+    elif status == "default":
+        renderer["publishedTimeText"] = {"simpleText": f"{idx + 1} days ago"}
+        renderer["lengthText"] = {"simpleText": f"{rnd.randint(1, 59)}:{idx % 60:02}"}
+
+    return renderer
+
+
+def make_page(
+    kind: str = "videos",
+    items: int = 30,
+    filler_kb: int = 600,
+    seed: int = 0,
+    ids: list[str] | None = None,
+) -> str:
+    """
+    Синтетическая страница вкладки канала. `ids` — ID контента от нового
+    к старому, по умолчанию `items` случайных
+    """
+    rnd = Random(seed)
+
+    channel_id = f"UC{_random_id(rnd, 22)}"
+    handle = f"channel_{seed}"
+    name = f"Канал {seed}"
+
+    if ids is None:
+        ids = [_random_id(rnd, 11) for _ in range(items)]
+
+    items = len(ids)
+    statuses = ["default"] * items
+
+    if kind == "streams" and items:
+        upcoming = min(3, items)
+        statuses[0] = "live"
+        statuses[1:upcoming] = ["upcoming"] * (upcoming - 1)
+
+    contents = [
+        {
+            "richItemRenderer": {
+                "content": {
+                    "videoRenderer": _video_renderer(rnd, content_id, idx, status)
+                }
+            }
+        }
+        for idx, (content_id, status) in enumerate(zip(ids, statuses))
+    ]
+    contents.append({"continuationItemRenderer": {"trigger": "CONTINUATION_TRIGGER"}})
+
+    initial_data = {
+        "responseContext": {"visitorData": _random_id(rnd, 32)},
+        "contents": {
+            "twoColumnBrowseResultsRenderer": {
+                "tabs": [
+                    {"tabRenderer": {"title": "Home", "selected": False}},
+                    {
+                        "tabRenderer": {
+                            "title": kind.capitalize(),
+                            "selected": True,
+                            "content": {"richGridRenderer": {"contents": contents}},
+                        }
+                    },
+                ]
+            }
+        },
+        "metadata": {
+            "channelMetadataRenderer": {
+                "title": name,
+                "externalId": channel_id,
+                "channelUrl": f"https://www.youtube.com/channel/{channel_id}",
+                "vanityChannelUrl": f"http://www.youtube.com/@{handle}",
+            }
+        },
+    }
+    ld_json = {
+        "@context": "http://schema.org",
+        "@type": "BreadcrumbList",
+        "itemListElement": [
+            {
+                "@type": "ListItem",
+                "position": 1,
+                "item": {"@id": f"http://www.youtube.com/@{handle}", "name": name},
+            }
+        ],
+    }
+    ytcfg = {
+        "INNERTUBE_CONTEXT": {
+            "client": {
+                "hl": "en",
+                "originalUrl": f"https://www.youtube.com/@{handle}/{kind}",
+            }
+        }
+    }
+    filler = "".join(
+        f'window["{_random_id(rnd, 6)}"]="{_random_id(rnd, 90)}";'
+        for _ in range(filler_kb * 1024 // 110)
+    )
+
+    return (
+        '<!DOCTYPE html><html lang="en"><head>'
+        f'<link rel="canonical" href="https://www.youtube.com/channel/{channel_id}">'
+        f"<title>{name} - YouTube</title>"
+        f"<script>{filler}</script>"
+        f"<script>ytcfg.set({dumps(ytcfg, separators=(',', ':'))});</script>"
+        '<script type="application/ld+json" nonce="n">'
+        f"{dumps(ld_json, ensure_ascii=False)}</script>"
+        "</head><body>"
+        '<span itemprop="author" itemscope itemtype="http://schema.org/Person">'
+        f'<link itemprop="url" href="http://www.youtube.com/@{handle}">'
+        f'<link itemprop="name" content="{name}"></span>'
+        '<script nonce="n">var ytInitialData = '
+        f"{dumps(initial_data, ensure_ascii=False, separators=(',', ':'))};</script>"
+        "</body></html>"
+    )
+
+
+def load_pages(directory: str | None = None, count: int = 10) -> list[str]:
+    """Записанные страницы из каталога или синтетические, если каталог не задан"""
+    if directory:
+        return [
+            path.read_text(encoding="utf-8")
+            for path in sorted(Path(directory).glob("*.html"))
+        ]
+
+    return [
+        make_page(kind="streams" if idx % 2 else "videos", seed=idx)
+        for idx in range(count)
+    ]
+
+
+async def seed_database(
+    profiles: int,
+    channels: int,
+    subscriptions: int,
+    videos: int = 30,
+    streams: int = 10,
+    channel_url: str = "https://www.youtube.com/@channel_{idx}",
+) -> None:
+    """
+    Создание схемы и заполнение БД (db уже инициализирована): профили с
+    `subscriptions` подписками, каналы с историей из `content_id`
+    """
+    async with db.connect() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+
+        await connection.execute(
+            Profile.__table__.insert(),
+            [
+                {
+                    "tg_id": 10_000 + idx,
+                    "username": f"user_{idx}",
+                    "first_name": f"User {idx}",
+                    "status": Status.active,
+                    "subs_limit": 6,
+                }
+                for idx in range(1, profiles + 1)
+            ],
+        )
+        await connection.execute(
+            Channel.__table__.insert(),
+            [
+                {
+                    "name": f"Channel {idx}",
+                    "url": channel_url.format(idx=idx),
+                    "canonical_url": f"https://www.youtube.com/channel/UC{idx:022}",
+                }
+                for idx in range(1, channels + 1)
+            ],
+        )
+        await connection.execute(
+            ProfileChannelAssociation.__table__.insert(),
+            [
+                {"profile_id": idx, "channel_id": (idx * 7 + sub) % channels + 1}
+                for idx in range(1, profiles + 1)
+                for sub in range(min(subscriptions, channels))
+            ],
+        )
+
+        for table, kind, per_channel in (
+            (Video, "videos", videos),
+            (Stream, "streams", streams),
+        ):
+            await connection.execute(
+                table.__table__.insert(),
+                [
+                    {"url": f"/watch?v={content_id(ch, kind, num)}", "channel_id": ch}
+                    for ch in range(1, channels + 1)
+                    for num in range(per_channel)
+                ],
+            )
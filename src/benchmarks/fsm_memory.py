@@ -0,0 +1,133 @@
+"""
+Память, занимаемая состоянием FSM, в пересчёте на 100k пользователей.
+
+Сравнивается прежнее состояние (ORM-объекты Profile/Channel и объекты Message
+в MemoryStorage) с компактным UserFSMmodel в CompactMemoryStorage.
+
+Запуск (из каталога src):
+    python -m benchmarks.fsm_memory --users 20000
+"""
+
+from argparse import ArgumentParser
+from asyncio import run
+from datetime import datetime
+from gc import collect
+from json import dumps
+from tracemalloc import get_traced_memory, start, stop
+
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.types import Chat, Message
+from pydantic import BaseModel, ConfigDict
+
+from apps.notifier.models import ChannelData, ProfileData, UserFSMmodel
+from core.storage import CompactMemoryStorage
+from database.schemas import Channel, Profile
+
+CHANNELS_PER_USER: int = 3
+
+
+class LegacyUserFSMmodel(BaseModel):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    profile: Profile
+    channels: list[Channel] = []
+    displayed_channels: dict[int, tuple[Message, Channel]] = {}
+
+
+def _profile(tg_id: int) -> Profile:
+    return Profile(
+        id=tg_id,
+        tg_id=tg_id,
+        username=f"user_{tg_id}",
+        first_name=f"User {tg_id}",
+        subs_limit=6,
+    )
+
+
+def _channels(tg_id: int) -> list[Channel]:
+    return [
+        Channel(
+            id=tg_id * CHANNELS_PER_USER + idx,
+            name=f"Channel {idx}",
+            url=f"https://www.youtube.com/@channel_{idx}",
+        )
+        for idx in range(CHANNELS_PER_USER)
+    ]
+
+
+def _message(tg_id: int, message_id: int, channel: Channel) -> Message:
+    return Message(
+        message_id=message_id,
+        date=datetime.now(),
+        chat=Chat(id=tg_id, type="private"),
+        text=f"~ {channel.name} ~\n\nYouTube: {channel.url}",
+    )
+
+
+async def _fill_legacy(users: int) -> MemoryStorage:
+    storage = MemoryStorage()
+
+    for tg_id in range(users):
+        channels = _channels(tg_id)
+        user = LegacyUserFSMmodel(
+            profile=_profile(tg_id),
+            channels=channels,
+            displayed_channels={
+                idx: (_message(tg_id, idx, channel), channel)
+                for idx, channel in enumerate(channels)
+            },
+        )
+        key = StorageKey(bot_id=1, chat_id=tg_id, user_id=tg_id)
+        await storage.set_data(key, {str(tg_id): user})
+
+    return storage
+
+
+async def _fill_compact(users: int) -> CompactMemoryStorage:
+    storage = CompactMemoryStorage(max_size=users)
+
+    for tg_id in range(users):
+        channels = ChannelData.from_orms(_channels(tg_id))
+        user = UserFSMmodel(
+            profile=ProfileData.from_orm(_profile(tg_id)),
+            channels=channels,
+            displayed_channels=dict(enumerate(channels)),
+        )
+        key = StorageKey(bot_id=1, chat_id=tg_id, user_id=tg_id)
+        await storage.set_data(key, user.model_dump())
+
+    return storage
+
+
+def _measure(fill, users: int) -> dict:
+    collect()
+    start()
+
+    storage = run(fill(users))
+    collect()
+    current, _ = get_traced_memory()
+
+    stop()
+    del storage
+
+    return {
+        "users": users,
+        "bytes_per_user": round(current / users),
+        "mb_per_100k_users": round(current / users * 100_000 / 2**20, 1),
+    }
+
+
+def run_benchmark(users: int = 20_000) -> dict:
+    return {
+        "legacy": _measure(_fill_legacy, users),
+        "compact": _measure(_fill_compact, users),
+    }
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=20_000)
+    args = parser.parse_args()
+
+    print(dumps(run_benchmark(**vars(args)), indent=2))  # noqa
@@ -0,0 +1,109 @@
+"""
+Время event loop, потраченное на логирование при рассылке.
+
+Запуск (из каталога src):
+    python -m benchmarks.logging_fanout
+"""
+
+from asyncio import gather, run, sleep
+from json import dumps
+from logging import getLogger, root
+from logging.config import dictConfig
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from log.settings import LoggingSettings
+from log.utils import start_queue_listener, stop_queue_listener
+
+MESSAGES: int = 10_000
+TEXT: str = (
+    "<b><i>~ Channel ~\n\nНовый контент!\n\n" + "https://youtu.be/xxxxxxxxxxx " * 8
+)
+
+logger = getLogger("benchmarks.logging_fanout")
+
+CASES: dict[str, dict] = {
+    "sync_file": {"rotating_file_handler": True},
+    "queue_full": {"rotating_file_handler": True, "queue_handler": True},
+    "queue_truncate": {
+        "rotating_file_handler": True,
+        "queue_handler": True,
+        "body_mode": "truncate",
+    },
+    "queue_hash_json": {
+        "rotating_file_handler": True,
+        "queue_handler": True,
+        "body_mode": "hash",
+        "json_format": True,
+    },
+}
+
+
+async def _fanout(log_settings: LoggingSettings, messages: int) -> float:
+    spent = 0.0
+
+    async def send(tg_id: int) -> None:
+        nonlocal spent
+
+        start = perf_counter()
+        logger.debug(
+            'Try send message. (user_tg_id="%s" | chat_id="%s" | text="%s")',
+            tg_id,
+            tg_id,
+            log_settings.body(TEXT),
+        )
+        spent += perf_counter() - start
+
+        await sleep(0)
+
+        start = perf_counter()
+        logger.info(
+            "Send message success. "
+            '(message_id="%s" | user_tg_id="%s" | chat_id="%s" | text="%s")',
+            tg_id,
+            tg_id,
+            tg_id,
+            log_settings.body(TEXT),
+        )
+        spent += perf_counter() - start
+
+    await gather(*[send(tg_id) for tg_id in range(messages)])
+    return spent
+
+
+def _run_case(logs_dir: str, options: dict, messages: int) -> dict:
+    log_settings = LoggingSettings(logs_dir=logs_dir, filename="app.log", **options)
+    config = log_settings.dict_config
+    config["handlers"]["console"]["class"] = "logging.NullHandler"
+
+    dictConfig(config)
+    start_queue_listener()
+
+    try:
+        spent = run(_fanout(log_settings, messages))
+    finally:
+        stop_queue_listener()
+
+        for handler in root.handlers[:]:
+            root.removeHandler(handler)
+            handler.close()
+
+    return {
+        "messages": messages,
+        "loop_time_s": round(spent, 4),
+        "per_message_us": round(spent / messages * 1_000_000, 2),
+    }
+
+
+def run_benchmark(messages: int = MESSAGES) -> dict:
+    results = {}
+
+    with TemporaryDirectory() as logs_dir:
+        for name, options in CASES.items():
+            results[name] = _run_case(logs_dir, options, messages)
+
+    return results
+
+
+if __name__ == "__main__":
+    print(dumps(run_benchmark(), indent=2))  # noqa
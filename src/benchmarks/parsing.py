@@ -0,0 +1,96 @@
+"""
+Задержка event loop и пропускная способность разбора страниц в ParseExecutor.
+
+Пока пачка страниц разбирается parse_content, в том же loop тикает таймер
+каждые `--tick` мс; его опоздание и есть задержка обработки апдейтов Telegram.
+Режимы: inline (в loop), thread и process с разным числом воркеров.
+
+Запуск (из каталога src):
+    python -m benchmarks.parsing --pages 64 --workers 1 2 4
+"""
+
+from argparse import ArgumentParser
+from asyncio import Event, create_task, run, sleep
+from json import dumps
+from time import perf_counter
+
+from benchmarks.fixtures import load_pages
+from utils.executor import ParseExecutor
+from utils.finder import parse_content
+from utils.metrics import Histogram
+
+
+async def _ticker(tick: float, lag: Histogram, stop: Event) -> None:
+    while not stop.is_set():
+        started = perf_counter()
+        await sleep(tick)
+        lag.observe((perf_counter() - started - tick) * 1000)
+
+
+async def _measure(mode: str, workers: int, pages: list[str], tick: float) -> dict:
+    ParseExecutor.start(mode=mode, workers=workers)
+
+    # Прогрев: запуск процессов и импорт модулей в них не входит в замер
+    await ParseExecutor.map(parse_content, pages[:workers])
+
+    lag = Histogram(f"loop_lag.{mode}")
+    stop = Event()
+    ticker = create_task(_ticker(tick, lag, stop))
+    await sleep(tick)
+
+    started = perf_counter()
+    await ParseExecutor.map(parse_content, pages)
+    elapsed = perf_counter() - started
+
+    stop.set()
+    await ticker
+    ParseExecutor.stop()
+
+    return {
+        "mode": mode,
+        "workers": workers,
+        "pages_per_sec": round(len(pages) / elapsed, 1),
+        "loop_lag_ms": {
+            "max": round(max(lag.samples, default=0.0), 2),
+            **{k: round(v, 2) for k, v in lag.percentiles(0.5, 0.99).items()},
+        },
+    }
+
+
+async def _run(pages: int, workers: list[int], batch_size: int, tick: float) -> dict:
+    fixtures = load_pages(count=min(pages, 16))
+    fixtures = [fixtures[idx % len(fixtures)] for idx in range(pages)]
+
+    ParseExecutor.batch_size = batch_size
+    results = [await _measure("inline", 1, fixtures, tick)]
+
+    for mode in ("thread", "process"):
+        for count in workers:
+            results.append(await _measure(mode, count, fixtures, tick))
+
+    return {
+        "pages": pages,
+        "batch_size": batch_size,
+        "tick_ms": tick * 1000,
+        "results": results,
+    }
+
+
+def run_benchmark(
+    pages: int = 64,
+    workers: list[int] | None = None,
+    batch_size: int = 4,
+    tick: float = 0.005,
+) -> dict:
+    return run(_run(pages, workers or [1, 2, 4], batch_size, tick))
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=64)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--batch-size", type=int, default=4)
+    parser.add_argument("--tick", type=float, default=0.005)
+    args = parser.parse_args()
+
+    print(dumps(run_benchmark(**vars(args)), indent=2))  # noqa
@@ -0,0 +1,96 @@
+"""
+Реальные пути get_channel_page/get_content_urls на записанных ответах YouTube.
+
+Сначала ответы записываются в кассету (нужна сеть), затем прогоняются
+из неё без сети, детерминированно и без ограничения частоты запросов.
+
+Запуск (из каталога src):
+    python -m benchmarks.scrapper --mode record --cassette cassettes/yt.zip \\
+        https://www.youtube.com/@channel_a https://www.youtube.com/@channel_b
+    python -m benchmarks.scrapper --mode replay --cassette cassettes/yt.zip \\
+        https://www.youtube.com/@channel_a https://www.youtube.com/@channel_b
+"""
+
+from argparse import ArgumentParser
+from asyncio import run
+from json import dumps
+from time import perf_counter
+
+from apps.notifier.models import ContentType
+from utils.executor import ParseExecutor
+from utils.http import HTTPManager
+from utils.http.cassette import Cassette
+from utils.scrapper import get_channel_page, get_content_urls, page_cache
+from utils.token_bucket import Limiter
+
+
+async def _scrape(channel_urls: list[str]) -> dict:
+    result = {}
+
+    for channel_url in channel_urls:
+        page = await get_channel_page(channel_url)
+        videos = await get_content_urls(channel_url, ContentType.videos)
+        streams = await get_content_urls(channel_url, ContentType.streams)
+
+        result[channel_url] = {
+            "page_kb": round(len(page or "") / 1024),
+            "videos": len(videos),
+            "streams": len(streams),
+        }
+
+    return result
+
+
+async def _run(channel_urls: list[str], mode: str, cassette: str, repeat: int) -> dict:
+    HTTPManager.CASSETTE = Cassette(cassette, mode)
+
+    if mode == "replay":
+        Limiter.limits["YouTube"] = 10**6
+
+    Limiter.start()
+    ParseExecutor.start(mode="inline")
+
+    try:
+        channels = await _scrape(channel_urls)
+
+        if mode == "record":
+            return {"mode": mode, "cassette": cassette, "channels": channels}
+
+        started = perf_counter()
+
+        for _ in range(repeat):
+            page_cache.clear()
+            await _scrape(channel_urls)
+
+        elapsed = perf_counter() - started
+
+    finally:
+        Limiter.stop()
+        ParseExecutor.stop()
+
+    return {
+        "mode": mode,
+        "cassette": cassette,
+        "channels": channels,
+        "ms_per_channel": round(elapsed / (repeat * len(channel_urls)) * 1000, 2),
+    }
+
+
+def run_benchmark(
+    channel_urls: list[str],
+    mode: str = "replay",
+    cassette: str = "cassettes/http.zip",
+    repeat: int = 10,
+) -> dict:
+    return run(_run(channel_urls, mode, cassette, repeat))
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("channel_urls", nargs="+")
+    parser.add_argument("--mode", choices=["record", "replay"], default="replay")
+    parser.add_argument("--cassette", default="cassettes/http.zip")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    print(dumps(run_benchmark(**vars(args)), indent=2))  # noqa
@@ -0,0 +1,317 @@
+"""
+Микробенчмарки горячих путей: разбор страниц, заголовки, поиск нового контента
+и методы database.orm на заполненной SQLite. Работает без сети.
+
+Каждый замер — медиана и минимум времени одной операции (мкс) по `repeat`
+прогонам. Для сравнения коммитов используйте `python -m benchmarks`.
+
+Запуск (из каталога src):
+    python -m benchmarks.suite --repeat 5
+"""
+
+from argparse import ArgumentParser
+from asyncio import run
+from copy import deepcopy
+from json import dumps
+from pathlib import Path
+from statistics import median
+from tempfile import TemporaryDirectory
+from time import perf_counter, time
+from typing import Awaitable, Callable
+
+from sqlalchemy.orm import load_only
+
+from apps.notifier.models import ChannelModel
+from apps.notifier.utils import check_new_content
+from benchmarks.fixtures import load_pages, seed_database
+from core.models import Status
+from database.schemas import Profile
+from database.utils import (
+    db,
+    get_channel_db,
+    get_channel_resolution_db,
+    get_fsm_state_db,
+    get_prof_ch_association_db,
+    get_profile_db,
+    get_stream_db,
+    get_video_db,
+)
+from utils.finder import (
+    extract_content,
+    extract_page,
+    find_canonical_url,
+    find_channel_name,
+    find_channel_url,
+    find_content_urls,
+    find_original_url,
+    parse_content,
+)
+from utils.http.http_headers import ChromeHeadersBuilder, Headers
+from utils.http.http_manager import HTTPManager
+
+PROFILES: int = 1000
+CHANNELS: int = 300
+SUBSCRIPTIONS: int = 5
+VIDEOS_PER_CHANNEL: int = 30
+STREAMS_PER_CHANNEL: int = 10
+
+
+def _result(timings: list[float], number: int) -> dict:
+    per_op = [elapsed / number * 1e6 for elapsed in timings]
+    return {
+        "us_per_op": round(median(per_op), 2),
+        "min_us": round(min(per_op), 2),
+        "number": number,
+    }
+
+
+def _autorange(func: Callable[[], object], budget: float = 0.2) -> int:
+    number = 1
+
+    while True:
+        started = perf_counter()
+
+        for _ in range(number):
+            func()
+
+        if perf_counter() - started >= budget or number >= 1_000_000:
+            return number
+
+        number *= 10
+
+
+def timeit(func: Callable[[], object], repeat: int) -> dict:
+    number = _autorange(func)
+    timings = []
+
+    for _ in range(repeat):
+        started = perf_counter()
+
+        for _ in range(number):
+            func()
+
+        timings.append(perf_counter() - started)
+
+    return _result(timings, number)
+
+
+async def atimeit(
+    func: Callable[[], Awaitable[object]], repeat: int, number: int = 50
+) -> dict:
+    await func()
+    timings = []
+
+    for _ in range(repeat):
+        started = perf_counter()
+
+        for _ in range(number):
+            await func()
+
+        timings.append(perf_counter() - started)
+
+    return _result(timings, number)
+
+
+# =======================================|Finder|======================================= #
+def bench_finder(repeat: int, pages: str | None = None) -> dict:
+    page = load_pages(pages, count=1)[0]
+
+    return {
+        "finder.find_channel_url": timeit(lambda: find_channel_url(page), repeat),
+        "finder.find_channel_name": timeit(lambda: find_channel_name(page), repeat),
+        "finder.find_original_url": timeit(lambda: find_original_url(page), repeat),
+        "finder.find_canonical_url": timeit(lambda: find_canonical_url(page), repeat),
+        "finder.find_content_urls": timeit(lambda: find_content_urls(page), repeat),
+        "finder.extract_page": timeit(lambda: extract_page(page), repeat),
+        "finder.extract_content": timeit(lambda: extract_content(page), repeat),
+        "finder.parse_content": timeit(lambda: parse_content(page), repeat),
+    }
+
+
+# ======================================|Headers|======================================= #
+def bench_headers(repeat: int) -> dict:
+    builder = ChromeHeadersBuilder()
+
+    def randomize() -> None:
+        builder.randomize_headers(Headers(deepcopy(HTTPManager.HEADERS)))
+
+    return {"http_headers.randomize_headers": timeit(randomize, repeat)}
+
+
+# ====================================|New content|===================================== #
+def bench_check_new_content(repeat: int, history: int = 5000, loaded: int = 30) -> dict:
+    def make_models() -> list[ChannelModel]:
+        return [
+            ChannelModel(
+                id=idx,
+                name=f"Channel {idx}",
+                url=f"https://www.youtube.com/@channel_{idx}",
+                target_tg_ids=[],
+                db_videos=[f"/watch?v={num:011}" for num in range(history)],
+                db_streams=[f"/watch?v={num:011}" for num in range(history // 5)],
+                loaded_videos=[f"/watch?v={num:011}" for num in range(-2, loaded - 2)],
+                loaded_streams=[f"/watch?v={num:011}" for num in range(-1, loaded - 1)],
+            )
+            for idx in range(10)
+        ]
+
+    models = make_models()
+
+    return {
+        f"notifier.check_new_content[history={history}]": timeit(
+            lambda: check_new_content(models), repeat
+        )
+    }
+
+
+# ========================================|ORM|========================================= #
+async def _bench_orm(repeat: int, number: int) -> dict:  # noqa: C901
+    results = {}
+
+    async def bench(name: str, func: Callable[[], Awaitable[object]]) -> None:
+        results[f"orm.{name}"] = await atimeit(func, repeat, number)
+
+    # ====================================|Profile|===================================== #
+    async def get_by_tg_id() -> None:
+        async with get_profile_db() as profile_db:
+            await profile_db.get_by_tg_id(10_500, options=[load_only(Profile.subs_limit)])
+
+    async def set_status() -> None:
+        async with get_profile_db() as profile_db:
+            await profile_db.set_status(range(10_001, 10_101), Status.active)
+
+    async def profiles_get() -> None:
+        async with get_profile_db() as profile_db:
+            (await profile_db.get(limit=50)).data.all()
+
+    await bench("ProfileDatabase.get_by_tg_id", get_by_tg_id)
+    await bench("ProfileDatabase.set_status[100]", set_status)
+    await bench("ProfileDatabase.get", profiles_get)
+
+    # ====================================|Channels|==================================== #
+    async def get_user_channels() -> None:
+        async with get_channel_db() as channel_db:
+            await channel_db.get_user_channels(10_500)
+
+    async def get_by_url() -> None:
+        async with get_channel_db() as channel_db:
+            await channel_db.get_by_url(
+                "https://www.youtube.com/channel/UC" + "0" * 19 + "150"
+            )
+
+    async def get_by_id() -> None:
+        async with get_channel_db() as channel_db:
+            await channel_db.get_by_id(150)
+
+    async def channels_get() -> None:
+        async with get_channel_db() as channel_db:
+            (await channel_db.get(limit=10)).data.all()
+
+    await bench("ChannelsDatabase.get_user_channels", get_user_channels)
+    await bench("ChannelsDatabase.get_by_url", get_by_url)
+    await bench("ChannelsDatabase.get_by_id", get_by_id)
+    await bench("ChannelsDatabase.get", channels_get)
+
+    # =================================|Videos/Streams|================================= #
+    async def videos_get() -> None:
+        async with get_video_db() as video_db:
+            (await video_db.get(channel_id=150)).data.all()
+
+    async def streams_get() -> None:
+        async with get_stream_db() as stream_db:
+            (await stream_db.get(channel_id=150)).data.all()
+
+    await bench("VideoDatabase.get", videos_get)
+    await bench("StreamDatabase.get", streams_get)
+
+    # ==================================|Associations|================================== #
+    async def subscribe_unsubscribe() -> None:
+        async with get_prof_ch_association_db() as association_db:
+            await association_db.create([{"profile_id": 1, "channel_id": 299}])
+            await association_db.delete(profile_id=1, channel_id=299)
+
+    await bench("ProfileChannelAssociationDatabase.create+delete", subscribe_unsubscribe)
+
+    # ======================================|FSM|======================================= #
+    fsm_state = {"key": "1:10500:10500", "state": None, "data": "{}", "version": 1}
+
+    async def fsm_upsert() -> None:
+        async with get_fsm_state_db() as fsm_db:
+            await fsm_db.upsert([fsm_state])
+
+    async def fsm_get_by_key() -> None:
+        async with get_fsm_state_db() as fsm_db:
+            await fsm_db.get_by_key(fsm_state["key"])
+
+    async def fsm_get_version() -> None:
+        async with get_fsm_state_db() as fsm_db:
+            await fsm_db.get_version(fsm_state["key"])
+
+    await bench("FSMStateDatabase.upsert", fsm_upsert)
+    await bench("FSMStateDatabase.get_by_key", fsm_get_by_key)
+    await bench("FSMStateDatabase.get_version", fsm_get_version)
+
+    # ==================================|Resolution|==================================== #
+    resolution = {
+        "url": "https://youtube.com/@channel_150",
+        "channel_id": 150,
+        "expires_at": int(time()) + 3600,
+    }
+
+    async def resolution_upsert() -> None:
+        async with get_channel_resolution_db() as resolution_db:
+            await resolution_db.upsert([resolution])
+
+    async def resolution_get_by_url() -> None:
+        async with get_channel_resolution_db() as resolution_db:
+            await resolution_db.get_by_url(resolution["url"])
+
+    async def resolution_delete_expired() -> None:
+        async with get_channel_resolution_db() as resolution_db:
+            await resolution_db.delete_expired()
+
+    await bench("ChannelResolutionDatabase.upsert", resolution_upsert)
+    await bench("ChannelResolutionDatabase.get_by_url", resolution_get_by_url)
+    await bench("ChannelResolutionDatabase.delete_expired", resolution_delete_expired)
+
+    return results
+
+
+async def _run_orm(repeat: int, number: int) -> dict:
+    with TemporaryDirectory() as directory:
+        await db.init(f"sqlite+aiosqlite:///{Path(directory) / 'bench.db'}")
+
+        try:
+            await seed_database(
+                PROFILES,
+                CHANNELS,
+                SUBSCRIPTIONS,
+                VIDEOS_PER_CHANNEL,
+                STREAMS_PER_CHANNEL,
+            )
+            return await _bench_orm(repeat, number)
+
+        finally:
+            await db.close()
+
+
+def bench_orm(repeat: int, number: int = 50) -> dict:
+    return run(_run_orm(repeat, number))
+
+
+def run_benchmark(repeat: int = 5, pages: str | None = None) -> dict:
+    return {
+        **bench_finder(repeat, pages),
+        **bench_headers(repeat),
+        **bench_check_new_content(repeat),
+        **bench_orm(repeat),
+    }
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--pages", default=None)
+    args = parser.parse_args()
+
+    print(dumps(run_benchmark(**vars(args)), indent=2))  # noqa
@@ -0,0 +1,133 @@
+"""
+Накладные расходы трассировки на цикл уведомлений.
+
+Цикл имитируется без сети и БД: пачки каналов с теми же span, что
+в Notifier (db.batch, youtube.page, parse, fanout), реальным разбором
+страниц-фикстур и задержкой загрузки страницы `--latency-ms`
+(0 - худший случай, только CPU). Режимы:
+- off - Sentry не инициализирован, span - пустые контексты
+- dropped - транзакция записывается и отбрасывается хвостовым сэмплированием
+- kept - транзакция отправляется (в транспорт-заглушку)
+
+Если расходы режима dropped выше `--budget` (доля от off), код возврата 1.
+
+Запуск (из каталога src):
+    python -m benchmarks.tracing --batches 20 --repeat 20 --budget 0.05
+"""
+
+import sys
+from argparse import ArgumentParser
+from asyncio import gather, run, sleep
+from json import dumps
+from time import perf_counter
+
+from sentry_sdk.transport import Transport
+
+from benchmarks.fixtures import make_page
+from utils.finder import parse_content
+from utils.tracing import Tracing, span, transaction
+
+PAGES_PER_BATCH: int = 10
+
+
+class NullTransport(Transport):
+    """Принимает конверты Sentry и только считает их"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.envelopes = 0
+
+    def capture_envelope(self, envelope) -> None:
+        self.envelopes += 1
+
+
+async def _page(page: str, latency: float) -> str:
+    with span("youtube.page", "fixture"):
+        await sleep(latency)
+        return page
+
+
+async def _cycle(batches: int, pages: list[str], latency: float) -> None:
+    with transaction("notify cycle", "notifier.cycle"):
+        for _ in range(batches):
+            with span("db.batch", "db_load_ch_content"):
+                await sleep(0)
+
+            with span("youtube.batch", "load_content_urls"):
+                loaded = await gather(*(_page(page, latency) for page in pages))
+
+                with span("parse", f"parse_content x{len(loaded)}"):
+                    for page in loaded:
+                        parse_content(page)
+
+            with span("db.batch", "save_new_content"):
+                await sleep(0)
+
+            with span("fanout", "new content"):
+                await sleep(0)
+
+
+async def _measure(batches: int, repeat: int, pages: list[str], latency: float) -> float:
+    await _cycle(batches, pages, latency)  # прогрев
+    started = perf_counter()
+
+    for _ in range(repeat):
+        await _cycle(batches, pages, latency)
+
+    return (perf_counter() - started) / repeat
+
+
+def run_benchmark(
+    batches: int = 20,
+    repeat: int = 20,
+    page_kb: int = 50,
+    latency_ms: float = 50.0,
+    budget: float = 0.05,
+) -> dict:
+    pages = [
+        make_page("videos", filler_kb=page_kb, seed=idx) for idx in range(PAGES_PER_BATCH)
+    ]
+    spans = batches * (5 + PAGES_PER_BATCH)
+    latency = latency_ms / 1000
+    result = {
+        "batches": batches,
+        "spans_per_cycle": spans,
+        "latency_ms": latency_ms,
+        "budget": budget,
+    }
+
+    result["off_ms"] = round(run(_measure(batches, repeat, pages, latency)) * 1000, 2)
+
+    transport = NullTransport()
+    Tracing.init("https://public@localhost/1", transport=transport)
+
+    for mode, tail_rate in (("dropped", 0.0), ("kept", 1.0)):
+        Tracing.tail_rate = tail_rate
+        elapsed = run(_measure(batches, repeat, pages, latency))
+
+        result[f"{mode}_ms"] = round(elapsed * 1000, 2)
+        result[f"{mode}_overhead"] = round(elapsed * 1000 / result["off_ms"] - 1, 4)
+        result[f"{mode}_us_per_span"] = round(
+            (elapsed * 1000 - result["off_ms"]) * 1000 / spans, 2
+        )
+
+    Tracing.sdk.flush()
+    result["envelopes"] = transport.envelopes
+    result["within_budget"] = result["dropped_overhead"] <= budget
+
+    return result
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--batches", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--page-kb", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--budget", type=float, default=0.05)
+    args = parser.parse_args()
+
+    result = run_benchmark(**vars(args))
+    print(dumps(result, indent=2))  # noqa
+
+    sys.exit(0 if result["within_budget"] else 1)
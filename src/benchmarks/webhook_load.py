@@ -0,0 +1,89 @@
+"""
+Нагрузочный тест приёма апдейтов webhook.
+
+Запустить бота с APP.WEBHOOK.WORKERS=1, затем с APP.WEBHOOK.WORKERS=N
+и сравнить пропускную способность (из каталога src):
+    python -m benchmarks.webhook_load --url http://127.0.0.1:1000/webhook/<token>
+"""
+
+from argparse import ArgumentParser
+from asyncio import Semaphore, gather, run
+from itertools import count
+from json import dumps
+from time import perf_counter
+
+from aiohttp import ClientSession
+
+from utils.metrics import Histogram
+
+UPDATE_ID = count(1)
+
+
+def build_update(chat_id: int, text: str | None) -> dict:
+    """
+    Без текста - edited_message, для которого нет хэндлера:
+    измеряется только приём и диспетчеризация апдейта
+    """
+    message = {
+        "message_id": next(UPDATE_ID),
+        "date": 0,
+        "chat": {"id": chat_id, "type": "private"},
+        "from": {"id": chat_id, "is_bot": False, "first_name": "load"},
+        "text": text or "load",
+    }
+    key = "message" if text else "edited_message"
+    return {"update_id": next(UPDATE_ID), key: message}
+
+
+async def run_benchmark(
+    url: str,
+    secret: str | None = None,
+    updates: int = 10_000,
+    concurrency: int = 64,
+    chats: int = 1_000,
+    text: str | None = None,
+) -> dict:
+    latency = Histogram("webhook.latency", size=updates)
+    statuses: dict[int, int] = {}
+    semaphore = Semaphore(concurrency)
+    headers = {"X-Telegram-Bot-Api-Secret-Token": secret} if secret else {}
+
+    async with ClientSession(headers=headers) as session:
+
+        async def post(idx: int) -> None:
+            async with semaphore:
+                start = perf_counter()
+
+                async with session.post(
+                    url, json=build_update(idx % chats, text)
+                ) as resp:
+                    await resp.read()
+
+                latency.observe(perf_counter() - start)
+                statuses[resp.status] = statuses.get(resp.status, 0) + 1
+
+        started = perf_counter()
+        await gather(*[post(idx) for idx in range(updates)])
+        elapsed = perf_counter() - started
+
+    return {
+        "updates": updates,
+        "concurrency": concurrency,
+        "elapsed_s": round(elapsed, 3),
+        "updates_per_s": round(updates / elapsed, 1),
+        "statuses": statuses,
+        "latency_s": latency.percentiles(0.5, 0.9, 0.99),
+    }
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--url", required=True)
+    parser.add_argument("--secret", default=None)
+    parser.add_argument("--updates", type=int, default=10_000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--chats", type=int, default=1_000)
+    parser.add_argument("--text", default=None)
+    args = parser.parse_args()
+
+    print(dumps(run(run_benchmark(**vars(args))), indent=2))  # noqa
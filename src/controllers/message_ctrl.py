@@ -7,11 +7,15 @@ from aiogram.exceptions import (
     TelegramNetworkError,
     TelegramUnauthorizedError,
 )
-from aiogram.types import InlineKeyboardMarkup, Message, MessageEntity
+from aiogram.types import (
+    BufferedInputFile,
+    InlineKeyboardMarkup,
+    Message,
+    MessageEntity,
+)
 
+from controllers.status_ctrl import BlockedUsers
 from core.settings import settings
-from core.models import Status
-from database.utils import get_profile_db
 from utils.token_bucket import rate_limit
 
 logger = getLogger(__name__)
@@ -22,13 +26,13 @@ async def delete_message(message: Message | None) -> bool:
     if message is None:
         return False
 
-    logger.info(
+    logger.debug(
         "Try delete message. "
         '(message_id="%s" | sender_tg_id="%s" | chat_id="%s" | text="%s")',
         message.message_id,
         message.from_user.id,
         message.chat.id,
-        message.text,
+        settings.logging.body(message.text),
     )
 
     try:
@@ -40,7 +44,7 @@ async def delete_message(message: Message | None) -> bool:
             message.message_id,
             message.from_user.id,
             message.chat.id,
-            message.text,
+            settings.logging.body(message.text),
         )
 
     except TelegramBadRequest as ex:
@@ -53,7 +57,38 @@ async def delete_message(message: Message | None) -> bool:
             message.message_id,
             message.from_user.id,
             message.chat.id,
-            message.text,
+            settings.logging.body(message.text),
+        )
+
+    return deleted_result
+
+
+@rate_limit("Telegram")
+async def delete_messages(bot: Bot, chat_id: int, message_ids: list[int]) -> bool:
+    logger.debug(
+        'Try delete messages. (chat_id="%s" | message_ids="%s")',
+        chat_id,
+        message_ids,
+    )
+
+    try:
+        deleted_result = await bot.delete_messages(chat_id, message_ids)
+
+        logger.info(
+            'Messages delete success. (chat_id="%s" | message_ids="%s")',
+            chat_id,
+            message_ids,
+        )
+
+    except TelegramBadRequest as ex:
+        deleted_result = False
+
+        logger.warning(
+            "Messages delete failure. Exception message: %s. "
+            '(chat_id="%s" | message_ids="%s")',
+            ex.message,
+            chat_id,
+            message_ids,
         )
 
     return deleted_result
@@ -70,13 +105,13 @@ async def edit_message(
     if message is None:
         return
 
-    logger.info(
+    logger.debug(
         "Try edit message. "
         '(message_id="%s" | sender_tg_id="%s" | chat_id="%s" | text="%s")',
         message.message_id,
         message.from_user.id,
         message.chat.id,
-        message.text,
+        settings.logging.body(message.text),
     )
 
     try:
@@ -93,7 +128,7 @@ async def edit_message(
             message.message_id,
             message.from_user.id,
             message.chat.id,
-            message.text,
+            settings.logging.body(message.text),
         )
 
     except TelegramBadRequest as ex:
@@ -106,7 +141,7 @@ async def edit_message(
             message.message_id,
             message.from_user.id,
             message.chat.id,
-            message.text,
+            settings.logging.body(message.text),
         )
 
     return edited_message
@@ -123,11 +158,11 @@ async def send_message(
     disable_web_page_preview: bool = False,
     timeout: int = settings.requests_timeout,
 ) -> Message | None:
-    logger.info(
+    logger.debug(
         'Try send message. (user_tg_id="%s" | chat_id="%s" | text="%s")',
         user_tg_id,
         chat_id,
-        text,
+        settings.logging.body(text),
     )
 
     try:
@@ -146,22 +181,77 @@ async def send_message(
             message.message_id,
             user_tg_id,
             chat_id,
-            text,
+            settings.logging.body(text),
         )
 
         return message
 
     except (TelegramUnauthorizedError, TelegramForbiddenError, TelegramBadRequest):
-        async with get_profile_db() as profile_db:
-            user_profile = await profile_db.get_by_tg_id(user_tg_id)
+        BlockedUsers.mark(user_tg_id)
+
+        logger.warning('Bot blocked by user. (user_tg_id="%s")', user_tg_id)
+
+    except TelegramNetworkError as ex:
+        logger.warning(
+            "Telegram network error. Exception message: %s. "
+            '(url=%s | method="%s" | label="%s")',
+            ex.message,
+            ex.url,
+            ex.method,
+            ex.label,
+        )
+
 
-            to_update = {"id": user_profile.id, "status": Status.blocked}
-            await profile_db.update([to_update])
+@rate_limit("Telegram")
+async def send_document(
+    bot: Bot,
+    chat_id: int,
+    user_tg_id: int,
+    content: bytes,
+    filename: str,
+    caption: str | None = None,
+    timeout: int = settings.requests_timeout,
+) -> Message | None:
+    logger.debug(
+        'Try send document. (user_tg_id="%s" | chat_id="%s" | filename="%s")',
+        user_tg_id,
+        chat_id,
+        filename,
+    )
 
+    try:
+        message = await bot.send_document(
+            chat_id=chat_id,
+            document=BufferedInputFile(content, filename=filename),
+            caption=caption,
+            request_timeout=timeout,
+        )
+
+        logger.info(
+            "Send document success. "
+            '(message_id="%s" | user_tg_id="%s" | chat_id="%s" | filename="%s")',
+            message.message_id,
+            user_tg_id,
+            chat_id,
+            filename,
+        )
+
+        return message
+
+    except (TelegramUnauthorizedError, TelegramForbiddenError):
+        BlockedUsers.mark(user_tg_id)
+
+        logger.warning('Bot blocked by user. (user_tg_id="%s")', user_tg_id)
+
+    except TelegramBadRequest as ex:
         logger.warning(
-            'Bot blocked by user. (username="%s" | user_tg_id="%s")',
-            user_profile.username,
+            "Send document failure. Exception message: %s. "
+            '(user_tg_id="%s" | chat_id="%s" | filename="%s" | size="%s")',
+            ex.message,
             user_tg_id,
+            chat_id,
+            filename,
+            len(content),
         )
 
     except TelegramNetworkError as ex:
@@ -0,0 +1,130 @@
+from asyncio import Event, get_running_loop, wait_for
+from contextlib import suppress
+from logging import getLogger
+
+from controllers.user_ctrl import invalidate_user
+from core.models import Status
+from core.settings import settings
+from database.utils import get_profile_db
+from utils.common import run_in_background
+
+logger = getLogger(__name__)
+
+
+class BlockedUsers:
+    """
+    Накопитель отметок о блокировке бота пользователями.
+    Отметки пишутся в БД одним UPDATE раз в `flush_delay` секунд
+    или при накоплении `flush_size` записей.
+    Пользователь, снявший отметку во время записи, после неё
+    возвращается в active отдельным UPDATE.
+    Без start() (воркеры webhook) отметка пишется сразу
+    """
+
+    flush_delay: int = settings.blocked_flush_delay
+    flush_size: int = settings.blocked_flush_size
+
+    pending: set[int] = set()
+    blocked: set[int] = set()
+
+    flushing: set[int] = set()
+    restored: set[int] = set()
+
+    flush_event = Event()
+
+    __started: bool = False
+
+    @classmethod
+    def start(cls) -> None:
+        cls.__started = True
+
+        loop = get_running_loop()
+        loop.create_task(cls._auto_flush())
+
+        logger.debug("Blocked users flusher started")
+
+    @classmethod
+    async def stop(cls) -> None:
+        cls.__started = False
+        cls.flush_event.set()
+
+        await cls.flush()
+
+        logger.debug("Blocked users flusher stopped")
+
+    @classmethod
+    def mark(cls, tg_id: int) -> None:
+        cls.pending.add(tg_id)
+        cls.blocked.add(tg_id)
+
+        if not cls.__started:
+            run_in_background(cls.flush())
+
+        elif len(cls.pending) >= cls.flush_size:
+            cls.flush_event.set()
+
+    @classmethod
+    def unmark(cls, tg_id: int) -> None:
+        cls.pending.discard(tg_id)
+        cls.blocked.discard(tg_id)
+
+        if tg_id in cls.flushing:
+            cls.restored.add(tg_id)
+
+    @classmethod
+    def is_blocked(cls, tg_id: int) -> bool:
+        return tg_id in cls.blocked
+
+    @classmethod
+    def reset(cls) -> None:
+        """
+        Забыть уже записанные в БД отметки: получатели уведомлений
+        отбираются по статусу профиля (Notifier._get_target_tg_ids)
+        """
+        cls.blocked = set(cls.pending)
+
+    @classmethod
+    async def _auto_flush(cls) -> None:
+        while cls.__started:
+            with suppress(TimeoutError):
+                await wait_for(cls.flush_event.wait(), cls.flush_delay)
+
+            cls.flush_event.clear()
+            await cls.flush()
+
+    @classmethod
+    async def flush(cls) -> None:
+        if not cls.pending:
+            return
+
+        tg_ids, cls.pending = cls.pending, set()
+        cls.flushing = tg_ids
+        restored: set[int] = set()
+
+        try:
+            async with get_profile_db() as profile_db:
+                updated = await profile_db.set_status(tg_ids, Status.blocked)
+
+                # Сняты во время записи: компенсирующая запись после коммита
+                restored, cls.restored = cls.restored, set()
+
+                if restored:
+                    await profile_db.set_status(restored, Status.active)
+
+        except Exception as ex:
+            cls.pending.update(tg_ids - restored - cls.restored)
+            cls.restored.clear()
+            logger.error("Blocked users flush failed: Count=%d | %s", len(tg_ids), ex)
+            return
+
+        finally:
+            cls.flushing = set()
+
+        invalidate_user(*tg_ids)
+
+        logger.info(
+            "Blocked users flushed: Marked=%d | Updated=%d | Restored=%d",
+            len(tg_ids),
+            updated,
+            len(restored),
+        )
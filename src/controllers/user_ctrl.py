@@ -0,0 +1,68 @@
+from logging import getLogger
+
+from sqlalchemy.orm import load_only
+
+from apps.notifier.models import ChannelData, ProfileData
+from core.settings import settings
+from database.schemas import Profile
+from database.utils import get_channel_db, get_profile_db
+from utils.cache import TTLCache
+from utils.metrics import metrics
+
+logger = getLogger(__name__)
+
+# Сброс кэша виден только своему процессу: при нескольких воркерах webhook
+# записи живут `user_shared_ttl` секунд
+user_cache = TTLCache(
+    "user_data",
+    ttl=(
+        settings.cache.user_shared_ttl
+        if settings.webhook.multiprocess
+        else settings.cache.user_ttl
+    ),
+    max_size=settings.cache.user_size,
+)
+
+# Загрузка, во время которой был сброс, не кэшируется
+invalidations = metrics.counter("cache.user_data.invalidations")
+
+UserData = tuple[ProfileData, tuple[ChannelData, ...]]
+
+
+async def get_user(tg_id: int) -> UserData:
+    """
+    Профиль и подписки пользователя. Кэш сбрасывается через `invalidate_user`
+    после записи подписки, отписки, добавления канала и смены статуса
+    """
+    user = user_cache.get(tg_id)
+
+    if user is not None:
+        return user
+
+    generation = invalidations.value
+    user = await _load_user(tg_id)
+
+    if generation == invalidations.value:
+        user_cache.set(tg_id, user)
+
+    return user
+
+
+async def _load_user(tg_id: int) -> UserData:
+    async with get_profile_db() as profile_db:
+        profile = await profile_db.get_by_tg_id(
+            tg_id, options=[load_only(Profile.subs_limit)]
+        )
+
+    async with get_channel_db() as channels_db:
+        channels = await channels_db.get_user_channels(tg_id)
+
+    return ProfileData.from_orm(profile), ChannelData.from_orms(channels)
+
+
+def invalidate_user(*tg_ids: int) -> None:
+    """Вызывается после коммита изменений"""
+    invalidations.inc()
+
+    for tg_id in tg_ids:
+        user_cache.pop(tg_id)
@@ -1,22 +1,33 @@
 from asyncio import get_running_loop
+from functools import partial
 from logging import getLogger
 
 from aiogram import Bot
 from aiogram.types.bot_command import BotCommand
 
 from apps.notifier.main import Notifier
+from controllers.status_ctrl import BlockedUsers
 from core.models import Smiles
+from core.primary import PrimaryCommands
 from core.settings import settings
-from database.utils import db, set_triggers
-from routers.admin.utils import notify_admins
+from database.utils import db, get_channel_resolution_db, set_triggers
+from routers.admin.utils import notify_admins, send_stats
+from utils.executor import ParseExecutor
+from utils.metrics import MetricsReporter
 from utils.token_bucket import Limiter
+from utils.watchdog import LoopWatchdog
 
 logger = getLogger(__name__)
 
 
 class Lifespan:
-    def __init__(self, bot: Bot) -> None:
+    def __init__(self, bot: Bot, primary: bool = True) -> None:
+        """
+        :param primary: процесс, в котором работает уведомитель и настраивается
+            webhook. В режиме нескольких воркеров он ровно один
+        """
         self.bot = bot
+        self.primary = primary
         self.notifier = Notifier(bot)
 
     async def _delete_webhook(self) -> None:
@@ -52,8 +63,27 @@ class Lifespan:
 
         logger.info("Set bot commands: %s", commands)
 
+    def rate_share(self) -> float:
+        """
+        Доля лимитов процесса: воркеры webhook обрабатывают только апдейты
+        и получают по `worker_rate_share`, остаток - основному процессу
+        с уведомителем
+        """
+        workers = settings.webhook.workers if settings.webhook.active else 1
+
+        if workers == 1:
+            return 1.0
+
+        worker_share = settings.webhook.worker_rate_share
+
+        if not self.primary:
+            return worker_share
+
+        return max(1.0 - worker_share * (workers - 1), worker_share)
+
     async def on_startup(self) -> None:
-        Limiter.start()
+        Limiter.start(share=self.rate_share())
+        MetricsReporter.start(role="primary" if self.primary else "worker")
 
         await db.init(
             settings.db.url,
@@ -62,8 +92,32 @@ class Lifespan:
             max_overflow=settings.db.max_overflow,
             pool_size=settings.db.pool_size,
         )
+
+        if not self.primary:
+            # Разбор страницы при добавлении канала - в потоке, без пула процессов.
+            # Уведомителя нет: ни watchdog, ни фонового сброса блокировок
+            ParseExecutor.start(
+                mode="inline" if settings.parser.mode == "inline" else "thread",
+                workers=1,
+            )
+
+            logger.info("Startup webhook worker")
+            return
+
+        BlockedUsers.start()
+        ParseExecutor.start()
+        PrimaryCommands.start({"stats": partial(send_stats, self.bot)})
+
+        if settings.watchdog.active:
+            LoopWatchdog.start()
+
         await set_triggers()
 
+        async with get_channel_resolution_db() as resolution_db:
+            purged = await resolution_db.delete_expired()
+
+        logger.info("Purge expired channel resolutions: %d", purged)
+
         await self.set_bot_command()
 
         loop = get_running_loop()
@@ -90,11 +144,18 @@ class Lifespan:
         )
 
     async def on_shutdown(self) -> None:
-        await notify_admins(
-            self.bot,
-            f"{Smiles.skull} <b><i>Grateful stopping bot...</i></b> {Smiles.skull}",
-        )
-        self.notifier.stop()
+        if self.primary:
+            await notify_admins(
+                self.bot,
+                f"{Smiles.skull} <b><i>Grateful stopping bot...</i></b> {Smiles.skull}",
+            )
+            self.notifier.stop()
+            await PrimaryCommands.stop()
+
+        await BlockedUsers.stop()
+        ParseExecutor.stop()
+        LoopWatchdog.stop()
+        MetricsReporter.stop()
         await db.close()
         Limiter.stop()
 
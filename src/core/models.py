@@ -63,6 +63,14 @@ class UtilMessages(StrEnum):
     admin_commands = (
         f"{Smiles.gear} <b>Команды администрирования:</b> {Smiles.gear}\n\n"
         "/users - <i>список пользователей</i>\n\n"
+        "/profile [секунды|cycle] [top] - <i>профиль CPU: N секунд "
+        "или один цикл уведомлений</i>\n\n"
+        "/stats [hour|day|month] - <i>перцентили и тренды цикла уведомлений, "
+        "рассылки, лимитов, БД и event loop</i>\n\n"
+        "/memory [stop] - <i>снимок памяти: топ аллокаций, рост с прошлого снимка, "
+        "объекты по типам</i>\n\n"
+        "/sql [reset] - <i>формы запросов к БД по суммарному времени "
+        "и подозрения на N+1</i>\n\n"
     )
 
 
@@ -0,0 +1,90 @@
+from asyncio import Task, get_running_loop, to_thread
+from logging import getLogger
+from multiprocessing.context import BaseContext
+from multiprocessing.queues import Queue
+from queue import Empty, Full
+from typing import Any, Awaitable, Callable
+
+logger = getLogger(__name__)
+
+CommandHandler = Callable[..., Awaitable[Any]]
+
+
+class PrimaryCommands:
+    """
+    Команды, которые может выполнить только основной процесс: его данные
+    (временные ряды уведомителя и т.п.) в воркерах webhook пусты.
+    Воркер кладёт команду в очередь, созданную до запуска воркеров, основной
+    процесс выполняет её и сам отвечает пользователю
+    """
+
+    queue: Queue | None = None
+    handlers: dict[str, CommandHandler] = {}
+
+    poll_timeout: float = 1.0
+
+    _task: Task | None = None
+
+    @classmethod
+    def init(cls, context: BaseContext, maxsize: int = 100) -> None:
+        """Вызывается в основном процессе до запуска воркеров"""
+        cls.queue = context.Queue(maxsize=maxsize)
+
+    @classmethod
+    def available(cls) -> bool:
+        return cls.queue is not None
+
+    @classmethod
+    def submit(cls, name: str, **kwargs: Any) -> bool:
+        try:
+            cls.queue.put_nowait((name, kwargs))
+
+        except Full:
+            logger.warning('Primary command rejected, queue is full: Command="%s"', name)
+            return False
+
+        return True
+
+    @classmethod
+    def start(cls, handlers: dict[str, CommandHandler]) -> None:
+        if cls.queue is None:
+            return
+
+        cls.handlers = handlers
+        cls._task = get_running_loop().create_task(cls._reader())
+
+        logger.info("Primary commands started: Commands=%s", list(handlers))
+
+    @classmethod
+    async def stop(cls) -> None:
+        if cls._task is None:
+            return
+
+        cls._task.cancel()
+        cls._task = None
+
+        logger.info("Primary commands stopped")
+
+    @classmethod
+    def _get(cls) -> tuple[str, dict[str, Any]] | None:
+        # С таймаутом: поток не должен блокировать остановку пула потоков
+        try:
+            return cls.queue.get(timeout=cls.poll_timeout)
+        except Empty:
+            return None
+
+    @classmethod
+    async def _reader(cls) -> None:
+        while True:
+            command = await to_thread(cls._get)
+
+            if command is None:
+                continue
+
+            name, kwargs = command
+
+            try:
+                await cls.handlers[name](**kwargs)
+
+            except Exception as ex:
+                logger.exception('Primary command failed: Command="%s" | %s', name, ex)
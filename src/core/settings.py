@@ -1,6 +1,7 @@
 from functools import cached_property
 from os import environ
 from pathlib import Path
+from typing import Literal
 
 from aiogram.enums import ParseMode
 from aiogram.types import FSInputFile
@@ -111,6 +112,18 @@ class WebhookSettings(BaseModel):
 
     reverse_proxy: bool = False
 
+    background: bool = True
+    concurrency: int = 16
+    queue_size: int = 1024
+
+    workers: int = 1
+    worker_rate_share: float = 0.1
+
+    @computed_field
+    @cached_property
+    def multiprocess(cls) -> bool:
+        return cls.active and cls.workers > 1
+
     @computed_field
     @cached_property
     def public_key(cls) -> FSInputFile | None:
@@ -165,6 +178,51 @@ class WebhookSettings(BaseModel):
         return f"{self.host}:{self.port}{self.path(bot_token)}"
 
 
+class FSMSettings(BaseModel):
+    storage: Literal["memory", "database"] = "memory"
+
+    ttl: int = 3600
+    max_size: int = 100_000
+
+    flush_delay: float = 1.0
+    cache_ttl: float = 5.0
+
+
+class CacheSettings(BaseModel):
+    user_ttl: int = 600
+    user_shared_ttl: int = 5
+    user_size: int = 10_000
+    resolve_ttl: int = 604_800
+    resolve_negative_ttl: int = 1800
+    resolve_size: int = 10_000
+    page_ttl: int = 60
+    page_max_bytes: int = 32 * 1024 * 1024
+
+
+class ParserSettings(BaseModel):
+    mode: Literal["inline", "thread", "process"] = "process"
+    workers: int | None = None
+    batch_size: int = 4
+
+
+class CassetteSettings(BaseModel):
+    mode: Literal["off", "record", "replay"] = "off"
+    path: str = "cassettes/http.zip"
+
+
+class WatchdogSettings(BaseModel):
+    active: bool = True
+    interval: float = 0.1
+    threshold: float = 0.5
+    report_interval: int = 60
+
+
+class TracingSettings(BaseModel):
+    head_rate: float = 0.01
+    tail_rate: float = 0.01
+    slow_threshold: float = 120.0
+
+
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(
         env_prefix="app.",
@@ -192,8 +250,30 @@ class Settings(BaseSettings):
     rate_limits: dict[str, int] = {"YouTube": 7, "Telegram": 35}
 
     requests_timeout: int = 10
+
+    blocked_flush_delay: int = 5
+    blocked_flush_size: int = 500
+
+    fanout_workers: int = 35
+    fanout_progress_delay: int = 10
+
+    slow_update_threshold: float = 2.0
+    sql_repeat_threshold: int = 10
+    metrics_log_interval: int = 300
     # ====================================|Webhook|===================================== #
     webhook: WebhookSettings
+    # ======================================|FSM|======================================= #
+    fsm: FSMSettings = FSMSettings()
+    # =====================================|Cache|====================================== #
+    cache: CacheSettings = CacheSettings()
+    # ====================================|Parser|====================================== #
+    parser: ParserSettings = ParserSettings()
+    # ===================================|Cassette|===================================== #
+    cassette: CassetteSettings = CassetteSettings()
+    # ===================================|Watchdog|===================================== #
+    watchdog: WatchdogSettings = WatchdogSettings()
+    # ====================================|Tracing|===================================== #
+    tracing: TracingSettings = TracingSettings()
     # ====================================|Database|==================================== #
     db: DBSettings
     # ====================================|Logging|===================================== #
@@ -0,0 +1,287 @@
+from asyncio import Event, Task, get_running_loop, wait_for
+from collections import OrderedDict
+from contextlib import suppress
+from contextvars import Context
+from json import dumps, loads
+from logging import getLogger
+from time import monotonic, time_ns
+from typing import Any
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, StateType, StorageKey
+
+from database.utils import get_fsm_state_db
+
+logger = getLogger(__name__)
+
+
+class StorageRecord:
+    __slots__ = ("state", "data", "accessed")
+
+    def __init__(self) -> None:
+        self.state: str | None = None
+        self.data: dict[str, Any] = {}
+        self.accessed: float = monotonic()
+
+
+class CompactMemoryStorage(BaseStorage):
+    """
+    Хранилище FSM в памяти с вытеснением записей, к которым не обращались `ttl`
+    секунд, и ограничением числа записей `max_size` (вытесняются самые старые)
+    """
+
+    def __init__(self, ttl: int = 3600, max_size: int = 100_000) -> None:
+        self.ttl = ttl
+        self.max_size = max_size
+
+        self._records: OrderedDict[StorageKey, StorageRecord] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    async def close(self) -> None:
+        self._records.clear()
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        record = self._record(key, create=True)
+        record.state = state.state if isinstance(state, State) else state
+        self._drop_empty(key, record)
+
+    async def get_state(self, key: StorageKey) -> str | None:
+        record = self._record(key)
+        return record.state if record else None
+
+    async def set_data(self, key: StorageKey, data: dict[str, Any]) -> None:
+        record = self._record(key, create=True)
+        record.data = data.copy()
+        self._drop_empty(key, record)
+
+    async def get_data(self, key: StorageKey) -> dict[str, Any]:
+        record = self._record(key)
+        return record.data.copy() if record else {}
+
+    def _record(self, key: StorageKey, create: bool = False) -> StorageRecord | None:
+        now = monotonic()
+        self._evict(now)
+
+        record = self._records.get(key)
+
+        if record is None:
+            if not create:
+                return None
+
+            record = self._records[key] = StorageRecord()
+
+            if len(self._records) > self.max_size:
+                self._records.popitem(last=False)
+
+        else:
+            self._records.move_to_end(key)
+
+        record.accessed = now
+        return record
+
+    def _drop_empty(self, key: StorageKey, record: StorageRecord) -> None:
+        if record.state is None and not record.data:
+            del self._records[key]
+
+    def _evict(self, now: float) -> None:
+        records = self._records
+
+        while records:
+            key, record = next(iter(records.items()))
+
+            if len(records) <= self.max_size and now - record.accessed < self.ttl:
+                break
+
+            del records[key]
+
+
+class CachedRecord:
+    __slots__ = ("state", "data", "version", "checked")
+
+    def __init__(
+        self,
+        state: str | None = None,
+        data: dict[str, Any] | None = None,
+        version: int = 0,
+    ) -> None:
+        self.state = state
+        self.data = data or {}
+        self.version = version
+        self.checked: float = monotonic()
+
+
+class DatabaseStorage(BaseStorage):
+    """
+    Хранилище FSM в таблице `fsm_state` общей БД.
+
+    Записи буферизуются и пишутся одним upsert раз в `flush_delay` секунд
+    (повторные записи одного ключа схлопываются). Чтения идут через локальный
+    кэш: запись из кэша считается актуальной `cache_ttl` секунд, после чего
+    сверяется только её версия в БД, а данные перечитываются при её изменении.
+
+    При `shared` (несколько процессов webhook) следующий апдейт диалога может
+    прийти в другой процесс, поэтому записи пишутся сразу, а версия сверяется
+    при каждом чтении
+    """
+
+    def __init__(
+        self,
+        flush_delay: int | float = 1,
+        flush_size: int = 500,
+        cache_ttl: int | float = 5,
+        cache_size: int = 100_000,
+        shared: bool = False,
+    ) -> None:
+        self.flush_delay = flush_delay
+        self.flush_size = flush_size
+        self.cache_ttl = 0 if shared else cache_ttl
+        self.cache_size = cache_size
+        self.shared = shared
+
+        self._cache: OrderedDict[str, CachedRecord] = OrderedDict()
+        self._pending: dict[str, CachedRecord] = {}
+
+        self._flush_event = Event()
+        self._flush_task: Task | None = None
+
+    @classmethod
+    def build_key(cls, key: StorageKey) -> str:
+        return ":".join(
+            [
+                str(key.bot_id),
+                str(key.chat_id),
+                str(key.user_id),
+                str(key.thread_id or ""),
+                key.business_connection_id or "",
+                key.destiny,
+            ],
+        )
+
+    @classmethod
+    def encode(cls, data: dict[str, Any]) -> str:
+        return dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+    @classmethod
+    def decode(cls, raw: str | None) -> dict[str, Any]:
+        return loads(raw) if raw else {}
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    async def close(self) -> None:
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+
+        await self.flush()
+        self._cache.clear()
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        record = await self._record(self.build_key(key))
+        record.state = state.state if isinstance(state, State) else state
+        await self._write(self.build_key(key), record)
+
+    async def get_state(self, key: StorageKey) -> str | None:
+        record = await self._record(self.build_key(key))
+        return record.state
+
+    async def set_data(self, key: StorageKey, data: dict[str, Any]) -> None:
+        record = await self._record(self.build_key(key))
+        record.data = data.copy()
+        await self._write(self.build_key(key), record)
+
+    async def get_data(self, key: StorageKey) -> dict[str, Any]:
+        record = await self._record(self.build_key(key))
+        return record.data.copy()
+
+    async def _record(self, key: str) -> CachedRecord:
+        if key in self._pending:
+            return self._pending[key]
+
+        now = monotonic()
+        record = self._cache.get(key)
+
+        if record is not None and now - record.checked < self.cache_ttl:
+            self._cache.move_to_end(key)
+            return record
+
+        if record is not None:
+            async with get_fsm_state_db() as fsm_state_db:
+                version = await fsm_state_db.get_version(key)
+
+            if version == record.version:
+                record.checked = now
+                self._cache.move_to_end(key)
+                return record
+
+        async with get_fsm_state_db() as fsm_state_db:
+            row = await fsm_state_db.get_by_key(key)
+
+        if row is None:
+            record = CachedRecord()
+        else:
+            record = CachedRecord(row.state, self.decode(row.data), row.version)
+
+        self._cache_put(key, record)
+        return record
+
+    def _cache_put(self, key: str, record: CachedRecord) -> None:
+        self._cache[key] = record
+        self._cache.move_to_end(key)
+
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    async def _write(self, key: str, record: CachedRecord) -> None:
+        record.version = time_ns()
+        record.checked = monotonic()
+
+        self._pending[key] = record
+        self._cache_put(key, record)
+
+        if self._flush_task is None:
+            # Создаётся из первого апдейта: без его контекста (учёт времени, запросов)
+            self._flush_task = get_running_loop().create_task(
+                self._auto_flush(), context=Context()
+            )
+
+        if self.shared:
+            # Сквозная запись; при ошибке запись остаётся в буфере до _auto_flush
+            await self.flush()
+
+        elif len(self._pending) >= self.flush_size:
+            self._flush_event.set()
+
+    async def _auto_flush(self) -> None:
+        while True:
+            with suppress(TimeoutError):
+                await wait_for(self._flush_event.wait(), self.flush_delay)
+
+            self._flush_event.clear()
+            await self.flush()
+
+    async def flush(self) -> None:
+        if not self._pending:
+            return
+
+        pending, self._pending = self._pending, {}
+
+        instances = [
+            {
+                "key": key,
+                "state": record.state,
+                "data": self.encode(record.data),
+                "version": record.version,
+            }
+            for key, record in pending.items()
+        ]
+
+        try:
+            async with get_fsm_state_db() as fsm_state_db:
+                await fsm_state_db.upsert(instances)
+
+        except Exception as ex:
+            self._pending = pending | self._pending
+            logger.error("FSM state flush failed: Count=%d | %s", len(instances), ex)
@@ -1,22 +1,33 @@
 from logging import getLogger
 from logging.config import dictConfig
+from multiprocessing import get_context
 from ssl import PROTOCOL_TLSv1_2, SSLContext
 from warnings import warn
 
 from aiogram import Bot, Dispatcher
 from aiogram.client.default import DefaultBotProperties
-from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.fsm.storage.base import BaseStorage
 from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
 from aiohttp.web import Application, run_app
 
 from core.lifespan import Lifespan
+from core.primary import PrimaryCommands
 from core.settings import settings
+from core.storage import CompactMemoryStorage, DatabaseStorage
+from core.webhook import BackgroundRequestHandler
+from log.utils import start_queue_listener
+from middlewares import (
+    HandlerLabelMiddleware,
+    LatencyMiddleware,
+    TelegramTimingMiddleware,
+)
 from routers import (
     start_router,
     admin_router,
     channels_router,
     info_router,
 )
+from utils.tracing import Tracing
 
 __all__ = ("start",)
 
@@ -33,24 +44,38 @@ def __get_tls_context() -> SSLContext:
     return context
 
 
-def _setup() -> tuple[Dispatcher, Bot]:
+def _setup(primary: bool = True) -> tuple[Dispatcher, Bot]:
     __setup_logging()
 
-    storage = MemoryStorage()
+    storage = __get_storage()
     dispatcher = Dispatcher(storage=storage)
     bot = Bot(
         token=settings.bot_token,
         default=DefaultBotProperties(parse_mode=settings.parse_mod),
     )
-    lifespan = Lifespan(bot)
+    bot.session.middleware(TelegramTimingMiddleware())
+    lifespan = Lifespan(bot, primary=primary)
 
     __setup_dispatcher(dispatcher, lifespan)
 
     return dispatcher, bot
 
 
+def __get_storage() -> BaseStorage:
+    if settings.fsm.storage == "database":
+        return DatabaseStorage(
+            flush_delay=settings.fsm.flush_delay,
+            cache_ttl=settings.fsm.cache_ttl,
+            cache_size=settings.fsm.max_size,
+            shared=settings.webhook.multiprocess,
+        )
+
+    return CompactMemoryStorage(ttl=settings.fsm.ttl, max_size=settings.fsm.max_size)
+
+
 def __setup_logging() -> None:
     dictConfig(settings.logging.dict_config)
+    start_queue_listener()
 
     if settings.debug:
         msg = "Debug mode on"
@@ -59,17 +84,25 @@ def __setup_logging() -> None:
 
     else:
         if settings.logging.sentry:
-            import sentry_sdk  # type: ignore
-
-            sentry_sdk.init(settings.logging.sentry, traces_sample_rate=1)
+            Tracing.init(settings.logging.sentry)
 
 
 def __setup_request_handler(dispatcher: Dispatcher, bot: Bot, app: Application) -> None:
-    webhook_requests_handler = SimpleRequestHandler(
-        dispatcher=dispatcher,
-        bot=bot,
-        secret_token=settings.secret_token,
-    )
+    if settings.webhook.background:
+        webhook_requests_handler = BackgroundRequestHandler(
+            dispatcher=dispatcher,
+            bot=bot,
+            concurrency=settings.webhook.concurrency,
+            queue_size=settings.webhook.queue_size,
+            secret_token=settings.secret_token,
+        )
+
+    else:
+        webhook_requests_handler = SimpleRequestHandler(
+            dispatcher=dispatcher,
+            bot=bot,
+            secret_token=settings.secret_token,
+        )
 
     webhook_requests_handler.register(
         app,
@@ -81,6 +114,13 @@ def __setup_dispatcher(dispatcher: Dispatcher, lifespan: Lifespan) -> None:
     dispatcher.startup.register(lifespan.on_startup)
     dispatcher.shutdown.register(lifespan.on_shutdown)
 
+    # Доступен обработчикам как аргумент `notifier` (профилирование цикла)
+    dispatcher["notifier"] = lifespan.notifier
+
+    dispatcher.update.outer_middleware(LatencyMiddleware(settings.slow_update_threshold))
+    dispatcher.message.middleware(HandlerLabelMiddleware())
+    dispatcher.callback_query.middleware(HandlerLabelMiddleware())
+
     dispatcher.include_routers(
         admin_router,
         start_router,
@@ -102,9 +142,50 @@ def start_webhook(dispatcher: Dispatcher, bot: Bot) -> None:
         host=settings.webhook.web_server_host,
         port=settings.webhook.web_server_port,
         ssl_context=ssl_context,
+        reuse_port=settings.webhook.workers > 1,
     )
 
 
+def _webhook_worker() -> None:
+    dp, bot = _setup(primary=False)
+    start_webhook(dp, bot)
+
+
+def start_webhook_workers() -> None:
+    """
+    Запуск `settings.webhook.workers` процессов, слушающих один порт (SO_REUSEPORT).
+    Текущий процесс - основной: в нём работает уведомитель и настраивается webhook
+    """
+    context = get_context("fork")
+    PrimaryCommands.init(context)
+
+    workers = [
+        # Не daemon: daemon-процессу нельзя запускать дочерние (пулы и т.п.)
+        context.Process(target=_webhook_worker, name=f"webhook-worker-{idx}")
+        for idx in range(1, settings.webhook.workers)
+    ]
+
+    for worker in workers:
+        worker.start()
+
+    try:
+        dp, bot = _setup(primary=True)
+
+        if settings.fsm.storage == "memory":
+            logger.warning(
+                "Webhook workers: %d. FSM storage is not shared between processes. "
+                "Set APP.FSM.STORAGE=database",
+                settings.webhook.workers,
+            )
+
+        start_webhook(dp, bot)
+
+    finally:
+        for worker in workers:
+            worker.terminate()
+            worker.join()
+
+
 def start_polling(dispatcher: Dispatcher, bot: Bot) -> None:
     import asyncio
 
@@ -112,6 +193,10 @@ def start_polling(dispatcher: Dispatcher, bot: Bot) -> None:
 
 
 def start() -> None:
+    if settings.webhook.multiprocess:
+        start_webhook_workers()
+        return
+
     dp, bot = _setup()
 
     if settings.webhook.active:
@@ -0,0 +1,177 @@
+from asyncio import (
+    Queue,
+    QueueFull,
+    Task,
+    TimeoutError,
+    gather,
+    get_running_loop,
+    wait_for,
+)
+from contextlib import suppress
+from logging import getLogger
+from typing import Any, Awaitable, Callable
+
+from aiogram import Bot, Dispatcher
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler
+from aiohttp import web
+
+from utils.metrics import metrics
+
+logger = getLogger(__name__)
+
+
+class UpdatePool:
+    """
+    Пул фоновой обработки апдейтов.
+    Апдейты распределяются по воркерам по id чата, поэтому апдейты одного чата
+    обрабатываются строго по порядку, а общая конкурентность ограничена
+    """
+
+    def __init__(self, concurrency: int = 16, queue_size: int = 1024) -> None:
+        self.concurrency = concurrency
+        self.queues: list[Queue[dict[str, Any]]] = [
+            Queue(maxsize=max(1, queue_size // concurrency)) for _ in range(concurrency)
+        ]
+        self._workers: list[Task] = []
+
+        self.accepted = metrics.counter("webhook.accepted")
+        self.rejected = metrics.counter("webhook.rejected")
+        self.failed = metrics.counter("webhook.failed")
+        self.queued = metrics.gauge("webhook.queued")
+
+    def start(self, handler: Callable[[dict[str, Any]], Awaitable[Any]]) -> None:
+        loop = get_running_loop()
+
+        self._workers = [
+            loop.create_task(self._worker(queue, handler)) for queue in self.queues
+        ]
+
+        logger.info(
+            "Update pool started: Concurrency=%d | Queue size=%d",
+            self.concurrency,
+            sum(queue.maxsize for queue in self.queues),
+        )
+
+    async def close(self, timeout: int | float = 10) -> None:
+        with suppress(TimeoutError):
+            await wait_for(gather(*[queue.join() for queue in self.queues]), timeout)
+
+        for worker in self._workers:
+            worker.cancel()
+
+        await gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+        logger.info("Update pool stopped")
+
+    def submit(self, update: dict[str, Any]) -> bool:
+        queue = self.queues[self._chat_id(update) % self.concurrency]
+
+        try:
+            queue.put_nowait(update)
+
+        except QueueFull:
+            self.rejected.inc()
+
+            logger.warning(
+                'Update rejected, queue is full: Update ID="%s"',
+                update.get("update_id"),
+            )
+            return False
+
+        self.accepted.inc()
+        self.queued.set(self.size)
+        return True
+
+    @property
+    def size(self) -> int:
+        return sum(queue.qsize() for queue in self.queues)
+
+    async def _worker(
+        self,
+        queue: Queue[dict[str, Any]],
+        handler: Callable[[dict[str, Any]], Awaitable[Any]],
+    ) -> None:
+        while True:
+            update = await queue.get()
+
+            try:
+                await handler(update)
+
+            except Exception as ex:
+                self.failed.inc()
+                logger.exception(
+                    'Update failed: Update ID="%s" | %s', update.get("update_id"), ex
+                )
+
+            finally:
+                queue.task_done()
+                self.queued.set(self.size)
+
+    @classmethod
+    def _chat_id(cls, update: dict[str, Any]) -> int:
+        for key, event in update.items():
+            if not isinstance(event, dict):
+                continue
+
+            chat = event.get("chat") or (event.get("message") or {}).get("chat")
+
+            if chat:
+                return chat["id"]
+
+            if event.get("from"):
+                return event["from"]["id"]
+
+        return update.get("update_id", 0)
+
+
+class BackgroundRequestHandler(SimpleRequestHandler):
+    """
+    Сразу отвечает Телеграму и отдаёт апдейт в ограниченный пул воркеров.
+    При переполнении очереди отвечает 429, чтобы Телеграм повторил доставку позже
+    """
+
+    def __init__(
+        self,
+        dispatcher: Dispatcher,
+        bot: Bot,
+        concurrency: int = 16,
+        queue_size: int = 1024,
+        secret_token: str | None = None,
+        **data: Any,
+    ) -> None:
+        super().__init__(
+            dispatcher,
+            bot,
+            handle_in_background=True,
+            secret_token=secret_token,
+            **data,
+        )
+        self.pool = UpdatePool(concurrency, queue_size)
+
+    def register(self, app: web.Application, /, path: str, **kwargs: Any) -> None:
+        app.on_startup.append(self._handle_start)
+        super().register(app, path=path, **kwargs)
+
+        # Очередь дренируется до остальных on_shutdown: emit_shutdown диспетчера
+        # закрывает БД, лимитер и хранилище FSM, нужные апдейтам из очереди
+        app.on_shutdown.insert(0, self._handle_drain)
+
+    async def _handle_start(self, app: web.Application) -> None:
+        self.pool.start(self._feed_update)
+
+    async def _handle_drain(self, app: web.Application) -> None:
+        await self.pool.close()
+
+    async def _feed_update(self, update: dict[str, Any]) -> None:
+        await self._background_feed_update(bot=self.bot, update=update)
+
+    async def _handle_request_background(
+        self, bot: Bot, request: web.Request
+    ) -> web.Response:
+        update = await request.json(loads=bot.session.json_loads)
+
+        if not self.pool.submit(update):
+            return web.Response(status=429, text="Too Many Requests")
+
+        return web.json_response({}, dumps=bot.session.json_dumps)
@@ -1,8 +1,9 @@
 import threading
 from contextlib import AbstractAsyncContextManager, asynccontextmanager
 from logging import getLogger
+from time import perf_counter
 
-from sqlalchemy import URL, make_url
+from sqlalchemy import URL, event, make_url
 from sqlalchemy.ext.asyncio import (
     AsyncConnection,
     AsyncEngine,
@@ -11,9 +12,25 @@ from sqlalchemy.ext.asyncio import (
     create_async_engine,
 )
 
+from database.sql_stats import SqlStats
+from utils.latency import add_time
+from utils.timeseries import timeseries
+
 logger = getLogger(__name__)
 
 
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = perf_counter() - conn.info["query_started"].pop()
+
+    timeseries.add("db.query_sec", elapsed)
+    add_time("db", elapsed)
+    SqlStats.record(statement, elapsed)
+
+
 class AsyncDatabase:
     def __init__(self) -> None:
         self._engine_url: URL | None = None
@@ -65,6 +82,10 @@ class AsyncDatabase:
             expire_on_commit=False,
         )
 
+        sync_engine = self._async_engine.sync_engine
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
         await self.__check_connect()
 
     async def __check_connect(self) -> None:
@@ -134,6 +134,8 @@ class PaginationMixin(CRUDMixin):
         per_page: int = DEFAULT_LIMIT,
         **load_options,
     ) -> AsyncGenerator[Sequence[Any], None]:  # Note: Количество подгружаемых строк (см)
+        load_options["limit"] = per_page
+
         result = await db_method(**load_options)  # type: PaginationResultModel
         data = result.data.all()
 
@@ -151,8 +153,6 @@ class PaginationMixin(CRUDMixin):
         else:
             total_pages = max_pages
 
-        load_options["limit"] = per_page
-
         async for paginated_result in self._get_paginated_result(
             db_method, total_pages, **load_options
         ):
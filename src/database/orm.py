@@ -1,11 +1,22 @@
-from typing import Any, Sequence
+from time import time
+from typing import Any, Iterable, Sequence
 
-from sqlalchemy import delete, select
+from sqlalchemy import delete, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import load_only, noload
 
 from core.models import PaginationResultModel, Status
 from database.mixins import CRUDMixin, PaginationMixin
-from database.schemas import Channel, Profile, ProfileChannelAssociation, Stream, Video
+from database.schemas import (
+    Channel,
+    ChannelResolution,
+    FSMState,
+    Profile,
+    ProfileChannelAssociation,
+    Stream,
+    Video,
+)
 
 
 class ProfileDatabase(PaginationMixin):
@@ -37,6 +48,19 @@ class ProfileDatabase(PaginationMixin):
         await self.async_session.commit()
         return result
 
+    async def set_status(self, tg_ids: Iterable[int], status: Status) -> int:
+        where = [Profile.tg_id.in_(tg_ids)]
+
+        stmt = (
+            update(Profile)
+            .where(*where)
+            .values(status=status)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.async_session.execute(stmt)
+        await self.async_session.commit()
+        return result.rowcount
+
     async def get(
         self,
         where: Any | None = None,
@@ -74,11 +98,8 @@ class ChannelsDatabase(PaginationMixin):
         where = [Profile.tg_id == tg_id]
 
         options = [
-            load_only(Channel.id, Channel.name, Channel.url)
-            .selectinload(Channel.profile_associations)
-            .joinedload(ProfileChannelAssociation.profile)
-            .load_only(Profile.id, Profile.tg_id)
-            .noload(Profile.channel_associations)
+            load_only(Channel.id, Channel.name, Channel.url),
+            noload(Channel.profile_associations),
         ]
 
         stmt = (
@@ -94,7 +115,19 @@ class ChannelsDatabase(PaginationMixin):
         return result.all()
 
     async def get_by_url(self, url: str) -> Channel | None:
-        where = [Channel.url == url or Channel.canonical_url == url]
+        where = [or_(Channel.url == url, Channel.canonical_url == url)]
+
+        options = [
+            load_only(Channel.id, Channel.name, Channel.url, Channel.canonical_url),
+            noload(Channel.profile_associations),
+        ]
+        stmt = select(Channel).options(*options).where(*where).limit(1)
+        result = await self.async_session.scalar(stmt)
+        await self.async_session.commit()
+        return result
+
+    async def get_by_id(self, channel_id: int) -> Channel | None:
+        where = [Channel.id == channel_id]
 
         options = [
             load_only(Channel.id, Channel.name, Channel.url, Channel.canonical_url),
@@ -137,6 +170,7 @@ class ChannelsDatabase(PaginationMixin):
             .join(Profile)
             .options(*options)
             .where(*where)
+            .distinct()
         )
 
         return await self.paginated_result(stmt, page=page, limit=limit)
@@ -215,3 +249,76 @@ class ProfileChannelAssociationDatabase(CRUDMixin):
         result = await self.async_session.execute(stmt)
         await self.async_session.commit()
         return bool(result.rowcount)
+
+
+class FSMStateDatabase(CRUDMixin):
+    __table__ = FSMState
+
+    async def get_by_key(self, key: str) -> FSMState | None:
+        where = [FSMState.key == key]
+
+        stmt = select(FSMState).where(*where).limit(1)
+        result = await self.async_session.scalar(stmt)
+        await self.async_session.commit()
+        return result
+
+    async def get_version(self, key: str) -> int | None:
+        where = [FSMState.key == key]
+
+        stmt = select(FSMState.version).where(*where).limit(1)
+        result = await self.async_session.scalar(stmt)
+        await self.async_session.commit()
+        return result
+
+    async def upsert(self, instances: list[dict]) -> None:
+        if self.async_session.bind.dialect.name == "postgresql":
+            stmt = postgresql_insert(FSMState)
+        else:
+            stmt = sqlite_insert(FSMState)
+
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[FSMState.key],
+            set_={
+                "state": stmt.excluded.state,
+                "data": stmt.excluded.data,
+                "version": stmt.excluded.version,
+            },
+        )
+        await self.async_session.execute(stmt, instances)
+        await self.async_session.commit()
+
+
+class ChannelResolutionDatabase(CRUDMixin):
+    __table__ = ChannelResolution
+
+    async def get_by_url(self, url: str) -> ChannelResolution | None:
+        where = [ChannelResolution.url == url, ChannelResolution.expires_at > time()]
+
+        stmt = select(ChannelResolution).where(*where).limit(1)
+        result = await self.async_session.scalar(stmt)
+        await self.async_session.commit()
+        return result
+
+    async def upsert(self, instances: list[dict]) -> None:
+        if self.async_session.bind.dialect.name == "postgresql":
+            stmt = postgresql_insert(ChannelResolution)
+        else:
+            stmt = sqlite_insert(ChannelResolution)
+
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ChannelResolution.url],
+            set_={
+                "channel_id": stmt.excluded.channel_id,
+                "expires_at": stmt.excluded.expires_at,
+            },
+        )
+        await self.async_session.execute(stmt, instances)
+        await self.async_session.commit()
+
+    async def delete_expired(self) -> int:
+        where = [ChannelResolution.expires_at <= time()]
+
+        stmt = delete(ChannelResolution).where(*where)
+        result = await self.async_session.execute(stmt)
+        await self.async_session.commit()
+        return result.rowcount
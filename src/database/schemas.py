@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import ForeignKey, UniqueConstraint, func
+from sqlalchemy import BigInteger, ForeignKey, Text, UniqueConstraint, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from database.base import Base
@@ -16,7 +16,7 @@ class Profile(Base, AuditMixin):
 
     repr_cols = ("id", "first_name", "status")
 
-    tg_id: Mapped[int]
+    tg_id: Mapped[int] = mapped_column(index=True)
     username: Mapped[str_200]
     first_name: Mapped[str_200]
     last_name: Mapped[str_200 | None]
@@ -65,6 +65,7 @@ class ProfileChannelAssociation(Base, AuditMixin):
     # ==============================|Channel relationship|============================== #
     channel_id: Mapped[int] = mapped_column(
         ForeignKey("channel.id"),
+        index=True,
     )
     channel: Mapped[Channel] = relationship(back_populates="profile_associations")
 
@@ -86,7 +87,7 @@ class Video(Base, AuditMixin):
     url: Mapped[str_200]
 
     # ==============================|Channel relationship|============================== #
-    channel_id: Mapped[int] = mapped_column(ForeignKey("channel.id"))
+    channel_id: Mapped[int] = mapped_column(ForeignKey("channel.id"), index=True)
     channel: Mapped[Channel] = relationship(back_populates="videos")
 
 
@@ -98,5 +99,28 @@ class Stream(Base, AuditMixin):
     url: Mapped[str_200] = mapped_column(unique=True)
 
     # ==============================|Channel relationship|============================== #
-    channel_id: Mapped[int] = mapped_column(ForeignKey("channel.id"))
+    channel_id: Mapped[int] = mapped_column(ForeignKey("channel.id"), index=True)
     channel: Mapped[Channel] = relationship(back_populates="streams")
+
+
+class FSMState(Base):
+    __tablename__ = "fsm_state"
+
+    repr_cols = ("key", "state", "version")
+
+    key: Mapped[str_200] = mapped_column(unique=True)
+    state: Mapped[str_200 | None]
+    data: Mapped[str] = mapped_column(Text, default="{}")
+    version: Mapped[int] = mapped_column(BigInteger, default=0)
+
+
+class ChannelResolution(Base):
+    __tablename__ = "channel_resolution"
+
+    repr_cols = ("url", "channel_id")
+
+    url: Mapped[str_200] = mapped_column(unique=True)
+    channel_id: Mapped[int | None] = mapped_column(
+        ForeignKey("channel.id", ondelete="CASCADE")
+    )
+    expires_at: Mapped[int] = mapped_column(BigInteger)
@@ -0,0 +1,143 @@
+import re
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from logging import getLogger
+from typing import Iterator
+
+from core.settings import settings
+from utils.metrics import Histogram, metrics
+
+logger = getLogger(__name__)
+
+SHAPES_LIMIT: int = 500
+OTHER_SHAPE: str = "<other>"
+
+# Литералы и параметры всех драйверов: строки, числа, $1, %(name)s, :name, ?
+_LITERALS = re.compile(
+    r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b|\$\d+|%\(\w+\)s|(?<!:):(?!:)\w+|\?"
+)
+# IN (?, ?, ...) и VALUES (?), (?), ... - одна форма при любом числе элементов
+_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_ROWS = re.compile(r"\(\?\)(?:\s*,\s*\(\?\))+")
+_SPACES = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=2048)
+def normalize(statement: str) -> str:
+    """Форма запроса: SQL без литералов и параметров"""
+    shape = _LITERALS.sub("?", statement)
+    shape = _LISTS.sub("(?)", shape)
+    shape = _ROWS.sub("(?), ...", shape)
+    return _SPACES.sub(" ", shape).strip()
+
+
+class QueryScope:
+    """
+    Запросы одной логической операции (апдейт, пачка уведомлений): число,
+    суммарное время и повторы каждой формы
+    """
+
+    __slots__ = ("name", "statements", "total", "shapes", "closed")
+
+    def __init__(self, name: str | None = None) -> None:
+        self.name = name
+        self.statements = 0
+        self.total = 0.0
+        self.shapes: dict[str, int] = {}
+        self.closed = False
+
+    def add(self, shape: str, elapsed: float) -> None:
+        self.statements += 1
+        self.total += elapsed
+        self.shapes[shape] = self.shapes.get(shape, 0) + 1
+
+    def report(self) -> None:
+        """Закрывает операцию: запросы унаследовавших контекст задач не учитываются"""
+        self.closed = True
+
+        if not self.statements:
+            return
+
+        name = self.name or "unknown"
+        metrics.histogram(f"db.scope.{name}.statements").observe(self.statements)
+        metrics.histogram(f"db.scope.{name}.sec").observe(self.total)
+
+        for shape, count in self.shapes.items():
+            if count >= SqlStats.repeat_threshold and shape != OTHER_SHAPE:
+                SqlStats.suspect(name, shape, count)
+
+
+current_scope: ContextVar[QueryScope | None] = ContextVar("current_scope", default=None)
+
+
+class SqlStats:
+    """
+    Статистика запросов по формам (normalize): латентность каждой формы
+    и подозрения на N+1 - форма, повторённая в одной операции не меньше
+    `repeat_threshold` раз. Число форм ограничено SHAPES_LIMIT, остальные
+    учитываются как OTHER_SHAPE
+    """
+
+    repeat_threshold = settings.sql_repeat_threshold
+
+    shapes: dict[str, Histogram] = {}
+    # (операция, форма) -> (число случаев, максимум повторов)
+    suspects: dict[tuple[str, str], tuple[int, int]] = {}
+
+    n_plus_one = metrics.counter("db.n_plus_one")
+
+    @classmethod
+    def record(cls, statement: str, elapsed: float) -> None:
+        shape = normalize(statement)
+
+        if shape not in cls.shapes:
+            if len(cls.shapes) >= SHAPES_LIMIT:
+                shape = OTHER_SHAPE
+
+            cls.shapes.setdefault(shape, Histogram(shape))
+
+        cls.shapes[shape].observe(elapsed)
+
+        if (scope := current_scope.get()) is not None and not scope.closed:
+            scope.add(shape, elapsed)
+
+    @classmethod
+    def suspect(cls, scope: str, shape: str, count: int) -> None:
+        cls.n_plus_one.inc()
+        cases, max_count = cls.suspects.get((scope, shape), (0, 0))
+        cls.suspects[(scope, shape)] = (cases + 1, max(max_count, count))
+
+        if not cases:  # В лог - только первый случай пары
+            logger.warning(
+                'Suspected N+1: Scope="%s" | Repeats=%s | Statement="%s"',
+                scope,
+                count,
+                shape,
+            )
+
+    @classmethod
+    def top(cls, limit: int = 10) -> list[Histogram]:
+        """Формы с наибольшим суммарным временем"""
+        return sorted(cls.shapes.values(), key=lambda item: item.total, reverse=True)[
+            :limit
+        ]
+
+    @classmethod
+    def reset(cls) -> None:
+        cls.shapes.clear()
+        cls.suspects.clear()
+
+
+@contextmanager
+def query_scope(name: str) -> Iterator[QueryScope]:
+    """Учёт запросов блока как одной операции"""
+    scope = QueryScope(name)
+    token = current_scope.set(scope)
+
+    try:
+        yield scope
+
+    finally:
+        current_scope.reset(token)
+        scope.report()
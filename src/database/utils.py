@@ -5,7 +5,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from database.helper import AsyncDatabase
 from database.mixins import AuditMixin
 from database.orm import (
+    ChannelResolutionDatabase,
     ChannelsDatabase,
+    FSMStateDatabase,
     ProfileChannelAssociationDatabase,
     ProfileDatabase,
     StreamDatabase,
@@ -54,6 +56,20 @@ async def get_prof_ch_association_db() -> (
         yield ProfileChannelAssociationDatabase(async_session)
 
 
+@asynccontextmanager
+async def get_fsm_state_db() -> AbstractAsyncContextManager[FSMStateDatabase]:
+    async with get_async_session() as async_session:
+        yield FSMStateDatabase(async_session)
+
+
+@asynccontextmanager
+async def get_channel_resolution_db() -> (
+    AbstractAsyncContextManager[ChannelResolutionDatabase]
+):
+    async with get_async_session() as async_session:
+        yield ChannelResolutionDatabase(async_session)
+
+
 async def set_triggers() -> None:
     async with get_async_session() as async_session:  # type: AsyncSession
         audit_tables = [d.__tablename__ for d in AuditMixin.__subclasses__()]  # type: ignore
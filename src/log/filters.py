@@ -0,0 +1,122 @@
+from atexit import register
+from logging import WARNING, Filter, LogRecord, getLogger
+from threading import Event, Lock, Thread
+from time import monotonic
+
+
+class DeduplicateFilter(Filter):
+    """
+    Сворачивает повторяющиеся записи с одинаковым (logger, шаблон сообщения).
+
+    Первая запись в окне `window` проходит как образец, остальные только
+    подсчитываются. Первая запись после закрытия окна выходит со сводкой
+    о количестве подавленных повторов. Если повторы прекратились, сводку
+    по закрытым окнам раз в `window` пишет фоновый поток.
+
+    Фильтр вызывается из разных потоков (event loop, watchdog, пулы),
+    состояние защищено блокировкой.
+    """
+
+    def __init__(
+        self,
+        window: int | float = 60,
+        level: int = WARNING,
+        max_keys: int = 1024,
+    ) -> None:
+        super().__init__()
+
+        self.window = window
+        self.level = level
+        self.max_keys = max_keys
+
+        # (logger, шаблон) -> [открытие окна, подавлено, уровень]
+        self._windows: dict[tuple[str, str], list[float | int]] = {}
+        self._lock = Lock()
+
+        self._stop = Event()
+        self._flusher: Thread | None = None
+
+    def filter(self, record: LogRecord) -> bool:
+        if record.levelno < self.level or getattr(record, "deduplicated", False):
+            return True
+
+        key = (record.name, str(record.msg))
+        now = monotonic()
+
+        with self._lock:
+            window = self._windows.get(key)
+
+            if window is not None and now - window[0] < self.window:
+                window[1] += 1
+                window[2] = max(window[2], record.levelno)
+                self._start_flusher()
+                return False
+
+            if window is not None and window[1]:
+                record.msg = (
+                    f"{record.msg} | Suppressed {window[1]} similar records "
+                    f"in {int(now - window[0])}s"
+                )
+
+            if window is None and len(self._windows) >= self.max_keys:
+                self._prune(now)
+
+            self._windows[key] = [now, 0, record.levelno]
+
+        return True
+
+    def flush(self, force: bool = False) -> None:
+        """Сводки по закрытым (или всем при `force`) окнам с подавленными записями"""
+        now = monotonic()
+        summaries = []
+
+        with self._lock:
+            for key, (opened, suppressed, levelno) in list(self._windows.items()):
+                if not force and now - opened < self.window:
+                    continue
+
+                del self._windows[key]
+
+                if suppressed:
+                    summaries.append((key, suppressed, levelno, int(now - opened)))
+
+        # Запись вне блокировки: хэндлеры могут снова логировать
+        for (name, msg), suppressed, levelno, elapsed in summaries:
+            logger = getLogger(name)
+            summary = logger.makeRecord(
+                name,
+                levelno,
+                "(deduplicate)",
+                0,
+                'Suppressed %s similar records in %ss: "%s"',
+                (suppressed, elapsed, msg),
+                None,
+                extra={"deduplicated": True},
+            )
+            logger.handle(summary)
+
+    def close(self) -> None:
+        self._stop.set()
+        self.flush(force=True)
+
+    def _start_flusher(self) -> None:
+        if self._flusher is not None:
+            return
+
+        self._flusher = Thread(target=self._run, name="log-deduplicate", daemon=True)
+        self._flusher.start()
+        register(self.close)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.window):
+            self.flush()
+
+    def _prune(self, now: float) -> None:
+        expired = [
+            key
+            for key, (opened, suppressed, _) in self._windows.items()
+            if now - opened >= self.window and not suppressed
+        ]
+
+        for key in expired or list(self._windows):
+            del self._windows[key]
@@ -1,3 +1,4 @@
+from json import dumps
 from logging import CRITICAL, DEBUG, ERROR, INFO, NOTSET, WARNING, Formatter, LogRecord
 
 
@@ -26,8 +27,38 @@ class ColourFormatter(Formatter):
             ERROR: self.CSI.format(self.NORMAL, self.RED) + self._fmt + self.RESET,
             CRITICAL: self.CSI.format(self.BOLD, self.RED) + self._fmt + self.RESET,
         }
+        self.formatters = {
+            level: Formatter(fmt=log_fmt, datefmt=self.datefmt)
+            for level, log_fmt in self.formats.items()
+        }
 
     def format(self, record: LogRecord) -> str:
-        log_fmt = self.formats.get(record.levelno)
-        formatter = Formatter(fmt=log_fmt, datefmt=self.datefmt)
+        formatter = self.formatters.get(record.levelno)
+
+        if formatter is None:
+            return super().format(record)
+
         return formatter.format(record)
+
+
+class JSONFormatter(Formatter):
+    """
+    Компактный JSON формат: одна запись - одна строка
+    """
+
+    def __init__(self, datefmt: str | None = None) -> None:
+        super().__init__(datefmt=datefmt)
+
+    def format(self, record: LogRecord) -> str:
+        data = {
+            "level": record.levelname,
+            "name": record.name,
+            "time": self.formatTime(record, self.datefmt),
+            "line": record.lineno,
+            "msg": record.getMessage(),
+        }
+
+        if record.exc_info:
+            data["exc"] = self.formatException(record.exc_info)
+
+        return dumps(data, ensure_ascii=False, separators=(",", ":"))
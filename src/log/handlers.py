@@ -0,0 +1,30 @@
+from logging import LogRecord
+from logging.handlers import QueueHandler
+
+PRIMITIVES = (str, int, float, bool, type(None))
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    QueueHandler с форматированием в потоке QueueListener.
+
+    Стандартный prepare() форматирует запись целиком (включая трейсбек)
+    до постановки в очередь, то есть в event loop. Здесь в вызывающем потоке
+    подставляются только аргументы-объекты: к моменту форматирования
+    в потоке слушателя они могут измениться, а ленивые атрибуты ORM -
+    загрузиться вне event loop. Запись с примитивными аргументами и трейсбек
+    форматирует QueueListener. Очередь живёт в процессе, поэтому
+    сериализация записи не нужна
+    """
+
+    def prepare(self, record: LogRecord) -> LogRecord:
+        if record.args and not _is_primitive(record.args):
+            record.msg = record.getMessage()
+            record.args = None
+
+        return record
+
+
+def _is_primitive(args: tuple | dict) -> bool:
+    values = args.values() if isinstance(args, dict) else args
+    return all(isinstance(value, PRIMITIVES) for value in values)
@@ -5,6 +5,8 @@ from typing import Any, Literal
 from pydantic import BaseModel, computed_field, field_validator
 from pydantic_core.core_schema import ValidationInfo
 
+from log.utils import QUEUE_HANDLER_NAME, BodyMode, MessageBody
+
 
 class LoggingSettings(BaseModel):
     sentry: str | None = None
@@ -34,6 +36,15 @@ class LoggingSettings(BaseModel):
     max_bytes: int = 10_485_760
     backup_count: int = 20
 
+    queue_handler: bool = False
+    json_format: bool = False
+
+    body_mode: BodyMode = "full"
+    body_max_len: int = 140
+
+    deduplicate_loggers: list[str] = []
+    deduplicate_window: int = 60
+
     @field_validator("loglevel", mode="before")
     def loglevel_validator(
         cls,
@@ -79,8 +90,27 @@ class LoggingSettings(BaseModel):
                 "fmt": self.log_format,
                 "datefmt": self.log_datetime_format,
             },
+            "json": {
+                "()": "log.formatters.JSONFormatter",
+                "datefmt": self.log_datetime_format,
+            },
+        }
+
+    @computed_field
+    @cached_property
+    def filters(self) -> dict[str, Any]:
+        return {
+            "deduplicate": {
+                "()": "log.filters.DeduplicateFilter",
+                "window": self.deduplicate_window,
+            },
         }
 
+    @computed_field
+    @cached_property
+    def loggers(self) -> dict[str, Any]:
+        return {name: {"filters": ["deduplicate"]} for name in self.deduplicate_loggers}
+
     @computed_field
     @cached_property
     def handlers(self) -> dict[str, Any]:
@@ -88,12 +118,12 @@ class LoggingSettings(BaseModel):
             "console": {
                 "class": "logging.StreamHandler",
                 "level": self.loglevel,
-                "formatter": "colour",
+                "formatter": "json" if self.json_format else "colour",
             },
             "rotating_file": {
                 "class": "logging.handlers.RotatingFileHandler",
                 "level": self.loglevel,
-                "formatter": "base",
+                "formatter": "json" if self.json_format else "base",
                 "filename": self.filename,
                 "maxBytes": self.max_bytes,
                 "encoding": self.encoding,
@@ -104,19 +134,35 @@ class LoggingSettings(BaseModel):
     @computed_field
     @cached_property
     def dict_config(self) -> dict[str, Any]:
-        handlers_names = [name for name in self.handlers.keys()]
+        handlers = dict(self.handlers)
+        handlers_names = [name for name in handlers.keys()]
 
         if not self.rotating_file_handler:
             handlers_names.remove("rotating_file")
 
+        if self.queue_handler:
+            # Note: Форматирование и запись в поток/файл выполняет QueueListener
+            # в отдельном потоке
+            handlers[QUEUE_HANDLER_NAME] = {
+                "class": "log.handlers.DeferredQueueHandler",
+                "handlers": handlers_names,
+                "respect_handler_level": True,
+            }
+            handlers_names = [QUEUE_HANDLER_NAME]
+
         return {
             "version": self.version,
             "encoding": self.encoding,
             "disable_existing_loggers": self.disable_existing_loggers,
             "formatters": self.formatters,
-            "handlers": self.handlers,
+            "filters": self.filters,
+            "handlers": handlers,
+            "loggers": self.loggers,
             "root": {
                 "level": self.loglevel,
                 "handlers": handlers_names,
             },
         }
+
+    def body(self, text: str | None) -> MessageBody:
+        return MessageBody(text, self.body_mode, self.body_max_len)
@@ -0,0 +1,62 @@
+from atexit import register, unregister
+from hashlib import sha1
+from logging import getHandlerByName
+from typing import Literal
+
+from utils.common import strip_text
+
+QUEUE_HANDLER_NAME: str = "queue"
+
+BodyMode = Literal["full", "truncate", "hash"]
+
+
+class MessageBody:
+    """
+    Ленивое представление текста сообщения для логов.
+    Текст обрезается или хэшируется только при форматировании записи
+    """
+
+    __slots__ = ("text", "mode", "max_len")
+
+    def __init__(
+        self, text: str | None, mode: BodyMode = "full", max_len: int = 140
+    ) -> None:
+        self.text = text
+        self.mode = mode
+        self.max_len = max_len
+
+    def __str__(self) -> str:
+        if not self.text:
+            return ""
+
+        if self.mode == "truncate":
+            return strip_text(self.text, self.max_len)
+
+        if self.mode == "hash":
+            digest = sha1(self.text.encode(), usedforsecurity=False).hexdigest()
+            return f"sha1:{digest[:12]} len:{len(self.text)}"
+
+        return self.text
+
+
+def start_queue_listener() -> None:
+    """
+    Запуск потока, который пишет записи из очереди в конечные хэндлеры
+    """
+    handler = getHandlerByName(QUEUE_HANDLER_NAME)
+
+    if handler is None or getattr(handler, "listener", None) is None:
+        return
+
+    handler.listener.start()
+    register(stop_queue_listener)
+
+
+def stop_queue_listener() -> None:
+    handler = getHandlerByName(QUEUE_HANDLER_NAME)
+
+    if handler is None or getattr(handler, "listener", None) is None:
+        return
+
+    unregister(stop_queue_listener)
+    handler.listener.stop()
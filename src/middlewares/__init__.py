@@ -0,0 +1,3 @@
+from .latency import HandlerLabelMiddleware, LatencyMiddleware, TelegramTimingMiddleware
+
+__all__ = ["LatencyMiddleware", "HandlerLabelMiddleware", "TelegramTimingMiddleware"]
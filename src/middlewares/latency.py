@@ -0,0 +1,116 @@
+from logging import getLogger
+from time import perf_counter
+from typing import Any, Awaitable, Callable
+
+from aiogram import BaseMiddleware, Bot
+from aiogram.client.session.middlewares.base import (
+    BaseRequestMiddleware,
+    NextRequestMiddlewareType,
+)
+from aiogram.methods import TelegramMethod
+from aiogram.methods.base import TelegramType
+from aiogram.types import TelegramObject, Update
+
+from database.sql_stats import QueryScope, current_scope
+from utils.latency import Breakdown, current_breakdown, track
+from utils.metrics import metrics
+
+logger = getLogger(__name__)
+
+Handler = Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]]
+
+
+class LatencyMiddleware(BaseMiddleware):
+    """
+    Внешний middleware апдейтов: общее время обработки и его разбивка на БД,
+    HTTP и вызовы Telegram (utils.latency) по обработчикам. Гистограммы
+    `handler.<router>.<handler>.{total,db,http,telegram,other}_sec`,
+    апдейты дольше `slow_threshold` пишутся в лог. Запросы к БД апдейта
+    учитываются как одна операция (database.sql_stats)
+    """
+
+    def __init__(self, slow_threshold: float = 2.0) -> None:
+        self.slow_threshold = slow_threshold
+
+    async def __call__(
+        self, handler: Handler, event: TelegramObject, data: dict[str, Any]
+    ) -> Any:
+        breakdown, scope = Breakdown(), QueryScope()
+        token = current_breakdown.set(breakdown)
+        scope_token = current_scope.set(scope)
+        started = perf_counter()
+
+        try:
+            return await handler(event, data)
+
+        finally:
+            total = perf_counter() - started
+            current_scope.reset(scope_token)
+            current_breakdown.reset(token)
+            breakdown.closed = True
+
+            self.observe(event, breakdown, total)
+
+            scope.name = f"handler.{breakdown.handler or 'unhandled'}"
+            scope.report()
+
+    def observe(self, event: TelegramObject, breakdown: Breakdown, total: float) -> None:
+        label = breakdown.handler or "unhandled"
+        timings = {
+            "total": total,
+            "db": breakdown.db,
+            "http": breakdown.http,
+            "telegram": breakdown.telegram,
+            "other": breakdown.other(total),
+        }
+
+        for component, seconds in timings.items():
+            metrics.histogram(f"handler.{label}.{component}_sec").observe(seconds)
+
+        if total < self.slow_threshold:
+            return
+
+        user = (
+            getattr(event.event, "from_user", None) if isinstance(event, Update) else None
+        )
+
+        logger.warning(
+            'Slow update: Handler="%s" | Update_id=%s | Type=%s | User_tg_id=%s | '
+            "Total=%.2fs | DB=%.2fs | HTTP=%.2fs | Telegram=%.2fs | Other=%.2fs",
+            label,
+            getattr(event, "update_id", None),
+            getattr(event, "event_type", None),
+            user.id if user is not None else None,
+            *timings.values(),
+        )
+
+
+class HandlerLabelMiddleware(BaseMiddleware):
+    """
+    Внутренний middleware: подписывает разбивку текущего апдейта
+    выбранным обработчиком (`<router>.<handler>`)
+    """
+
+    async def __call__(
+        self, handler: Handler, event: TelegramObject, data: dict[str, Any]
+    ) -> Any:
+        breakdown = current_breakdown.get()
+
+        if breakdown is not None:
+            callback = data["handler"].callback
+            breakdown.handler = f"{data['event_router'].name}.{callback.__name__}"
+
+        return await handler(event, data)
+
+
+class TelegramTimingMiddleware(BaseRequestMiddleware):
+    """Middleware сессии бота: время вызовов Bot API"""
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Any:
+        with track("telegram"):
+            return await make_request(bot, method)
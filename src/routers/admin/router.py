@@ -1,10 +1,28 @@
 from aiogram import Bot, Router
-from aiogram.filters import Command
+from aiogram.filters import Command, CommandObject
+from aiogram.fsm.storage.base import BaseStorage
 from aiogram.types import Message
 
+from apps.notifier.main import Notifier
 from controllers.message_ctrl import send_message
+from core.primary import PrimaryCommands
+from database.sql_stats import SqlStats
 from filters import AdminFilter
-from routers.admin.utils import build_user_description, get_profiles
+from routers.admin.utils import (
+    STATS_WINDOWS,
+    build_memory_report,
+    build_metrics,
+    build_sql_report,
+    build_stats,
+    build_user_description,
+    get_profiles,
+    parse_profile_args,
+    process_label,
+    run_profile,
+)
+from utils.common import run_in_background
+from utils.memory import MemoryTracker
+from utils.profiler import Profiler
 
 router = Router(name="admin")
 
@@ -31,3 +49,107 @@ async def show_users(message: Message, bot: Bot) -> None:
             user_tg_id=message.from_user.id,
             text="Пользователей нет",
         )
+
+
+@router.message(AdminFilter(), Command("profile"))
+async def profile(
+    message: Message, command: CommandObject, bot: Bot, notifier: Notifier
+) -> None:
+    chat_id, user_tg_id = message.chat.id, message.from_user.id
+    parsed = parse_profile_args(command.args)
+
+    if parsed is None:
+        text = "Формат: /profile [секунды|cycle] [top]"
+    elif Profiler.active:
+        text = "Профилирование уже идёт"
+    elif parsed[0] is None and not notifier.running:
+        text = "Уведомитель работает в другом процессе: /profile &lt;секунды&gt;"
+    else:
+        text = None
+
+    if text is not None:
+        await send_message(bot=bot, chat_id=chat_id, user_tg_id=user_tg_id, text=text)
+        return
+
+    seconds, top = parsed
+    label = f"{seconds}s" if seconds else "notify cycle"
+
+    await send_message(
+        bot=bot,
+        chat_id=chat_id,
+        user_tg_id=user_tg_id,
+        text=f"Профилирование: {label}...",
+    )
+
+    # Сессия длится до часа: обработчик не должен держать воркер пула апдейтов
+    run_in_background(run_profile(bot, chat_id, user_tg_id, notifier, seconds, top))
+
+
+@router.message(AdminFilter(), Command("memory"))
+async def memory(
+    message: Message,
+    command: CommandObject,
+    bot: Bot,
+    fsm_storage: BaseStorage,
+    notifier: Notifier,
+) -> None:
+    # Память у каждого процесса своя: отчёт о процессе, получившем апдейт
+    chat_id, user_tg_id = message.chat.id, message.from_user.id
+
+    if command.args == "stop":
+        MemoryTracker.stop()
+        messages = [
+            f"Трассировка памяти остановлена. Процесс: {process_label(notifier.running)}"
+        ]
+
+    else:
+        report = await MemoryTracker.snapshot()
+        fsm_records = len(fsm_storage) if hasattr(fsm_storage, "__len__") else None
+        messages = build_memory_report(report, fsm_records, primary=notifier.running)
+
+    for text in messages:
+        await send_message(bot=bot, chat_id=chat_id, user_tg_id=user_tg_id, text=text)
+
+
+@router.message(AdminFilter(), Command("stats"))
+async def stats(
+    message: Message, command: CommandObject, bot: Bot, notifier: Notifier
+) -> None:
+    chat_id, user_tg_id = message.chat.id, message.from_user.id
+    window = command.args or "hour"
+
+    if window not in STATS_WINDOWS:
+        messages = [f"Формат: /stats [{'|'.join(STATS_WINDOWS)}]"]
+
+    elif not notifier.running and PrimaryCommands.available():
+        # Ряды уведомителя есть только в основном процессе: он ответит сам,
+        # воркер добавляет метрики своего процесса
+        messages = [build_metrics(primary=False)]
+
+        if not PrimaryCommands.submit(
+            "stats", chat_id=chat_id, user_tg_id=user_tg_id, window=window
+        ):
+            messages.insert(0, "Основной процесс не принял запрос, повторите позже")
+
+    else:
+        messages = [
+            build_stats(window, primary=notifier.running),
+            build_metrics(primary=notifier.running),
+        ]
+
+    for text in messages:
+        await send_message(bot=bot, chat_id=chat_id, user_tg_id=user_tg_id, text=text)
+
+
+@router.message(AdminFilter(), Command("sql"))
+async def sql(message: Message, command: CommandObject, bot: Bot) -> None:
+    chat_id, user_tg_id = message.chat.id, message.from_user.id
+
+    if command.args == "reset":
+        SqlStats.reset()
+        messages = ["Статистика запросов сброшена"]
+    else:
+        messages = build_sql_report()
+
+    for text in messages:
+        await send_message(bot=bot, chat_id=chat_id, user_tg_id=user_tg_id, text=text)
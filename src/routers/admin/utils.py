@@ -1,14 +1,51 @@
-from asyncio import gather
+from asyncio import gather, wait_for
+from cProfile import Profile as CProfile
+from html import escape
+from os import getpid
 from typing import AsyncGenerator, Sequence
 
 from aiogram import Bot
 from sqlalchemy.orm import load_only
 
-from controllers.message_ctrl import send_message
+from apps.notifier.main import Notifier
+from controllers.message_ctrl import send_document, send_message
 from core.models import Smiles, Status
 from core.settings import settings
 from database.schemas import Profile
+from database.sql_stats import SqlStats
 from database.utils import get_profile_db
+from utils.memory import MemoryReport
+from utils.metrics import Histogram, metrics
+from utils.profiler import Profiler, dump_stats, top_stats
+from utils.timeseries import timeseries
+
+PROFILE_MAX_SECONDS: int = 600
+PROFILE_CYCLE_TIMEOUT: int = 3600
+PROFILE_TOP: int = 20
+MESSAGE_LIMIT: int = 4096
+SQL_TOP: int = 8
+SQL_SHAPE_LENGTH: int = 250
+HANDLERS_TOP: int = 10
+
+# Окно /stats: аргумент -> (секунды, подпись)
+STATS_WINDOWS: dict[str, tuple[int, str]] = {
+    "hour": (3600, "час"),
+    "day": (86400, "сутки"),
+    "month": (30 * 86400, "30 дней"),
+}
+# Серия, подпись, вид: sec - перцентили длительности, sum - сумма за окно
+STATS_SERIES: tuple[tuple[str, str, str], ...] = (
+    ("notifier.cycle_sec", "Цикл уведомлений", "sec"),
+    ("notifier.channels", "Опрошено каналов", "sum"),
+    ("notifier.new_items", "Нового контента", "sum"),
+    ("fanout.sent", "Отправлено сообщений", "sum"),
+    ("fanout.failed", "Ошибок отправки", "sum"),
+    ("limiter.Telegram.wait_sec", "Ожидание лимита Telegram", "sec"),
+    ("limiter.YouTube.wait_sec", "Ожидание лимита YouTube", "sec"),
+    ("db.query_sec", "Запрос к БД", "sec"),
+    ("loop.lag_sec", "Задержка event loop", "sec"),
+)
+SPARKS: str = "▁▂▃▄▅▆▇█"
 
 
 async def get_profiles() -> AsyncGenerator[Sequence[Profile], None]:
@@ -54,3 +91,302 @@ async def notify_admins(bot: Bot, text: str) -> None:
         tasks.append(send_message(bot=bot, chat_id=admin, user_tg_id=admin, text=text))
 
     await gather(*tasks)
+
+
+def parse_profile_args(args: str | None) -> tuple[int | None, int] | None:
+    """
+    `/profile [секунды|cycle] [top]`: None секунд - один цикл уведомлений.
+    Некорректные аргументы - None
+    """
+    parts = (args or "").split()
+    seconds, top = None, PROFILE_TOP
+
+    if parts and parts[0] != "cycle":
+        if not parts[0].isdigit() or not 0 < int(parts[0]) <= PROFILE_MAX_SECONDS:
+            return None
+        seconds = int(parts[0])
+
+    if len(parts) > 1:
+        if not parts[1].isdigit() or not 0 < int(parts[1]) <= 100:
+            return None
+        top = int(parts[1])
+
+    return seconds, top
+
+
+async def run_profile(
+    bot: Bot,
+    chat_id: int,
+    user_tg_id: int,
+    notifier: Notifier,
+    seconds: int | None,
+    top: int,
+) -> None:
+    """Сессия профилирования и отправка результата (в фоновой задаче)"""
+    label = f"{seconds}s" if seconds else "notify cycle"
+
+    try:
+        if seconds:
+            result = await Profiler.for_seconds(seconds)
+        else:
+            result = await wait_for(notifier.profile_cycle(), PROFILE_CYCLE_TIMEOUT)
+
+    except TimeoutError:
+        result = None
+
+    if result is None:
+        await send_message(
+            bot=bot,
+            chat_id=chat_id,
+            user_tg_id=user_tg_id,
+            text="Профиль не получен",
+        )
+        return
+
+    await send_profile(bot, chat_id, user_tg_id, result, label, top)
+
+
+async def send_profile(
+    bot: Bot, chat_id: int, user_tg_id: int, profile: CProfile, label: str, top: int
+) -> None:
+    stats = top_stats(profile, limit=top)
+    header = f"{Smiles.gear} <b>Профиль: {label}</b>\n\n"
+    limit = MESSAGE_LIMIT - len(header) - len("<pre></pre>")
+
+    # Отчёт урезается с конца: сводка и самые дорогие функции остаются
+    text = escape(stats.strip())
+    while len(text) > limit:
+        text = text[: text.rfind("\n")]
+
+    await send_message(
+        bot=bot,
+        chat_id=chat_id,
+        user_tg_id=user_tg_id,
+        text=f"{header}<pre>{text}</pre>",
+    )
+    await send_document(
+        bot=bot,
+        chat_id=chat_id,
+        user_tg_id=user_tg_id,
+        content=dump_stats(profile),
+        filename=f"{label.replace(' ', '_')}.prof",
+    )
+
+
+def process_label(primary: bool) -> str:
+    """Роль и PID процесса: у каждого воркера webhook свои память и метрики"""
+    return f"{'основной' if primary else 'воркер webhook'}, PID {getpid()}"
+
+
+def build_memory_report(
+    report: MemoryReport, fsm_records: int | None, primary: bool
+) -> list[str]:
+    """Сообщения отчёта: сводка с объектами и кэшами, топ аллокаций, рост"""
+    summary = [
+        f"{Smiles.gear} <b>Память</b>",
+        f"<i>Процесс: {process_label(primary)}</i>\n",
+        f"RSS max: {report.rss_max_mb} MB | tracemalloc: {report.traced_mb} MB "
+        f"(пик {report.peak_mb} MB)",
+    ]
+
+    if fsm_records is not None:
+        summary.append(f"Записей FSM: {fsm_records}")
+
+    summary.append("\n<b>Кэши</b> (записей / вес)")
+    summary.extend(f"{name}: {size} / {weight}" for name, size, weight in report.caches)
+
+    for kind, counts in report.objects.items():
+        summary.append(f"\n<b>{kind}</b>")
+        summary.extend(f"{name}: {count}" for name, count in counts)
+
+    if report.started:
+        return [
+            "\n".join(summary),
+            "Трассировка памяти запущена этим снимком: аллокации и их рост "
+            "будут видны со следующего /memory",
+        ]
+
+    messages = ["\n".join(summary), _stats_message("Топ аллокаций", report.top)]
+
+    if report.diff is None:
+        messages.append("Рост будет виден со следующего снимка")
+    else:
+        messages.append(_stats_message("Рост с прошлого снимка", report.diff))
+
+    return messages
+
+
+def _stats_message(title: str, stats: list[str]) -> str:
+    limit = (MESSAGE_LIMIT - 200) // max(len(stats), 1)
+    lines = [
+        escape(line if len(line) <= limit else "..." + line[-limit:]) for line in stats
+    ]
+    return f"<b>{title}</b>\n<pre>{chr(10).join(lines) or '-'}</pre>"
+
+
+def _duration(value: float) -> str:
+    return f"{value:.2f}s" if value >= 1 else f"{value * 1000:.1f}ms"
+
+
+def _sparkline(points: list[float | None]) -> str:
+    values = [point for point in points if point is not None]
+
+    if not values:
+        return ""
+
+    low, high = min(values), max(values)
+    scale = (len(SPARKS) - 1) / (high - low) if high > low else 0
+
+    return "".join(
+        " " if point is None else SPARKS[round((point - low) * scale)] for point in points
+    )
+
+
+def build_stats(window: str, primary: bool) -> str:
+    seconds, label = STATS_WINDOWS[window]
+    lines = [
+        f"{Smiles.gear} <b>Статистика за {label}</b>",
+        f"<i>Процесс: {process_label(primary)}</i>\n",
+    ]
+
+    for name, title, kind in STATS_SERIES:
+        series = timeseries.series.get(name)
+        summary = series.summary(seconds) if series is not None else {"count": 0}
+
+        if not summary["count"]:
+            lines.append(f"<b>{title}</b>: нет данных")
+            continue
+
+        if kind == "sec":
+            value = (
+                f"p50 {_duration(summary['p50'])} | p95 {_duration(summary['p95'])} | "
+                f"max {_duration(summary['max'])}"
+            )
+        else:
+            value = f"всего {summary['total']:.0f} | в среднем {summary['avg']:.1f}"
+
+        trend = _sparkline(series.trend(seconds))
+        lines.append(f"<b>{title}</b>: {value}\n<code>{trend}</code>")
+
+    return "\n".join(lines)
+
+
+def build_metrics(primary: bool) -> str:
+    """Счётчики и значения реестра метрик процесса (у каждого процесса свой)"""
+    values = sorted(
+        (item.name, item.value)
+        for item in (*metrics.counters.values(), *metrics.gauges.values())
+    )
+
+    lines = [
+        f"{Smiles.gear} <b>Метрики процесса</b>",
+        f"<i>Процесс: {process_label(primary)}</i>\n",
+        "\n".join(f"{escape(name)}: {value}" for name, value in values) or "нет данных",
+    ]
+
+    if hit_rates := metrics.hit_rates():
+        lines.append("\n<b>Кэши</b> (доля попаданий)")
+        lines.extend(f"{escape(name)}: {rate:.1%}" for name, rate in hit_rates.items())
+
+    lag = metrics.histograms.get("loop.lag")
+
+    if lag is not None and lag.count:
+        pct = lag.percentiles(0.5, 0.95, 0.99)
+        lines.append(
+            f"\n<b>Задержка event loop</b> (последних замеров: {len(lag.samples)})\n"
+            f"p50 {_duration(pct['p50'])} | p95 {_duration(pct['p95'])} | "
+            f"p99 {_duration(pct['p99'])}"
+        )
+
+    if handlers := _handler_latency():
+        lines.append(f"\n<b>Обработчики</b> (топ {HANDLERS_TOP} по суммарному времени)")
+
+    for label, items in handlers:
+        total = items["total"]
+        pct = total.percentiles(0.5, 0.95)
+        parts = " | ".join(
+            f"{component} {_duration(items[component].total / items[component].count)}"
+            for component in ("db", "http", "telegram", "other")
+            if component in items
+        )
+        lines.append(
+            f"{escape(label)}: {total.count} шт. | p50 {_duration(pct['p50'])} | "
+            f"p95 {_duration(pct['p95'])}\nв среднем: {parts}"
+        )
+
+    return "\n".join(lines)
+
+
+def _handler_latency() -> list[tuple[str, dict[str, Histogram]]]:
+    """Гистограммы `handler.<обработчик>.<часть>_sec` (middlewares.latency)"""
+    handlers: dict[str, dict[str, Histogram]] = {}
+
+    for name, item in metrics.histograms.items():
+        if not (name.startswith("handler.") and name.endswith("_sec")) or not item.count:
+            continue
+
+        label, component = (
+            name.removeprefix("handler.").removesuffix("_sec").rsplit(".", 1)
+        )
+        handlers.setdefault(label, {})[component] = item
+
+    return sorted(
+        ((label, items) for label, items in handlers.items() if "total" in items),
+        key=lambda handler: handler[1]["total"].total,
+        reverse=True,
+    )[:HANDLERS_TOP]
+
+
+def _shape(shape: str) -> str:
+    if len(shape) > SQL_SHAPE_LENGTH:
+        shape = shape[:SQL_SHAPE_LENGTH] + "..."
+    return f"<code>{escape(shape)}</code>"
+
+
+def build_sql_report() -> list[str]:
+    top = [
+        f"{Smiles.gear} <b>Запросы к БД</b> (топ {SQL_TOP} форм по суммарному времени)"
+    ]
+
+    for item in SqlStats.top(SQL_TOP):
+        pct = item.percentiles(0.5, 0.95)
+        top.append(
+            f"\n{item.count} шт. | p50 {_duration(pct['p50'])} | "
+            f"p95 {_duration(pct['p95'])} | всего {_duration(item.total)}\n"
+            f"{_shape(item.name)}"
+        )
+
+    suspects = sorted(SqlStats.suspects.items(), key=lambda item: -item[1][1])[:SQL_TOP]
+    n_plus_one = [
+        "<b>Подозрения на N+1</b> (форма повторена в операции "
+        f"от {SqlStats.repeat_threshold} раз)"
+    ]
+
+    for (scope, shape), (cases, max_count) in suspects:
+        n_plus_one.append(
+            f"\n{escape(scope)}: до {max_count} повторов, случаев {cases}\n"
+            f"{_shape(shape)}"
+        )
+
+    if len(top) == 1:
+        top.append("нет данных")
+    if len(n_plus_one) == 1:
+        n_plus_one.append("нет")
+
+    return ["\n".join(top), "\n".join(n_plus_one)]
+
+
+async def send_stats(bot: Bot, chat_id: int, user_tg_id: int, window: str) -> None:
+    """Ответ на /stats из основного процесса (команда из воркера webhook)"""
+    await send_message(
+        bot=bot,
+        chat_id=chat_id,
+        user_tg_id=user_tg_id,
+        text=build_stats(window, primary=True),
+    )
+    await send_message(
+        bot=bot,
+        chat_id=chat_id,
+        user_tg_id=user_tg_id,
+        text=build_metrics(primary=True),
+    )
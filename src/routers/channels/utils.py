@@ -1,33 +1,54 @@
 from contextlib import suppress
 from logging import getLogger
+from time import time
+from typing import Sequence
 
 from aiogram import Bot
 from aiogram.fsm.context import FSMContext
 from aiogram.types import Message
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import load_only
 
-from apps.notifier.models import ContentType, UserFSMmodel
+from apps.notifier.models import ChannelData, ContentType, ProfileData, UserFSMmodel
 from apps.notifier.utils import save_streams_urls, save_videos_urls
-from controllers.message_ctrl import delete_message, edit_message, send_message
+from controllers.message_ctrl import delete_messages, edit_message, send_message
+from controllers.user_ctrl import get_user, invalidate_user
 from core.models import Smiles
 from core.settings import settings
-from database.schemas import Channel, Profile, ProfileChannelAssociation
-from database.utils import get_channel_db, get_prof_ch_association_db, get_profile_db
+from database.schemas import Channel, ProfileChannelAssociation
+from database.utils import (
+    get_channel_db,
+    get_channel_resolution_db,
+    get_prof_ch_association_db,
+)
 from keyboards.inline.channel_keyboards import sub_keyboard, unsub_keyboard
-from utils.finder import find_canonical_url, find_channel_name, find_original_url
+from utils.cache import TTLCache
+from utils.common import normalize_url
+from utils.executor import ParseExecutor
+from utils.finder import extract_page, warn_missing
 from utils.scrapper import get_channel_page, get_content_urls
 
 logger = getLogger(__name__)
 
+UNRESOLVED = object()
+NEW_CHANNEL_FIELDS = ("name", "original_url", "canonical_url")
 
-async def save_new_channel(channel: Channel, profile: Profile) -> Channel:
+resolution_cache = TTLCache(
+    "channel_resolution",
+    ttl=settings.cache.resolve_ttl,
+    max_size=settings.cache.resolve_size,
+)
+
+
+async def save_new_channel(channel: Channel, profile: ProfileData) -> Channel:
     async with get_channel_db() as channel_db:
         association = ProfileChannelAssociation(
             profile_id=profile.id, channel_id=channel.id
         )
         channel.profile_associations.append(association)
-        return await channel_db.create([channel])
+        channels = await channel_db.create([channel])
+
+    invalidate_user(profile.tg_id)
+    return channels
 
 
 async def save_new_channel_content(channel: Channel) -> None:
@@ -40,51 +61,55 @@ async def save_new_channel_content(channel: Channel) -> None:
 
 async def get_user_data(tg_id: int, state: FSMContext) -> UserFSMmodel:
     state_data = await state.get_data()
-    user: UserFSMmodel | None = state_data.get(str(tg_id))
 
-    if user is None:
-        async with get_profile_db() as profile_db:
-            profile = await profile_db.get_by_tg_id(
-                tg_id, options=[load_only(Profile.subs_limit)]
-            )
+    if state_data:
+        return UserFSMmodel.model_validate(state_data)
 
-        async with get_channel_db() as channels_db:
-            channels = await channels_db.get_user_channels(tg_id)
+    profile, channels = await get_user(tg_id)
 
-        user = UserFSMmodel(profile=profile, channels=channels)
-        await state.set_data({str(tg_id): user})
+    user = UserFSMmodel(profile=profile, channels=channels)
+    await set_user_data(state, user)
 
     return user
 
 
-async def update_user_channels(tg_id: int, state: FSMContext) -> list[Channel]:
-    user_data: UserFSMmodel = await get_user_data(tg_id, state)
+async def set_user_data(state: FSMContext, user_data: UserFSMmodel) -> None:
+    await state.set_data(user_data.model_dump())
+
+
+async def update_user_channels(tg_id: int, state: FSMContext) -> tuple[ChannelData, ...]:
+    user_data = await get_user_data(tg_id, state)
+    _, user_data.channels = await get_user(tg_id)
 
-    async with get_channel_db() as channels_db:
-        channels = await channels_db.get_user_channels(tg_id)
-        user_data.channels = channels
-        await state.set_data({str(tg_id): user_data})
-        return channels
+    await set_user_data(state, user_data)
+    return user_data.channels
 
 
 async def set_displayed_channels(
     tg_id: int,
     state: FSMContext,
-    displayed_channels: dict[int, tuple[Message, Channel]],
+    displayed_channels: dict[int, ChannelData],
 ) -> None:
-    user_data: UserFSMmodel = await get_user_data(tg_id, state)
+    user_data = await get_user_data(tg_id, state)
     user_data.displayed_channels = displayed_channels
-    await state.set_data({str(tg_id): user_data})
+    await set_user_data(state, user_data)
 
 
-async def clear_displayed_channels(tg_id: int, state: FSMContext) -> None:
-    user_data: UserFSMmodel = await get_user_data(tg_id, state)
+async def clear_displayed_channels(
+    bot: Bot,
+    chat_id: int,
+    tg_id: int,
+    state: FSMContext,
+) -> None:
+    user_data = await get_user_data(tg_id, state)
+
+    if not user_data.displayed_channels:
+        return
 
-    for message, channel in user_data.displayed_channels.values():
-        await delete_message(message)
+    await delete_messages(bot, chat_id, list(user_data.displayed_channels))
 
-    user_data.displayed_channels.clear()
-    await state.set_data({str(tg_id): user_data})
+    user_data.displayed_channels = {}
+    await set_user_data(state, user_data)
 
 
 async def show_channels(
@@ -93,7 +118,7 @@ async def show_channels(
     tg_id: int,
     state: FSMContext,
     *,
-    channels: list[Channel] | None = None,
+    channels: Sequence[Channel | ChannelData] | None = None,
 ) -> None:
     user_data = await get_user_data(tg_id, state)
 
@@ -115,7 +140,8 @@ async def show_channels(
             disable_web_page_preview=True,
         )
 
-        displayed_channels[ch_mes.message_id] = (ch_mes, channel)
+        if ch_mes is not None:
+            displayed_channels[ch_mes.message_id] = ChannelData.from_orm(channel)
 
     await set_displayed_channels(tg_id, state, displayed_channels)
 
@@ -129,8 +155,8 @@ async def limit_channels(message_to_edit: Message) -> None:
 
 async def channel_subscribe(
     message: Message,
-    channel: Channel,
-    profile: Profile,
+    channel: ChannelData,
+    profile: ProfileData,
     state: FSMContext,
 ) -> None:
     await edit_message(
@@ -147,6 +173,7 @@ async def channel_subscribe(
             )
             await prof_ch_association_db.create([association])
 
+    invalidate_user(profile.tg_id)
     await update_user_channels(profile.tg_id, state)
 
     logger.debug(
@@ -158,8 +185,8 @@ async def channel_subscribe(
 
 async def channel_unsubscribe(
     message: Message,
-    channel: Channel,
-    profile: Profile,
+    channel: ChannelData,
+    profile: ProfileData,
     state: FSMContext,
 ) -> None:
     await edit_message(
@@ -175,6 +202,7 @@ async def channel_unsubscribe(
                 profile_id=profile.id, channel_id=channel.id
             )
 
+    invalidate_user(profile.tg_id)
     await update_user_channels(profile.tg_id, state)
 
     logger.info(
@@ -192,18 +220,94 @@ async def get_channel(raw_url: str) -> Channel | None:
         return await __build_new_channel(channel_page, raw_url)
 
 
+async def resolve_channel(raw_url: str) -> Channel | None:
+    """
+    Канал по ссылке пользователя. Повторные ссылки (в том числе нерабочие)
+    разрешаются из кэша без обращения к YouTube. Новый канал возвращается без id.
+    Нерабочей считается только загруженная страница, по которой канал не найден:
+    сбои загрузки (таймаут, 429, сеть) не запоминаются
+    """
+    url = normalize_url(raw_url)
+    channel_id = await __get_resolution(url)
+
+    if channel_id is None:
+        return
+
+    if channel_id is not UNRESOLVED:
+        async with get_channel_db() as channel_db:
+            channel = await channel_db.get_by_id(channel_id)
+
+        if channel is not None:
+            return channel
+
+    async with get_channel_db() as channel_db:
+        channel = await channel_db.get_by_url(raw_url)
+
+    if channel is None:
+        channel_page = await get_channel_page(raw_url)
+
+        if not channel_page:
+            return
+
+        channel = await __build_new_channel(channel_page, raw_url)
+
+        if channel is not None:
+            async with get_channel_db() as channel_db:
+                channel = await channel_db.get_by_url(channel.url) or channel
+
+    if channel is None or channel.id is not None:
+        await remember_resolution(raw_url, channel)
+
+    return channel
+
+
+async def remember_resolution(raw_url: str, channel: Channel | None) -> None:
+    """Запоминает результат разрешения ссылки. Неудачи хранятся меньше"""
+    url = normalize_url(raw_url)
+
+    if channel is None:
+        channel_id, ttl = None, settings.cache.resolve_negative_ttl
+    else:
+        channel_id, ttl = channel.id, settings.cache.resolve_ttl
+
+    resolution_cache.set(url, channel_id, ttl)
+
+    if len(url) > 200:
+        return
+
+    to_upsert = {"url": url, "channel_id": channel_id, "expires_at": int(time() + ttl)}
+
+    async with get_channel_resolution_db() as resolution_db:
+        await resolution_db.upsert([to_upsert])
+
+
+async def __get_resolution(url: str) -> int | None | object:
+    """ID канала, None для нерабочей ссылки или UNRESOLVED, если ссылка не разрешалась"""
+    channel_id = resolution_cache.get(url, UNRESOLVED)
+
+    if channel_id is not UNRESOLVED:
+        return channel_id
+
+    async with get_channel_resolution_db() as resolution_db:
+        resolution = await resolution_db.get_by_url(url)
+
+    if resolution is None:
+        return UNRESOLVED
+
+    resolution_cache.set(url, resolution.channel_id, resolution.expires_at - time())
+    return resolution.channel_id
+
+
 async def __build_new_channel(channel_page: str, url: str) -> Channel | None:
-    name = find_channel_name(channel_page, url)
-    original_url = find_original_url(channel_page, url)
-    canonical_url = find_canonical_url(channel_page, url)
+    info = await ParseExecutor.run(extract_page, channel_page)
 
-    if not name or not original_url or not canonical_url:
+    if not warn_missing(info, channel_page, *NEW_CHANNEL_FIELDS, from_url=url):
         return
 
     return Channel(
-        name=name,
-        url=original_url,
-        canonical_url=canonical_url,
+        name=info.name,
+        url=info.original_url,
+        canonical_url=info.canonical_url,
     )
 
 
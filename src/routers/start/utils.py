@@ -2,6 +2,8 @@ from logging import getLogger
 
 from aiogram.types import User
 
+from controllers.status_ctrl import BlockedUsers
+from controllers.user_ctrl import invalidate_user
 from database.schemas import Profile
 from core.models import Status
 from database.utils import get_profile_db
@@ -10,6 +12,8 @@ logger = getLogger(__name__)
 
 
 async def check_user(tg_user: User) -> None:
+    BlockedUsers.unmark(tg_user.id)
+
     async with get_profile_db() as profile_db:
         user_profile = await profile_db.get_by_tg_id(tg_user.id)
 
@@ -40,3 +44,5 @@ async def check_user(tg_user: User) -> None:
         async with get_profile_db() as profile_db:
             to_update = {"id": user_profile.id, "status": Status.active}
             await profile_db.update([to_update])
+
+    invalidate_user(tg_user.id)
@@ -0,0 +1,111 @@
+from asyncio import Event, create_task
+from unittest import IsolatedAsyncioTestCase, TestCase, main
+from unittest.mock import patch
+
+from controllers import user_ctrl
+from utils.cache import TTLCache
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TTLCacheTest(TestCase):
+    def setUp(self) -> None:
+        self.clock = Clock()
+        patcher = patch("utils.cache.monotonic", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_expired_item_is_missed(self) -> None:
+        cache = TTLCache("test_ttl", ttl=10)
+        cache.set("key", "value")
+
+        self.clock.now += 9
+        self.assertEqual(cache.get("key"), "value")
+
+        self.clock.now += 1
+        self.assertIsNone(cache.get("key"))
+        self.assertNotIn("key", cache)
+        self.assertEqual(len(cache), 0)
+
+    def test_item_ttl_overrides_default(self) -> None:
+        cache = TTLCache("test_item_ttl", ttl=10)
+        cache.set("key", "value", ttl=1)
+
+        self.clock.now += 2
+        self.assertIsNone(cache.get("key"))
+
+    def test_least_recently_used_is_evicted(self) -> None:
+        cache = TTLCache("test_lru", ttl=10, max_size=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+        self.assertIn("c", cache)
+
+    def test_weight_limit(self) -> None:
+        cache = TTLCache("test_weight", ttl=10, max_weight=10, weigh=len)
+        cache.set("a", "x" * 6)
+        cache.set("b", "x" * 6)
+
+        self.assertNotIn("a", cache)
+        self.assertEqual(cache.weight, 6)
+
+        cache.set("c", "x" * 11)
+        self.assertNotIn("c", cache)
+        self.assertEqual(cache.weight, 6)
+
+        cache.pop("b")
+        self.assertEqual(cache.weight, 0)
+
+    def test_hit_rate(self) -> None:
+        cache = TTLCache("test_hit_rate", ttl=10)
+        cache.set("key", "value")
+        cache.get("key")
+        cache.get("missing")
+
+        self.assertEqual(cache.hit_rate, 0.5)
+
+
+class UserCacheTest(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        user_ctrl.user_cache.clear()
+        self.addCleanup(user_ctrl.user_cache.clear)
+
+    async def test_load_is_cached(self) -> None:
+        with patch.object(user_ctrl, "_load_user", return_value="user") as load:
+            self.assertEqual(await user_ctrl.get_user(1), "user")
+            self.assertEqual(await user_ctrl.get_user(1), "user")
+
+        self.assertEqual(load.await_count, 1)
+
+    async def test_load_racing_invalidation_is_not_cached(self) -> None:
+        loading, committed = Event(), Event()
+
+        async def load_old_row(tg_id: int) -> str:
+            loading.set()
+            await committed.wait()
+            return "old"
+
+        with patch.object(user_ctrl, "_load_user", load_old_row):
+            reader = create_task(user_ctrl.get_user(1))
+
+            await loading.wait()
+            user_ctrl.invalidate_user(1)  # Запись закоммичена во время чтения
+            committed.set()
+
+            self.assertEqual(await reader, "old")
+
+        self.assertNotIn(1, user_ctrl.user_cache)
+
+
+if __name__ == "__main__":
+    main()
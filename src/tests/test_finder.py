@@ -0,0 +1,79 @@
+from json import dumps
+from unittest import TestCase, main
+
+from utils.finder import ContentStatus, extract_content, extract_page, parse_content
+
+RECOMMENDED = '<a href="/watch?v=recommended">'
+
+
+def channel_page(content: dict) -> str:
+    data = {
+        "contents": {
+            "twoColumnBrowseResultsRenderer": {
+                "tabs": [
+                    {"tabRenderer": {"selected": False, "content": {}}},
+                    {"tabRenderer": {"selected": True, "content": content}},
+                ]
+            }
+        }
+    }
+    return f"{RECOMMENDED}<script>var ytInitialData = {dumps(data)};</script>"
+
+
+class ExtractContentTest(TestCase):
+    def test_items_in_page_order(self) -> None:
+        content = {
+            "items": [
+                {"videoRenderer": {"videoId": "video000002"}},
+                {"gridVideoRenderer": {"videoId": "video000001"}},
+                {"videoRenderer": {"videoId": "video000002"}},
+                {
+                    "videoRenderer": {
+                        "videoId": "stream00001",
+                        "upcomingEventData": {"startTime": "1800000000"},
+                    }
+                },
+            ]
+        }
+
+        items = extract_content(channel_page(content))
+
+        self.assertEqual(
+            [item.id for item in items], ["video000002", "video000001", "stream00001"]
+        )
+        self.assertEqual(items[-1].status, ContentStatus.upcoming)
+
+    def test_empty_tab_ignores_markup(self) -> None:
+        page = channel_page({"items": []})
+
+        self.assertEqual(extract_content(page), [])
+        self.assertEqual(parse_content(page), [])
+
+    def test_markup_fallback_without_initial_data(self) -> None:
+        self.assertIsNone(extract_content(RECOMMENDED))
+        self.assertEqual(
+            [item.id for item in parse_content(RECOMMENDED)], ["recommended"]
+        )
+
+    def test_broken_initial_data(self) -> None:
+        self.assertIsNone(extract_content("var ytInitialData = {broken;</script>"))
+
+
+class ExtractPageTest(TestCase):
+    def test_fields(self) -> None:
+        page = (
+            '<link rel="canonical" href="https://www.youtube.com/channel/'
+            'UCabcdefghijklmnopqrstuv">"name": "", "name": "Channel"'
+            '<a href="/watch?v=video000001"><a href="/watch?v=video000001">'
+        )
+
+        info = extract_page(page)
+
+        self.assertEqual(info.name, "Channel")
+        self.assertEqual(info.channel_id, "UCabcdefghijklmnopqrstuv")
+        self.assertEqual(info.content_ids, ("video000001",))
+        self.assertEqual(info.missing("name", "original_url"), ["original_url"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+from logging import WARNING, LogRecord
+from queue import Queue
+from unittest import TestCase, main
+
+from log.handlers import DeferredQueueHandler
+
+
+def make_record(msg: str, args: tuple) -> LogRecord:
+    return LogRecord("test", WARNING, __file__, 0, msg, args, None)
+
+
+class Mutable:
+    value = 1
+
+    def __str__(self) -> str:
+        return f"Mutable({self.value})"
+
+
+class DeferredQueueHandlerTest(TestCase):
+    def setUp(self) -> None:
+        self.queue = Queue()
+        self.handler = DeferredQueueHandler(self.queue)
+
+    def test_objects_are_rendered_before_enqueue(self) -> None:
+        obj = Mutable()
+        self.handler.handle(make_record("Object=%s | Count=%d", (obj, 5)))
+        obj.value = 2
+
+        record = self.queue.get_nowait()
+
+        self.assertEqual((record.msg, record.args), ("Object=Mutable(1) | Count=5", None))
+
+    def test_primitives_are_deferred(self) -> None:
+        self.handler.handle(make_record("Count=%d | Name=%s", (5, "name")))
+
+        record = self.queue.get_nowait()
+
+        self.assertEqual((record.msg, record.args), ("Count=%d | Name=%s", (5, "name")))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+from unittest import TestCase, main
+
+from utils.metrics import Metrics
+
+
+class MetricsTest(TestCase):
+    def test_report(self) -> None:
+        registry = Metrics()
+        registry.counter("webhook.rejected").inc(3)
+        registry.gauge("webhook.queued").set(7)
+
+        for value in (0.1, 0.2, 0.3):
+            registry.histogram("loop.lag").observe(value)
+
+        self.assertEqual(
+            registry.report(),
+            [
+                "webhook.rejected: 3",
+                "webhook.queued: 7",
+                "loop.lag: count 3 | avg 0.2 | p50 0.2 | p90 0.3 | p99 0.3",
+            ],
+        )
+
+    def test_hit_rates(self) -> None:
+        registry = Metrics()
+        registry.counter("cache.user_data.hits").inc(3)
+        registry.counter("cache.user_data.misses").inc(1)
+        registry.counter("cache.page.misses")
+        registry.counter("cache.page.hits")
+        registry.counter("webhook.rejected").inc()
+
+        self.assertEqual(
+            registry.hit_rates(), {"cache.user_data": 0.75, "cache.page": 0.0}
+        )
+        self.assertIn("cache.user_data.hit_rate: 75.0%", registry.report())
+
+    def test_empty_report(self) -> None:
+        self.assertEqual(Metrics().report(), [])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+from types import SimpleNamespace
+from unittest import TestCase, main
+
+from apps.notifier.main import Notifier
+from core.models import Status
+
+
+def association(tg_id: int, status: Status) -> SimpleNamespace:
+    return SimpleNamespace(profile=SimpleNamespace(tg_id=tg_id, status=status))
+
+
+class TargetsTest(TestCase):
+    def test_blocked_subscribers_are_skipped(self) -> None:
+        channel = SimpleNamespace(
+            profile_associations=[
+                association(1, Status.active),
+                association(2, Status.blocked),
+                association(3, Status.active),
+            ]
+        )
+
+        self.assertEqual(Notifier._get_target_tg_ids(channel), [1, 3])
+
+
+if __name__ == "__main__":
+    main()
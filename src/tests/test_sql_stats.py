@@ -0,0 +1,97 @@
+from unittest import TestCase, main
+
+from database.sql_stats import SqlStats, current_scope, normalize, query_scope
+
+
+class NormalizeTest(TestCase):
+    def test_literals(self) -> None:
+        self.assertEqual(
+            normalize("SELECT * FROM users WHERE id = 42 AND name = 'O''Brien'"),
+            "SELECT * FROM users WHERE id = ? AND name = ?",
+        )
+
+    def test_parameters(self) -> None:
+        for statement in (
+            "SELECT * FROM users WHERE id = ?",
+            "SELECT * FROM users WHERE id = $1",
+            "SELECT * FROM users WHERE id = %(id_1)s",
+            "SELECT * FROM users WHERE id = :id",
+        ):
+            with self.subTest(statement=statement):
+                self.assertEqual(normalize(statement), "SELECT * FROM users WHERE id = ?")
+
+    def test_in_list_has_one_shape(self) -> None:
+        self.assertEqual(
+            normalize("SELECT * FROM users WHERE id IN (1, 2, 3)"),
+            normalize("SELECT * FROM users WHERE id IN (?,?)"),
+        )
+
+    def test_values_rows_have_one_shape(self) -> None:
+        self.assertEqual(
+            normalize("INSERT INTO users (id) VALUES (1), (2), (3)"),
+            "INSERT INTO users (id) VALUES (?), ...",
+        )
+
+    def test_cast_is_kept(self) -> None:
+        self.assertEqual(
+            normalize("SELECT '5'::int,\n  1"),
+            "SELECT ?::int, ?",
+        )
+
+
+class SqlStatsTest(TestCase):
+    def setUp(self) -> None:
+        SqlStats.reset()
+
+    def tearDown(self) -> None:
+        SqlStats.reset()
+
+    def test_shapes(self) -> None:
+        SqlStats.record("SELECT * FROM users WHERE id = 1", 0.1)
+        SqlStats.record("SELECT * FROM users WHERE id = 2", 0.3)
+
+        (histogram,) = SqlStats.top()
+
+        self.assertEqual(histogram.count, 2)
+        self.assertAlmostEqual(histogram.total, 0.4)
+
+    def test_repeated_shape_is_suspected(self) -> None:
+        with query_scope("handler") as scope:
+            for idx in range(SqlStats.repeat_threshold):
+                SqlStats.record(f"SELECT * FROM users WHERE id = {idx}", 0.01)
+
+        self.assertEqual(scope.statements, SqlStats.repeat_threshold)
+        self.assertEqual(
+            SqlStats.suspects,
+            {
+                ("handler", "SELECT * FROM users WHERE id = ?"): (
+                    1,
+                    SqlStats.repeat_threshold,
+                )
+            },
+        )
+
+    def test_below_threshold_is_not_suspected(self) -> None:
+        with query_scope("handler"):
+            for idx in range(SqlStats.repeat_threshold - 1):
+                SqlStats.record(f"SELECT * FROM users WHERE id = {idx}", 0.01)
+
+        self.assertEqual(SqlStats.suspects, {})
+
+    def test_closed_scope_is_ignored(self) -> None:
+        with query_scope("handler") as scope:
+            SqlStats.record("SELECT 1", 0.01)
+
+        # Задача, унаследовавшая контекст, пишет после закрытия операции
+        token = current_scope.set(scope)
+
+        try:
+            SqlStats.record("SELECT 1", 0.01)
+        finally:
+            current_scope.reset(token)
+
+        self.assertEqual(scope.statements, 1)
+
+
+if __name__ == "__main__":
+    main()
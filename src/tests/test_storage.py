@@ -0,0 +1,89 @@
+from unittest import main
+
+from aiogram.fsm.storage.base import StorageKey
+
+from core.storage import DatabaseStorage
+from tests.utils import DatabaseTestCase
+
+KEY = StorageKey(bot_id=1, chat_id=10, user_id=10)
+
+
+class SharedDatabaseStorageTest(DatabaseTestCase):
+    """Два экземпляра хранилища - два процесса webhook на одной БД"""
+
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+
+        self.first = DatabaseStorage(flush_delay=60, cache_ttl=60, shared=True)
+        self.second = DatabaseStorage(flush_delay=60, cache_ttl=60, shared=True)
+
+    async def asyncTearDown(self) -> None:
+        await self.first.close()
+        await self.second.close()
+        await super().asyncTearDown()
+
+    async def test_write_is_visible_to_other_instance(self) -> None:
+        await self.first.set_state(KEY, "Form:url")
+        await self.first.set_data(KEY, {"page": 2})
+
+        self.assertEqual(await self.second.get_state(KEY), "Form:url")
+        self.assertEqual(await self.second.get_data(KEY), {"page": 2})
+
+    async def test_cached_record_is_revalidated(self) -> None:
+        await self.first.set_state(KEY, "Form:url")
+        self.assertEqual(await self.second.get_state(KEY), "Form:url")
+
+        await self.first.set_state(KEY, "Form:confirm")
+        await self.first.set_data(KEY, {"url": "https://youtube.com/@x"})
+
+        self.assertEqual(await self.second.get_state(KEY), "Form:confirm")
+        self.assertEqual(
+            await self.second.get_data(KEY), {"url": "https://youtube.com/@x"}
+        )
+
+    async def test_clear_is_visible_to_other_instance(self) -> None:
+        await self.first.set_state(KEY, "Form:url")
+        self.assertEqual(await self.second.get_state(KEY), "Form:url")
+
+        await self.first.set_state(KEY, None)
+        await self.first.set_data(KEY, {})
+
+        self.assertIsNone(await self.second.get_state(KEY))
+        self.assertEqual(await self.second.get_data(KEY), {})
+
+
+class BufferedDatabaseStorageTest(DatabaseTestCase):
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+
+        self.first = DatabaseStorage(flush_delay=60, cache_ttl=0)
+        self.second = DatabaseStorage(flush_delay=60, cache_ttl=0)
+
+    async def asyncTearDown(self) -> None:
+        await self.first.close()
+        await self.second.close()
+        await super().asyncTearDown()
+
+    async def test_write_is_buffered_until_flush(self) -> None:
+        await self.first.set_state(KEY, "Form:url")
+
+        self.assertEqual(await self.first.get_state(KEY), "Form:url")
+        self.assertIsNone(await self.second.get_state(KEY))
+
+        await self.first.flush()
+
+        self.assertEqual(await self.second.get_state(KEY), "Form:url")
+
+    async def test_repeated_writes_are_coalesced(self) -> None:
+        for page in range(5):
+            await self.first.set_data(KEY, {"page": page})
+
+        self.assertEqual(len(self.first._pending), 1)
+
+        await self.first.flush()
+
+        self.assertEqual(await self.second.get_data(KEY), {"page": 4})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+from unittest import TestCase, main
+
+from utils.timeseries import RESERVOIR, Slot, Tier, TimeSeries
+
+NOW = 1_800_000_000.0
+
+
+class SlotTest(TestCase):
+    def test_aggregates(self) -> None:
+        slot = Slot()
+
+        for value in (3.0, 1.0, 2.0):
+            slot.add(value)
+
+        self.assertEqual(slot.count, 3)
+        self.assertEqual(slot.total, 6.0)
+        self.assertEqual((slot.min, slot.max), (1.0, 3.0))
+
+    def test_reservoir_is_bounded(self) -> None:
+        slot = Slot()
+
+        for value in range(RESERVOIR * 10):
+            slot.add(float(value))
+
+        self.assertEqual(slot.count, RESERVOIR * 10)
+        self.assertEqual(len(slot.samples), RESERVOIR)
+
+
+class TierTest(TestCase):
+    def test_slot_is_reused_by_newer_interval(self) -> None:
+        tier = Tier(step=60, size=2)
+        tier.add(NOW, 1.0)
+        tier.add(NOW + 120, 5.0)  # Тот же слот кольца, следующий круг
+
+        slots = tier.window(NOW + 120, 60)
+
+        self.assertEqual([slot.total for slot in slots], [5.0])
+
+    def test_older_value_does_not_reset_newer_slot(self) -> None:
+        tier = Tier(step=60, size=2)
+        tier.add(NOW + 120, 5.0)
+        tier.add(NOW, 1.0)
+
+        self.assertEqual(sum(slot.total for slot in tier.slots), 5.0)
+
+
+class TimeSeriesTest(TestCase):
+    def test_summary(self) -> None:
+        series = TimeSeries("test")
+
+        for idx in range(10):
+            series.add(float(idx), NOW - idx * 60)
+
+        summary = series.summary(3600, now=NOW)
+
+        self.assertEqual(summary["count"], 10)
+        self.assertEqual(summary["total"], 45.0)
+        self.assertEqual((summary["min"], summary["max"]), (0.0, 9.0))
+        self.assertEqual(summary["avg"], 4.5)
+
+    def test_window_excludes_old_values(self) -> None:
+        series = TimeSeries("test")
+        series.add(1.0, NOW - 7200)
+        series.add(2.0, NOW)
+
+        self.assertEqual(series.summary(3600, now=NOW)["count"], 1)
+        self.assertEqual(series.summary(86400, now=NOW)["count"], 2)
+
+    def test_empty_summary(self) -> None:
+        self.assertEqual(TimeSeries("test").summary(now=NOW)["count"], 0)
+
+    def test_percentiles_are_weighted_by_slot_count(self) -> None:
+        series = TimeSeries("test")
+
+        for _ in range(1000):  # Загруженная минута: быстрые значения
+            series.add(1.0, NOW - 60)
+
+        for _ in range(RESERVOIR):  # Тихая минута: медленные значения
+            series.add(10.0, NOW)
+
+        summary = series.summary(3600, now=NOW)
+
+        self.assertEqual(summary["p50"], 1.0)
+        self.assertEqual(summary["p95"], 10.0)
+
+    def test_trend(self) -> None:
+        series = TimeSeries("test")
+        series.add(1.0, NOW - 3000)
+        series.add(3.0, NOW - 30)
+
+        trend = series.trend(3600, points=12, now=NOW)
+
+        self.assertEqual(len(trend), 12)
+        self.assertEqual(trend[-1], 3.0)
+        self.assertIn(1.0, trend)
+        self.assertIsNone(trend[5])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import IsolatedAsyncioTestCase
+
+from database.base import Base
+from database.utils import db
+
+
+class DatabaseTestCase(IsolatedAsyncioTestCase):
+    """
+    Тест с чистой SQLite БД во временном каталоге на глобальном `db`
+    """
+
+    async def asyncSetUp(self) -> None:
+        self.tmp_dir = TemporaryDirectory()
+        await db.init(f"sqlite+aiosqlite:///{Path(self.tmp_dir.name) / 'test.db'}")
+
+        async with db.connect() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+
+    async def asyncTearDown(self) -> None:
+        await db.close()
+        self.tmp_dir.cleanup()
@@ -0,0 +1,93 @@
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Callable, Hashable
+
+from utils.metrics import metrics
+
+
+class TTLCache:
+    """
+    LRU-кэш с временем жизни записей и счётчиками попаданий в реестре метрик.
+    При заданных `weigh` и `max_weight` ограничивается ещё и суммарным весом записей
+    """
+
+    def __init__(
+        self,
+        name: str,
+        ttl: int | float,
+        max_size: int = 10_000,
+        max_weight: int | None = None,
+        weigh: Callable[[Any], int] | None = None,
+    ) -> None:
+        self.name = name
+        self.ttl = ttl
+        self.max_size = max_size
+        self.max_weight = max_weight
+        self.weigh = weigh
+
+        self._items: OrderedDict[Hashable, tuple[float, Any, int]] = OrderedDict()
+        self._weight = 0
+
+        self.hits = metrics.counter(f"cache.{name}.hits")
+        self.misses = metrics.counter(f"cache.{name}.misses")
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, key: Hashable) -> bool:
+        item = self._items.get(key)
+        return item is not None and item[0] > monotonic()
+
+    @property
+    def weight(self) -> int:
+        return self._weight
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits.value + self.misses.value
+        return self.hits.value / total if total else 0.0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        item = self._items.get(key)
+
+        if item is None or item[0] <= monotonic():
+            if item is not None:
+                self.pop(key)
+
+            self.misses.inc()
+            return default
+
+        self._items.move_to_end(key)
+        self.hits.inc()
+        return item[1]
+
+    def set(self, key: Hashable, value: Any, ttl: int | float | None = None) -> None:
+        expires = monotonic() + (self.ttl if ttl is None else ttl)
+        weight = self.weigh(value) if self.weigh else 0
+
+        if self.max_weight is not None and weight > self.max_weight:
+            self.pop(key)
+            return
+
+        self.pop(key)
+        self._items[key] = (expires, value, weight)
+        self._weight += weight
+
+        while len(self._items) > self.max_size or (
+            self.max_weight is not None and self._weight > self.max_weight
+        ):
+            _, (_, _, evicted_weight) = self._items.popitem(last=False)
+            self._weight -= evicted_weight
+
+    def pop(self, key: Hashable) -> Any:
+        item = self._items.pop(key, None)
+
+        if item is None:
+            return
+
+        self._weight -= item[2]
+        return item[1]
+
+    def clear(self) -> None:
+        self._items.clear()
+        self._weight = 0
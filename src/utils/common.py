@@ -1,3 +1,14 @@
+from asyncio import Task, get_running_loop
+from contextvars import Context
+from typing import Any, Coroutine
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+TRACKING_PARAMS = frozenset({"si", "feature", "pp", "app", "ab_channel"})
+
+# Ссылки на фоновые задачи: без них задачу может собрать сборщик мусора
+background_tasks: set[Task] = set()
+
+
 def strip_text(text: str, text_max_len: int = 140, placeholder: str = "....") -> str:
     """
     Обрезание текста до указанной длины,
@@ -11,3 +22,34 @@ def strip_text(text: str, text_max_len: int = 140, placeholder: str = "....") ->
     stop_strip_idx = len(text) - start_strip_idx
 
     return f"{text[:start_strip_idx]}{placeholder}{text[stop_strip_idx:]}"
+
+
+def normalize_url(url: str) -> str:
+    """
+    Приведение ссылки YouTube к единому виду:
+    схема https, хост без www/m, без якоря, слеша в конце и трекинговых параметров
+    """
+    parts = urlsplit(url.strip())
+
+    host = parts.netloc.lower().removeprefix("www.").removeprefix("m.")
+    path = parts.path.rstrip("/")
+    query = urlencode(
+        sorted(
+            (key, value)
+            for key, value in parse_qsl(parts.query)
+            if key not in TRACKING_PARAMS and not key.startswith("utm_")
+        )
+    )
+
+    return urlunsplit(("https", host, path, query, ""))
+
+
+def run_in_background(coro: Coroutine[Any, Any, Any]) -> Task:
+    """
+    Фоновая задача, не привязанная к обработке апдейта: запускается в пустом
+    контексте, чтобы не наследовать учёт времени и запросов апдейта
+    """
+    task = get_running_loop().create_task(coro, context=Context())
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+    return task
@@ -0,0 +1,91 @@
+from asyncio import gather, get_running_loop
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import batched
+from logging import getLogger
+from multiprocessing import get_context
+from os import cpu_count
+from typing import Any, Callable, Iterable, Sequence
+
+from core.settings import settings
+from utils.tracing import span
+
+logger = getLogger(__name__)
+
+
+def _apply_batch(func: Callable, batch: Sequence) -> list:
+    return [func(item) for item in batch]
+
+
+class ParseExecutor:
+    """
+    Разбор страниц вне event loop: пул процессов (regex и json держат GIL)
+    или потоков. В режиме inline и до start() функции выполняются в самом loop
+    """
+
+    mode = settings.parser.mode
+    workers = settings.parser.workers or cpu_count() or 1
+    batch_size = settings.parser.batch_size
+
+    executor: Executor | None = None
+
+    @classmethod
+    def start(
+        cls,
+        mode: str | None = None,
+        workers: int | None = None,
+        batch_size: int | None = None,
+    ) -> None:
+        cls.mode = mode or cls.mode
+        cls.workers = workers or cls.workers
+        cls.batch_size = batch_size or cls.batch_size
+
+        if cls.executor is not None or cls.mode == "inline":
+            return
+
+        if cls.mode == "process":
+            cls.executor = ProcessPoolExecutor(
+                cls.workers, mp_context=get_context("spawn")
+            )
+        else:
+            cls.executor = ThreadPoolExecutor(cls.workers, thread_name_prefix="parser")
+
+        logger.info("Parse executor started: Mode=%s | Workers=%d", cls.mode, cls.workers)
+
+    @classmethod
+    def stop(cls) -> None:
+        if cls.executor is None:
+            return
+
+        cls.executor.shutdown(wait=False, cancel_futures=True)
+        cls.executor = None
+
+        logger.info("Parse executor stopped")
+
+    @classmethod
+    async def run(cls, func: Callable, *args: Any) -> Any:
+        if cls.executor is None:
+            return func(*args)
+
+        loop = get_running_loop()
+        return await loop.run_in_executor(cls.executor, func, *args)
+
+    @classmethod
+    async def map(cls, func: Callable, items: Iterable) -> list:
+        """
+        `func` к каждому элементу, пачками по `batch_size` на задачу пула,
+        чтобы не платить за пересылку каждой страницы отдельно. Порядок сохраняется
+        """
+        items = list(items)
+
+        with span("parse", f"{func.__name__} x{len(items)}"):
+            if cls.executor is None:
+                return _apply_batch(func, items)
+
+            results = await gather(
+                *(
+                    cls.run(_apply_batch, func, batch)
+                    for batch in batched(items, cls.batch_size)
+                )
+            )
+
+        return [result for batch in results for result in batch]
@@ -1,11 +1,231 @@
+from datetime import UTC, datetime
+from enum import StrEnum, auto
+from json import loads
 from logging import getLogger
+from re import compile as compile_re
 from re import findall, search
-from typing import List
+from typing import Any, Iterator, List, NamedTuple
 
-from utils.common import strip_text
+from log.utils import MessageBody
 
 logger = getLogger(__name__)
 
+INITIAL_DATA_MARKERS = ("var ytInitialData = ", 'window["ytInitialData"] = ')
+INITIAL_DATA_END = ";</script>"
+VIDEO_RENDERERS = ("videoRenderer", "gridVideoRenderer")
+
+PAGE_PATTERN = compile_re(
+    r'<link rel="canonical" href="(?P<canonical_url>[^"]+)"'
+    r'|"originalUrl":"(?P<original_url>[^"]+)"'
+    r'|"name": "(?P<name>[^"]+)"'
+    r'|"externalId":"(?P<channel_id>UC[\w-]{22})"'
+    r"|/watch\?v=(?P<content_id>[^\"'\\&?]{1,11})"
+)
+CHANNEL_ID_PATTERN = compile_re(r"/channel/(UC[\w-]{22})")
+
+
+class PageInfo(NamedTuple):
+    name: str | None = None
+    original_url: str | None = None
+    canonical_url: str | None = None
+    channel_id: str | None = None
+    content_ids: tuple[str, ...] = ()
+
+    @property
+    def content_urls(self) -> list[str]:
+        return [f"/watch?v={content_id}" for content_id in self.content_ids]
+
+    def missing(self, *fields: str) -> list[str]:
+        return [field for field in fields if not getattr(self, field)]
+
+
+class ContentStatus(StrEnum):
+    uploaded = auto()
+    live = auto()
+    upcoming = auto()
+
+
+class ContentItem(NamedTuple):
+    id: str
+    title: str | None = None
+    published: str | None = None
+    scheduled: datetime | None = None
+    status: ContentStatus = ContentStatus.uploaded
+
+    @property
+    def url(self) -> str:
+        return f"/watch?v={self.id}"
+
+    @classmethod
+    def from_renderer(cls, renderer: dict) -> "ContentItem":
+        title = renderer.get("title", {})
+        title = title.get("simpleText") or "".join(
+            run.get("text", "") for run in title.get("runs", ())
+        )
+        published = renderer.get("publishedTimeText", {}).get("simpleText")
+
+        scheduled = None
+        status = ContentStatus.uploaded
+
+        if "upcomingEventData" in renderer:
+            start_time = renderer["upcomingEventData"].get("startTime")
+            scheduled = (
+                datetime.fromtimestamp(int(start_time), UTC) if start_time else None
+            )
+            status = ContentStatus.upcoming
+
+        elif _is_live(renderer):
+            status = ContentStatus.live
+
+        return cls(renderer["videoId"], title or None, published, scheduled, status)
+
+
+def _is_live(renderer: dict) -> bool:
+    for overlay in renderer.get("thumbnailOverlays", ()):
+        if overlay.get("thumbnailOverlayTimeStatusRenderer", {}).get("style") == "LIVE":
+            return True
+
+    for badge in renderer.get("badges", ()):
+        if badge.get("metadataBadgeRenderer", {}).get("style") == (
+            "BADGE_STYLE_TYPE_LIVE_NOW"
+        ):
+            return True
+
+    return False
+
+
+def find_initial_data(page: str) -> str | None:
+    """
+    Срез страницы с JSON ytInitialData (без разбора)
+    """
+    for marker in INITIAL_DATA_MARKERS:
+        start = page.find(marker)
+
+        if start != -1:
+            start += len(marker)
+            end = page.find(INITIAL_DATA_END, start)
+            return page[start:end] if end != -1 else None
+
+    return None
+
+
+def extract_content(page: str) -> list[ContentItem] | None:
+    """
+    Контент выбранной вкладки канала из ytInitialData в порядке страницы, без
+    повторов и рекомендаций. Разбирается только JSON-срез, а не вся страница.
+    None, если ytInitialData не найден или не разбирается. Пустая вкладка -
+    пустой список: ссылки в разметке страницы в этом случае - рекомендации
+    """
+    initial_data = find_initial_data(page)
+
+    if initial_data is None:
+        return None
+
+    try:
+        data = loads(initial_data)
+        tabs = data["contents"]["twoColumnBrowseResultsRenderer"]["tabs"]
+
+    except (ValueError, KeyError, TypeError):
+        return None
+
+    selected = next(
+        (
+            tab["tabRenderer"]
+            for tab in tabs
+            if tab.get("tabRenderer", {}).get("selected")
+        ),
+        None,
+    )
+
+    if selected is None:
+        return None
+
+    items = {}
+
+    for renderer in _iter_video_renderers(selected.get("content", {})):
+        if "videoId" in renderer and renderer["videoId"] not in items:
+            items[renderer["videoId"]] = ContentItem.from_renderer(renderer)
+
+    return list(items.values())
+
+
+def parse_content(page: str) -> list[ContentItem]:
+    """
+    extract_content с откатом на ID из разметки. Ничего не логирует,
+    поэтому может выполняться в ParseExecutor
+    """
+    items = extract_content(page)
+
+    if items is None:
+        items = [ContentItem(content_id) for content_id in extract_page(page).content_ids]
+
+    return items
+
+
+def _iter_video_renderers(node: Any) -> Iterator[dict]:
+    """Обход JSON в глубину в порядке документа"""
+    stack = [node]
+
+    while stack:
+        node = stack.pop()
+
+        if isinstance(node, dict):
+            for key in VIDEO_RENDERERS:
+                if key in node:
+                    yield node[key]
+                    break
+
+            else:
+                stack.extend(reversed(node.values()))
+
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+
+
+def extract_page(page: str) -> PageInfo:
+    """
+    Разбор страницы за один проход: название, оригинальный и каноничный URL,
+    ID канала и ID контента (без повторов, в порядке появления на странице).
+    Ничего не логирует, об отсутствующих полях сообщает `warn_missing`
+    """
+    scalars = {}
+    content_ids = {}
+
+    for match in PAGE_PATTERN.finditer(page):
+        group = match.lastgroup
+
+        if group == "content_id":
+            content_ids[match.group(group)] = None
+
+        elif group not in scalars:
+            scalars[group] = match.group(group)
+
+    if "channel_id" not in scalars and "canonical_url" in scalars:
+        channel_id = CHANNEL_ID_PATTERN.search(scalars["canonical_url"])
+        scalars["channel_id"] = channel_id.group(1) if channel_id else None
+
+    return PageInfo(**scalars, content_ids=tuple(content_ids))
+
+
+def warn_missing(
+    info: PageInfo,
+    page: str,
+    *fields: str,
+    from_url: str | None = None,
+) -> bool:
+    """Предупреждение об отсутствующих полях страницы. True, если все поля найдены"""
+    missing = info.missing(*fields)
+
+    if missing:
+        logger.warning(
+            'Page fields not found: URL="%s" | Fields=%s | Text="%s"',
+            from_url,
+            missing,
+            MessageBody(page, "truncate"),
+        )
+
+    return not missing
+
 
 def find_channel_url(page: str, from_url: str | None = None) -> str | None:
     """
@@ -24,7 +244,7 @@ def find_channel_url(page: str, from_url: str | None = None) -> str | None:
     logger.warning(
         'Channels URL not found: URL="%s" | Text="%s"',
         from_url,
-        strip_text(page),
+        MessageBody(page, "truncate"),
     )
 
     return None
@@ -41,7 +261,7 @@ def find_canonical_url(page: str, from_url: str | None = None) -> str | None:
     logger.warning(
         'Canonical URL not found: URL="%s" | Text="%s"',
         from_url,
-        strip_text(page),
+        MessageBody(page, "truncate"),
     )
     return None
 
@@ -57,7 +277,7 @@ def find_original_url(page: str, from_url: str | None = None) -> str | None:
     logger.warning(
         'Original URL not found: URL="%s" | Text="%s"',
         from_url,
-        strip_text(page),
+        MessageBody(page, "truncate"),
     )
     return None
 
@@ -76,7 +296,7 @@ def find_channel_name(
     logger.warning(
         'Channel name not found: URL="%s" | Text="%s"',
         from_url,
-        strip_text(channel_page),
+        MessageBody(channel_page, "truncate"),
     )
     return None
 
@@ -94,7 +314,7 @@ def find_content_urls(
         logger.warning(
             'Content URL\'s not found: URL="%s" | Text="%s"',
             from_url,
-            strip_text(channel_page),
+            MessageBody(channel_page, "truncate"),
         )
 
     return urls
@@ -0,0 +1,133 @@
+from asyncio import to_thread
+from hashlib import sha1
+from json import dumps, loads
+from logging import getLogger
+from pathlib import Path
+from threading import Lock
+from typing import Literal
+from zipfile import ZIP_DEFLATED, ZipFile
+
+from httpx import Request, Response
+
+logger = getLogger(__name__)
+
+CassetteMode = Literal["off", "record", "replay"]
+
+
+class Cassette:
+    """
+    Архив ответов HTTP: zip (deflate), одна запись на запрос с ключом из
+    метода, URL и параметров. Запись — строка JSON с кодом и заголовками,
+    затем тело ответа. В режиме replay сеть не используется.
+    Чтение и сжатие архива выполняются в потоке, вне event loop
+    """
+
+    # Тело хранится уже распакованным, поэтому content-encoding не сохраняется
+    KEPT_HEADERS: tuple[str, ...] = ("content-type",)
+
+    def __init__(self, path: str | Path, mode: CassetteMode = "replay") -> None:
+        self.path = Path(path)
+        self.mode = mode
+
+        self._lock = Lock()
+        self._names: set[str] | None = None
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(path={self.path}, mode={self.mode})"
+
+    @property
+    def replay(self) -> bool:
+        return self.mode == "replay"
+
+    @property
+    def record(self) -> bool:
+        return self.mode == "record"
+
+    @classmethod
+    def from_settings(cls, mode: CassetteMode, path: str) -> "Cassette | None":
+        if mode == "off":
+            return None
+
+        logger.info('HTTP cassette: Mode=%s | Path="%s"', mode, path)
+        return cls(path, mode)
+
+    @staticmethod
+    def build_key(method: str, url: str, params: dict | None = None) -> str:
+        query = dumps(params or {}, sort_keys=True, separators=(",", ":"))
+        return sha1(f"{method.upper()} {url} {query}".encode()).hexdigest()
+
+    def names(self) -> set[str]:
+        with self._lock:
+            if self._names is None:
+                if self.path.exists():
+                    with ZipFile(self.path) as archive:
+                        self._names = set(archive.namelist())
+                else:
+                    self._names = set()
+
+            return self._names
+
+    async def get(
+        self, method: str, url: str, params: dict | None = None
+    ) -> Response | None:
+        return await to_thread(self._get, method, url, params)
+
+    async def put(
+        self,
+        method: str,
+        url: str,
+        response: Response,
+        params: dict | None = None,
+    ) -> None:
+        await to_thread(self._put, method, url, response, params)
+
+    def _get(self, method: str, url: str, params: dict | None = None) -> Response | None:
+        key = self.build_key(method, url, params)
+
+        if key not in self.names():
+            logger.warning('Cassette miss: URL="%s"', url)
+            return None
+
+        # Под блокировкой: запись в режиме "a" переписывает оглавление архива
+        with self._lock, ZipFile(self.path) as archive:
+            meta, content = archive.read(key).split(b"\n", 1)
+
+        meta = loads(meta)
+        return Response(
+            meta["status_code"],
+            headers=meta["headers"],
+            content=content,
+            request=Request(method, meta["url"], params=params),
+        )
+
+    def _put(
+        self,
+        method: str,
+        url: str,
+        response: Response,
+        params: dict | None = None,
+    ) -> None:
+        key = self.build_key(method, url, params)
+
+        if key in self.names():
+            return
+
+        meta = {
+            "url": url,
+            "status_code": response.status_code,
+            "headers": {
+                name: value
+                for name, value in response.headers.items()
+                if name in self.KEPT_HEADERS
+            },
+        }
+
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+
+            with ZipFile(self.path, "a", ZIP_DEFLATED, compresslevel=9) as archive:
+                archive.writestr(key, dumps(meta).encode() + b"\n" + response.content)
+
+            self._names.add(key)
+
+        logger.debug('Cassette record: URL="%s" | Bytes=%d', url, len(response.content))
@@ -6,7 +6,9 @@ from h2.exceptions import H2Error
 from httpx import AsyncClient, HTTPError, Response
 
 from core.settings import settings
+from utils.http.cassette import Cassette
 from utils.http.http_headers import ChromeHeadersBuilder, Headers
+from utils.latency import track
 
 logger = getLogger(__name__)
 
@@ -17,6 +19,10 @@ class HTTPManager:
     FOLLOW_REDIRECTS: bool = True
     HTTP2: bool = True
 
+    CASSETTE: Cassette | None = Cassette.from_settings(
+        settings.cassette.mode, settings.cassette.path
+    )
+
     HEADERS: dict[str, str] = {
         "authority": "www.youtube.com",
         "accept": (
@@ -136,24 +142,34 @@ class HTTPManager:
         timeout=TIMEOUT,
         follow_redirects=FOLLOW_REDIRECTS,
     ) -> Response | None:
+        if self.CASSETTE is not None and self.CASSETTE.replay:
+            return await self.CASSETTE.get(method, url, params)
+
         if headers is None:
             context = self.__pre_request()
             headers = context["headers"]
 
         try:
-            async with AsyncClient(
-                http2=self.HTTP2,
-                timeout=self.TIMEOUT,
-                follow_redirects=self.FOLLOW_REDIRECTS,
-            ) as client:
-                return await self.__hits(
-                    client,
-                    method,
-                    url,
-                    params,
-                    headers,
-                    timeout,
-                    follow_redirects,
-                )
+            with track("http"):
+                async with AsyncClient(
+                    http2=self.HTTP2,
+                    timeout=self.TIMEOUT,
+                    follow_redirects=self.FOLLOW_REDIRECTS,
+                ) as client:
+                    response = await self.__hits(
+                        client,
+                        method,
+                        url,
+                        params,
+                        headers,
+                        timeout,
+                        follow_redirects,
+                    )
         except (H2Error, HTTPError) as ex:
             logger.warning('HTTPError: URL="%s" | %s', url, ex)
+            return
+
+        if response is not None and self.CASSETTE is not None and self.CASSETTE.record:
+            await self.CASSETTE.put(method, url, response, params)
+
+        return response
@@ -0,0 +1,51 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Iterator, Literal
+
+Component = Literal["db", "http", "telegram"]
+
+
+class Breakdown:
+    """
+    Время обработки одного апдейта по составляющим. Заполняется из БД,
+    HTTP-клиента и сессии бота через `track` в контексте текущего апдейта.
+    Задачи, созданные во время апдейта, наследуют контекст, поэтому после
+    завершения апдейта (`closed`) время больше не учитывается
+    """
+
+    __slots__ = ("handler", "db", "http", "telegram", "closed")
+
+    def __init__(self) -> None:
+        self.handler: str | None = None
+        self.db = 0.0
+        self.http = 0.0
+        self.telegram = 0.0
+        self.closed = False
+
+    def other(self, total: float) -> float:
+        """Всё остальное: CPU, ожидание лимитов и блокировок"""
+        return max(total - self.db - self.http - self.telegram, 0.0)
+
+
+current_breakdown: ContextVar[Breakdown | None] = ContextVar(
+    "current_breakdown", default=None
+)
+
+
+def add_time(component: Component, seconds: float) -> None:
+    breakdown = current_breakdown.get()
+
+    if breakdown is not None and not breakdown.closed:
+        setattr(breakdown, component, getattr(breakdown, component) + seconds)
+
+
+@contextmanager
+def track(component: Component) -> Iterator[None]:
+    started = perf_counter()
+
+    try:
+        yield
+
+    finally:
+        add_time(component, perf_counter() - started)
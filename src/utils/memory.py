@@ -0,0 +1,141 @@
+import gc
+import tracemalloc
+from asyncio import to_thread
+from collections import Counter
+from logging import getLogger
+from resource import RUSAGE_SELF, getrusage
+from typing import NamedTuple
+
+from aiogram.types import Message
+from pydantic import BaseModel
+
+from database.base import Base
+from utils.cache import TTLCache
+
+logger = getLogger(__name__)
+
+# Категории объектов для подсчёта по типам: ORM, pydantic, сообщения aiogram.
+# Message сам является pydantic-моделью, поэтому проверяется первым
+OBJECT_KINDS: tuple[tuple[str, type], ...] = (
+    ("aiogram Message", Message),
+    ("ORM", Base),
+    ("pydantic", BaseModel),
+)
+
+# Служебные аллокации самого tracemalloc и импорта не интересны
+SNAPSHOT_FILTERS: tuple[tracemalloc.Filter, ...] = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+class MemoryReport(NamedTuple):
+    started: bool
+    rss_max_mb: float
+    traced_mb: float
+    peak_mb: float
+    top: list[str]
+    diff: list[str] | None
+    objects: dict[str, list[tuple[str, int]]]
+    caches: list[tuple[str, int, int]]
+
+
+class MemoryTracker:
+    """
+    Снимки tracemalloc по запросу. Трассировка запускается первым снимком
+    (или PYTHONTRACEMALLOC), поэтому видны только аллокации после запуска:
+    в отчёте первого снимка `started` и пустой топ аллокаций.
+    Разница считается от предыдущего снимка. Снимок, сравнение и обход
+    объектов gc выполняются в потоке, вне event loop
+    """
+
+    frames: int = 1
+    previous: tracemalloc.Snapshot | None = None
+
+    @classmethod
+    def start(cls, frames: int | None = None) -> bool:
+        """True, если трассировка запущена этим вызовом"""
+        if tracemalloc.is_tracing():
+            return False
+
+        tracemalloc.start(frames or cls.frames)
+        logger.info("Tracemalloc start: Frames=%d", tracemalloc.get_traceback_limit())
+        return True
+
+    @classmethod
+    def stop(cls) -> None:
+        cls.previous = None
+
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+            logger.info("Tracemalloc stop")
+
+    @classmethod
+    async def snapshot(cls, limit: int = 15) -> MemoryReport:
+        return await to_thread(cls._snapshot, limit)
+
+    @classmethod
+    def _snapshot(cls, limit: int) -> MemoryReport:
+        started = cls.start()
+
+        snapshot = tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+        top = (
+            []
+            if started
+            else [str(stat) for stat in snapshot.statistics("lineno")[:limit]]
+        )
+        diff = None
+
+        if cls.previous is not None:
+            diff = [
+                str(stat)
+                for stat in snapshot.compare_to(cls.previous, "lineno")[:limit]
+                if stat.size_diff
+            ]
+
+        cls.previous = snapshot
+        traced, peak = tracemalloc.get_traced_memory()
+
+        return MemoryReport(
+            started=started,
+            rss_max_mb=round(getrusage(RUSAGE_SELF).ru_maxrss / 1024, 1),
+            traced_mb=round(traced / 2**20, 1),
+            peak_mb=round(peak / 2**20, 1),
+            top=top,
+            diff=diff,
+            objects=count_objects(limit),
+            caches=cache_sizes(),
+        )
+
+
+def count_objects(limit: int = 15) -> dict[str, list[tuple[str, int]]]:
+    """Число живых объектов по типам для каждой категории OBJECT_KINDS"""
+    counters = {kind: Counter() for kind, _ in OBJECT_KINDS}
+    kinds: dict[type, str | None] = {}
+
+    # Проверка по MRO, а не isinstance/issubclass: у части объектов свой
+    # __getattr__, на который реагирует __instancecheck__ pydantic, а
+    # __subclasscheck__ ABCMeta заполнил бы кэши всех подклассов BaseModel
+    for obj in gc.get_objects():
+        obj_type = type(obj)
+
+        if obj_type not in kinds:
+            kinds[obj_type] = next(
+                (kind for kind, base in OBJECT_KINDS if base in obj_type.__mro__), None
+            )
+
+        if (kind := kinds[obj_type]) is not None:
+            counters[kind][obj_type.__qualname__] += 1
+
+    return {kind: counter.most_common(limit) for kind, counter in counters.items()}
+
+
+def cache_sizes() -> list[tuple[str, int, int]]:
+    """Имя, число записей и вес всех живых TTLCache"""
+    return sorted(
+        (obj.name, len(obj), obj.weight)
+        for obj in gc.get_objects()
+        if type(obj) is TTLCache
+    )
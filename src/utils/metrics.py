@@ -0,0 +1,186 @@
+from asyncio import Task, get_running_loop, sleep
+from collections import deque
+from logging import getLogger
+from os import getpid
+from typing import Any
+
+from core.settings import settings
+
+logger = getLogger(__name__)
+
+
+class Counter:
+    __slots__ = ("name", "value")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.value = 0
+
+    def inc(self, value: int = 1) -> None:
+        self.value += value
+
+
+class Gauge:
+    __slots__ = ("name", "value")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.value: int | float = 0
+
+    def set(self, value: int | float) -> None:
+        self.value = value
+
+
+class Histogram:
+    """
+    Общие count/sum и последние `size` наблюдений для расчёта перцентилей
+    """
+
+    __slots__ = ("name", "count", "total", "samples")
+
+    def __init__(self, name: str, size: int = 1024) -> None:
+        self.name = name
+        self.count = 0
+        self.total = 0.0
+        self.samples: deque[float] = deque(maxlen=size)
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.samples.append(value)
+
+    def percentiles(self, *quantiles: float) -> dict[str, float]:
+        if not self.samples:
+            return {}
+
+        ordered = sorted(self.samples)
+        last_idx = len(ordered) - 1
+
+        return {f"p{int(q * 100)}": ordered[round(q * last_idx)] for q in quantiles}
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "avg": self.total / self.count if self.count else 0.0,
+            **self.percentiles(0.5, 0.9, 0.99),
+        }
+
+
+class Metrics:
+    """
+    Реестр метрик процесса
+    """
+
+    def __init__(self) -> None:
+        self.counters: dict[str, Counter] = {}
+        self.gauges: dict[str, Gauge] = {}
+        self.histograms: dict[str, Histogram] = {}
+
+    def counter(self, name: str) -> Counter:
+        if name not in self.counters:
+            self.counters[name] = Counter(name)
+        return self.counters[name]
+
+    def gauge(self, name: str) -> Gauge:
+        if name not in self.gauges:
+            self.gauges[name] = Gauge(name)
+        return self.gauges[name]
+
+    def histogram(self, name: str) -> Histogram:
+        if name not in self.histograms:
+            self.histograms[name] = Histogram(name)
+        return self.histograms[name]
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "counters": {name: item.value for name, item in self.counters.items()},
+            "gauges": {name: item.value for name, item in self.gauges.items()},
+            "histograms": {
+                name: item.summary() for name, item in self.histograms.items()
+            },
+            "hit_rates": self.hit_rates(),
+        }
+
+    def hit_rates(self) -> dict[str, float]:
+        """Доля попаданий по парам счётчиков `<имя>.hits` и `<имя>.misses`"""
+        rates = {}
+
+        for name, hits in self.counters.items():
+            prefix = name.removesuffix(".hits")
+
+            if (
+                prefix == name
+                or (misses := self.counters.get(f"{prefix}.misses")) is None
+            ):
+                continue
+
+            total = hits.value + misses.value
+            rates[prefix] = hits.value / total if total else 0.0
+
+        return rates
+
+    def report(self) -> list[str]:
+        """Снимок реестра построчно: `имя: значение`, по гистограммам - сводка"""
+        lines = [f"{name}: {item.value}" for name, item in sorted(self.counters.items())]
+        lines.extend(
+            f"{name}: {item.value}" for name, item in sorted(self.gauges.items())
+        )
+        lines.extend(
+            f"{name}.hit_rate: {rate:.1%}"
+            for name, rate in sorted(self.hit_rates().items())
+        )
+
+        for name, item in sorted(self.histograms.items()):
+            summary = " | ".join(
+                f"{key} {value:.4g}" for key, value in item.summary().items()
+            )
+            lines.append(f"{name}: {summary}")
+
+        return lines
+
+
+metrics = Metrics()
+
+
+class MetricsReporter:
+    """
+    Раз в `interval` секунд пишет снимок реестра метрик в лог. Реестр у
+    каждого процесса свой, поэтому запись подписана PID и ролью процесса
+    """
+
+    interval = settings.metrics_log_interval
+
+    _task: Task | None = None
+
+    @classmethod
+    def start(cls, role: str, interval: int | None = None) -> None:
+        if cls._task is not None:
+            return
+
+        cls.interval = interval or cls.interval
+        cls._task = get_running_loop().create_task(cls._run(role))
+
+        logger.info(
+            "Metrics reporter started: Interval=%ss | Role=%s", cls.interval, role
+        )
+
+    @classmethod
+    def stop(cls) -> None:
+        if cls._task is None:
+            return
+
+        cls._task.cancel()
+        cls._task = None
+
+        logger.info("Metrics reporter stopped")
+
+    @classmethod
+    async def _run(cls, role: str) -> None:
+        while True:
+            await sleep(cls.interval)
+            cls.log(role)
+
+    @classmethod
+    def log(cls, role: str) -> None:
+        if lines := metrics.report():
+            logger.info("Metrics: Pid=%s | Role=%s\n%s", getpid(), role, "\n".join(lines))
@@ -0,0 +1,66 @@
+from asyncio import sleep
+from contextlib import contextmanager
+from cProfile import Profile
+from io import StringIO
+from logging import getLogger
+from marshal import dumps
+from pstats import SortKey, Stats
+from time import monotonic
+from typing import Iterator
+
+logger = getLogger(__name__)
+
+
+class Profiler:
+    """
+    cProfile потока событийного цикла по запросу администратора.
+    Одновременно допускается один сеанс: второй профилировщик cProfile
+    в том же интерпретаторе не запустить
+    """
+
+    active: bool = False
+
+    @classmethod
+    @contextmanager
+    def session(cls, label: str) -> Iterator[Profile]:
+        cls.active = True
+        profile = Profile()
+        started = monotonic()
+
+        logger.info('Profiler start: Label="%s"', label)
+        profile.enable()
+
+        try:
+            yield profile
+
+        finally:
+            profile.disable()
+            cls.active = False
+
+            logger.info(
+                'Profiler stop: Label="%s" | Duration=%.1fs', label, monotonic() - started
+            )
+
+    @classmethod
+    async def for_seconds(cls, seconds: int) -> Profile | None:
+        """Профиль всего, что выполнялось в цикле событий за `seconds` секунд"""
+        if cls.active:
+            return None
+
+        with cls.session(f"{seconds}s") as profile:
+            await sleep(seconds)
+
+        return profile
+
+
+def top_stats(profile: Profile, limit: int = 20, sort: str = SortKey.TIME) -> str:
+    """Текстовый отчёт pstats по `limit` самым дорогим функциям"""
+    stream = StringIO()
+    Stats(profile, stream=stream).strip_dirs().sort_stats(sort).print_stats(limit)
+    return stream.getvalue()
+
+
+def dump_stats(profile: Profile) -> bytes:
+    """Полный профиль в формате .prof (pstats, snakeviz)"""
+    profile.create_stats()
+    return dumps(profile.stats)
@@ -1,16 +1,66 @@
+from asyncio import Task, ensure_future, gather, shield
 from logging import getLogger
 from re import search
 
 from apps.notifier.models import ContentType
-from utils.finder import find_channel_url, find_content_urls
+from core.settings import settings
+from log.utils import MessageBody
+from utils.cache import TTLCache
+from utils.executor import ParseExecutor
+from utils.finder import ContentItem, find_channel_url, parse_content
 from utils.http import HTTPManager
+from utils.metrics import metrics
 from utils.token_bucket import rate_limit
+from utils.tracing import span
 
 logger = getLogger(__name__)
 
+page_cache = TTLCache(
+    "page",
+    ttl=settings.cache.page_ttl,
+    max_weight=settings.cache.page_max_bytes,
+    weigh=len,
+)
+in_flight: dict[str, Task] = {}
+dedup_counter = metrics.counter("scrapper.dedup")
+
 
-@rate_limit("YouTube")
 async def _load_page(url: str) -> str | None:
+    """
+    Загрузка страницы. Недавние ответы берутся из кэша, а одновременные запросы
+    одного URL разделяют один запрос к YouTube
+    """
+    page = page_cache.get(url)
+
+    if page is not None:
+        return page
+
+    task = in_flight.get(url)
+
+    if task is None:
+        task = ensure_future(__fetch_page(url))
+        task.add_done_callback(lambda _: in_flight.pop(url, None))
+        in_flight[url] = task
+
+    else:
+        dedup_counter.inc()
+
+    # Отмена одного из ожидающих не должна отменять общий запрос
+    return await shield(task)
+
+
+async def __fetch_page(url: str) -> str | None:
+    with span("youtube.page", url):
+        page = await __request_page(url)
+
+    if page is not None:
+        page_cache.set(url, page)
+
+    return page
+
+
+@rate_limit("YouTube")
+async def __request_page(url: str) -> str | None:
     http_manager = HTTPManager()
     response = await http_manager.get(url)
 
@@ -47,8 +97,37 @@ async def __get_channel_url_by_content_url(content_url: str) -> str | None:
     return find_channel_url(content_page, content_url)
 
 
-async def get_content_urls(channel_url: str, content_type: ContentType) -> set[str]:
-    """Получение множества URL контента"""
-    url = f"{channel_url}/{content_type}"
-    content_page = await _load_page(url=url) or ""
-    return set(find_content_urls(content_page, url))
+async def get_content_items(
+    channel_url: str, content_type: ContentType
+) -> list[ContentItem]:
+    """Контент вкладки канала в порядке страницы"""
+    (items,) = await load_content_items([(channel_url, content_type)])
+    return items
+
+
+async def load_content_items(
+    tabs: list[tuple[str, ContentType]],
+) -> list[list[ContentItem]]:
+    """
+    Загрузка вкладок каналов и их разбор одной пачкой в ParseExecutor.
+    Если ytInitialData не разобрался, берутся ID из разметки (без названий и статусов)
+    """
+    urls = [f"{channel_url}/{content_type}" for channel_url, content_type in tabs]
+    pages = [page or "" for page in await gather(*map(_load_page, urls))]
+
+    results = await ParseExecutor.map(parse_content, pages)
+
+    for url, page, items in zip(urls, pages, results):
+        if not items:
+            logger.warning(
+                'Content URL\'s not found: URL="%s" | Text="%s"',
+                url,
+                MessageBody(page, "truncate"),
+            )
+
+    return results
+
+
+async def get_content_urls(channel_url: str, content_type: ContentType) -> list[str]:
+    """Получение списка URL контента в порядке страницы"""
+    return [item.url for item in await get_content_items(channel_url, content_type)]
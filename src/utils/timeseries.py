@@ -0,0 +1,187 @@
+from array import array
+from random import random
+from time import time
+from typing import Any
+
+# Ступени хранения: (шаг слота в секундах, число слотов) - час поминутно,
+# сутки по часам и месяц по дням. Память серии фиксирована
+TIERS: tuple[tuple[int, int], ...] = ((60, 60), (3600, 24), (86400, 30))
+RESERVOIR: int = 64
+
+
+class Slot:
+    """
+    Агрегат значений за интервал: count/sum/min/max и случайная выборка
+    фиксированного размера (reservoir sampling) для перцентилей
+    """
+
+    __slots__ = ("start", "count", "total", "min", "max", "samples")
+
+    def __init__(self) -> None:
+        self.start = -1
+        self.count = 0
+        self.total = 0.0
+        self.min = 0.0
+        self.max = 0.0
+        self.samples = array("d")
+
+    def reset(self, start: int) -> None:
+        self.start = start
+        self.count = 0
+        self.total = 0.0
+        self.samples = array("d")
+
+    def add(self, value: float) -> None:
+        if self.count:
+            self.min = min(self.min, value)
+            self.max = max(self.max, value)
+        else:
+            self.min = self.max = value
+
+        self.count += 1
+        self.total += value
+
+        if len(self.samples) < RESERVOIR:
+            self.samples.append(value)
+        elif (idx := int(random() * self.count)) < RESERVOIR:
+            self.samples[idx] = value
+
+
+class Tier:
+    """Кольцо из `size` слотов по `step` секунд"""
+
+    __slots__ = ("step", "size", "slots")
+
+    def __init__(self, step: int, size: int) -> None:
+        self.step = step
+        self.size = size
+        self.slots = [Slot() for _ in range(size)]
+
+    def add(self, timestamp: float, value: float) -> None:
+        start = int(timestamp // self.step) * self.step
+        slot = self.slots[start // self.step % self.size]
+
+        if slot.start > start:  # Слот уже занят более новым интервалом
+            return
+
+        if slot.start != start:
+            slot.reset(start)
+
+        slot.add(value)
+
+    def window(self, now: float, seconds: int) -> list[Slot]:
+        """Слоты последних `seconds` секунд, от старых к новым"""
+        since = now - seconds
+        slots = [
+            slot
+            for slot in self.slots
+            if slot.count and since < slot.start + self.step and slot.start <= now
+        ]
+        return sorted(slots, key=lambda slot: slot.start)
+
+
+class TimeSeries:
+    """
+    Серия значений во времени с понижением разрешения по TIERS.
+    Каждое значение пишется во все ступени, выборка берётся из ступени
+    с наименьшим шагом, покрывающей запрошенное окно
+    """
+
+    __slots__ = ("name", "tiers")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.tiers = [Tier(step, size) for step, size in TIERS]
+
+    def add(self, value: float, timestamp: float | None = None) -> None:
+        timestamp = time() if timestamp is None else timestamp
+
+        for tier in self.tiers:
+            tier.add(timestamp, value)
+
+    def _tier(self, seconds: int) -> Tier:
+        for tier in self.tiers:
+            if tier.step * tier.size >= seconds:
+                return tier
+        return self.tiers[-1]
+
+    def summary(self, seconds: int = 3600, now: float | None = None) -> dict[str, Any]:
+        """
+        Агрегат за окно. Перцентили приблизительные: по выборкам слотов, где
+        каждое значение весит `slot.count / len(slot.samples)`, иначе тихий
+        интервал весил бы столько же, сколько загруженный
+        """
+        now = time() if now is None else now
+        slots = self._tier(seconds).window(now, seconds)
+        count = sum(slot.count for slot in slots)
+
+        if not count:
+            return {"count": 0, "total": 0.0}
+
+        weighted = sorted(
+            (value, slot.count / len(slot.samples))
+            for slot in slots
+            for value in slot.samples
+        )
+
+        return {
+            "count": count,
+            "total": sum(slot.total for slot in slots),
+            "avg": sum(slot.total for slot in slots) / count,
+            "min": min(slot.min for slot in slots),
+            "max": max(slot.max for slot in slots),
+            "p50": _quantile(weighted, 0.5),
+            "p95": _quantile(weighted, 0.95),
+        }
+
+    def trend(
+        self, seconds: int = 3600, points: int = 12, now: float | None = None
+    ) -> list[float | None]:
+        """Средние значения по `points` равным отрезкам окна; None - нет данных"""
+        now = time() if now is None else now
+        tier = self._tier(seconds)
+        width = max(seconds / points, tier.step)
+        since = now - width * points
+
+        totals, counts = [0.0] * points, [0] * points
+
+        for slot in tier.window(now, int(width * points)):
+            idx = min(max(int((slot.start - since) // width), 0), points - 1)
+            totals[idx] += slot.total
+            counts[idx] += slot.count
+
+        return [total / count if count else None for total, count in zip(totals, counts)]
+
+
+def _quantile(weighted: list[tuple[float, float]], quantile: float) -> float:
+    """Взвешенный квантиль по отсортированным парам (значение, вес)"""
+    threshold = quantile * sum(weight for _, weight in weighted)
+    accumulated = 0.0
+
+    for value, weight in weighted:
+        accumulated += weight
+
+        if accumulated >= threshold:
+            return value
+
+    return weighted[-1][0]
+
+
+class TimeSeriesStore:
+    """
+    Реестр временных рядов процесса
+    """
+
+    def __init__(self) -> None:
+        self.series: dict[str, TimeSeries] = {}
+
+    def get(self, name: str) -> TimeSeries:
+        if name not in self.series:
+            self.series[name] = TimeSeries(name)
+        return self.series[name]
+
+    def add(self, name: str, value: float, timestamp: float | None = None) -> None:
+        self.get(name).add(value, timestamp)
+
+
+timeseries = TimeSeriesStore()
@@ -1,8 +1,10 @@
 from asyncio import Lock, get_running_loop, sleep
 from functools import wraps
 from logging import getLogger
+from time import monotonic
 
 from core.settings import settings
+from utils.timeseries import timeseries
 
 logger = getLogger(__name__)
 
@@ -68,11 +70,14 @@ class Limiter:
     groups: dict[str, Bucket] = {}
 
     @classmethod
-    def start(cls) -> None:
+    def start(cls, share: float = 1.0) -> None:
+        """
+        :param share: доля лимитов на процесс, если процессов несколько
+        """
         logger.info("Startup buckets")
 
         for name, rate in cls.limits.items():
-            bucket = Bucket(name, rate)
+            bucket = Bucket(name, rate * share, max_tokens=max(1, int(rate * share)))
             cls.groups[name] = bucket
             bucket.start()
 
@@ -85,7 +90,7 @@ class Limiter:
 
 
 class rate_limit:  # noqa
-    __slots__ = ("group_name", "weight")
+    __slots__ = ("group_name", "weight", "series")
 
     def __init__(self, group_name: str = "Default", weight: int = 1) -> None:
         if group_name not in Limiter.limits.keys():
@@ -93,14 +98,17 @@ class rate_limit:  # noqa
 
         self.group_name = group_name
         self.weight = weight
+        self.series = timeseries.get(f"limiter.{group_name}.wait_sec")
 
     def __call__(self, func):
         @wraps(func)
         async def async_wrapper(*args, **kwargs):
             bucket = Limiter.groups[self.group_name]
+            started = monotonic()
 
             while bucket.started:
                 if await bucket.consume(self.weight):
+                    self.series.add(monotonic() - started)
                     return await func(*args, **kwargs)
 
                 await sleep(1 / bucket.rate)
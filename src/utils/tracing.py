@@ -0,0 +1,104 @@
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from logging import getLogger
+from random import random
+from time import monotonic
+from typing import Any, Iterator
+
+from core.settings import settings
+from utils.metrics import metrics
+
+logger = getLogger(__name__)
+
+TAIL_SAMPLED: str = "tail"
+
+
+class Tracing:
+    """
+    Сэмплирование трейсов Sentry.
+
+    Голова: транзакции интеграций (запросы webhook и т.п.) решаются при старте
+    и сохраняются с вероятностью `head_rate`.
+    Хвост: собственные транзакции (`transaction`) записываются всегда, а решение
+    принимается по завершении: медленные (дольше `slow_threshold`) и с ошибкой
+    отправляются всегда, остальные - с вероятностью `tail_rate`.
+    Решение принимается до finish(), а не в before_send_transaction: Sentry
+    сериализует событие до вызова before_send_*, и это дороже самих span.
+
+    До init() все помощники - пустые контексты без накладных расходов
+    """
+
+    head_rate = settings.tracing.head_rate
+    tail_rate = settings.tracing.tail_rate
+    slow_threshold = settings.tracing.slow_threshold
+
+    sdk: Any = None
+
+    kept = metrics.counter("tracing.kept")
+    dropped = metrics.counter("tracing.dropped")
+
+    @classmethod
+    def init(cls, dsn: str | None, **options: Any) -> None:
+        import sentry_sdk  # type: ignore
+
+        sentry_sdk.init(dsn, traces_sampler=cls.traces_sampler, **options)
+        cls.sdk = sentry_sdk
+
+        logger.info(
+            "Tracing: Head rate=%s | Tail rate=%s | Slow threshold=%ss",
+            cls.head_rate,
+            cls.tail_rate,
+            cls.slow_threshold,
+        )
+
+    @classmethod
+    def traces_sampler(cls, sampling_context: dict[str, Any]) -> float:
+        if sampling_context.get(TAIL_SAMPLED):
+            return 1.0
+
+        parent_sampled = sampling_context.get("parent_sampled")
+
+        if parent_sampled is not None:
+            return float(parent_sampled)
+
+        return cls.head_rate
+
+    @classmethod
+    def keep(cls, elapsed: float, failed: bool) -> bool:
+        """Хвостовое решение по завершённой транзакции"""
+        keep = failed or elapsed >= cls.slow_threshold or random() < cls.tail_rate
+        (cls.kept if keep else cls.dropped).inc()
+        return keep
+
+
+@contextmanager
+def transaction(name: str, op: str) -> Iterator[Any]:
+    """Транзакция с хвостовым сэмплированием"""
+    if Tracing.sdk is None:
+        yield None
+        return
+
+    started = monotonic()
+    failed = False
+
+    with Tracing.sdk.start_transaction(
+        name=name, op=op, custom_sampling_context={TAIL_SAMPLED: True}
+    ) as trace:
+        try:
+            yield trace
+
+        except BaseException:
+            failed = True
+            raise
+
+        finally:
+            # Отказ до finish(): отброшенная транзакция не сериализуется
+            if not Tracing.keep(monotonic() - started, failed):
+                trace.sampled = False
+
+
+def span(op: str, description: str | None = None) -> AbstractContextManager:
+    """Дочерний span текущей транзакции"""
+    if Tracing.sdk is None:
+        return nullcontext()
+
+    return Tracing.sdk.start_span(op=op, description=description)
@@ -0,0 +1,133 @@
+from asyncio import Task, get_running_loop, sleep
+from logging import getLogger
+from math import inf
+from sys import _current_frames
+from threading import Event, Thread, get_ident
+from time import monotonic
+from traceback import format_stack
+
+from core.settings import settings
+from utils.metrics import metrics
+from utils.timeseries import timeseries
+
+logger = getLogger(__name__)
+
+
+class LoopWatchdog:
+    """
+    Задержка event loop: задача в loop раз в `interval` отмечает пульс и пишет
+    опоздание в гистограмму `loop.lag`. Фоновый поток при пульсе старше
+    `threshold` снимает стек потока loop - это и есть блокирующий код -
+    и пишет его в лог не чаще раза в `report_interval` секунд
+    """
+
+    interval = settings.watchdog.interval
+    threshold = settings.watchdog.threshold
+    report_interval = settings.watchdog.report_interval
+
+    lag = metrics.histogram("loop.lag")
+    stalls = metrics.counter("loop.stalls")
+
+    last_stack: str | None = None
+
+    _task: Task | None = None
+    _thread: Thread | None = None
+    _stopped: Event = Event()
+
+    _beat: float = 0.0
+    _loop_thread_id: int | None = None
+    _last_report: float = -inf
+    _suppressed: int = 0
+
+    @classmethod
+    def start(
+        cls,
+        interval: float | None = None,
+        threshold: float | None = None,
+        report_interval: int | None = None,
+    ) -> None:
+        if cls._task is not None:
+            return
+
+        cls.interval = interval or cls.interval
+        cls.threshold = threshold or cls.threshold
+        cls.report_interval = report_interval or cls.report_interval
+
+        cls._loop_thread_id = get_ident()
+        cls._beat = monotonic()
+        cls._stopped = Event()
+
+        cls._task = get_running_loop().create_task(cls._ticker())
+        cls._thread = Thread(target=cls._watch, name="loop-watchdog", daemon=True)
+        cls._thread.start()
+
+        logger.info(
+            "Loop watchdog started: Interval=%.2fs | Threshold=%.2fs",
+            cls.interval,
+            cls.threshold,
+        )
+
+    @classmethod
+    def stop(cls) -> None:
+        if cls._task is None:
+            return
+
+        cls._task.cancel()
+        cls._task = None
+
+        cls._stopped.set()
+        cls._thread.join(timeout=cls.interval * 2)
+        cls._thread = None
+
+        logger.info("Loop watchdog stopped")
+
+    @classmethod
+    async def _ticker(cls) -> None:
+        while True:
+            started = monotonic()
+            await sleep(cls.interval)
+            cls._beat = now = monotonic()
+
+            lag = max(now - started - cls.interval, 0.0)
+            cls.lag.observe(lag)
+            timeseries.add("loop.lag_sec", lag)
+
+    @classmethod
+    def _watch(cls) -> None:
+        captured_beat = None
+
+        while not cls._stopped.wait(cls.interval):
+            beat = cls._beat
+            stall = monotonic() - beat
+
+            # Один снимок стека на одну остановку loop
+            if stall < cls.threshold or beat == captured_beat:
+                continue
+
+            captured_beat = beat
+            cls.stalls.inc()
+
+            frame = _current_frames().get(cls._loop_thread_id)
+
+            if frame is None:
+                continue
+
+            cls.last_stack = "".join(format_stack(frame))
+            cls._report(stall)
+
+    @classmethod
+    def _report(cls, stall: float) -> None:
+        now = monotonic()
+
+        if now - cls._last_report < cls.report_interval:
+            cls._suppressed += 1
+            return
+
+        logger.warning(
+            "Event loop blocked: Stall=%.2fs | Suppressed=%d | Stack:\n%s",
+            stall,
+            cls._suppressed,
+            cls.last_stack,
+        )
+        cls._last_report = now
+        cls._suppressed = 0